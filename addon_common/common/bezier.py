@@ -19,8 +19,8 @@ Created by Jonathan Denning, Jonathan Williamson
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-import math
 
+import numpy as np
 from mathutils import Vector, Matrix
 
 from .maths import Point, Vec
@@ -42,71 +42,35 @@ def interpolate_cubic(v0, v1, v2, v3, t):
     return v0*b0 + v1*b1 + v2*b2 + v3*b3
 
 
-def compute_cubic_error(v0, v1, v2, v3, l_v, l_t):
-    return math.sqrt(sum(
-        (interpolate_cubic(v0, v1, v2, v3, t) - v)**2
-        for v, t in zip(l_v, l_t)
-    ))
+def compute_cubic_weights_array(l_t):
+    ''' returns (n,4) array of cubic Bernstein weights for each t in l_t '''
+    t0 = np.asarray(l_t, dtype=np.float64)
+    t1 = 1 - t0
+    return np.stack([t1**3, 3*t0*t1**2, 3*t0**2*t1, t0**3], axis=1)
 
 
-def fit_cubicbezier(l_v, l_t):
-    #########################################################
-    # http://nbviewer.ipython.org/gist/anonymous/5688579
-
-    # make the summation functions for A (16 of them)
-    A_fns = [
-        lambda l_t: sum([2*t**0*(t-1)**6 for t in l_t]),
-        lambda l_t: sum([-6*t**1*(t-1)**5 for t in l_t]),
-        lambda l_t: sum([6*t**2*(t-1)**4 for t in l_t]),
-        lambda l_t: sum([-2*t**3*(t-1)**3 for t in l_t]),
-
-        lambda l_t: sum([-6*t**1*(t-1)**5 for t in l_t]),
-        lambda l_t: sum([18*t**2*(t-1)**4 for t in l_t]),
-        lambda l_t: sum([-18*t**3*(t-1)**3 for t in l_t]),
-        lambda l_t: sum([6*t**4*(t-1)**2 for t in l_t]),
-
-        lambda l_t: sum([6*t**2*(t-1)**4 for t in l_t]),
-        lambda l_t: sum([-18*t**3*(t-1)**3 for t in l_t]),
-        lambda l_t: sum([18*t**4*(t-1)**2 for t in l_t]),
-        lambda l_t: sum([-6*t**5*(t-1)**1 for t in l_t]),
-
-        lambda l_t: sum([-2*t**3*(t-1)**3 for t in l_t]),
-        lambda l_t: sum([6*t**4*(t-1)**2 for t in l_t]),
-        lambda l_t: sum([-6*t**5*(t-1)**1 for t in l_t]),
-        lambda l_t: sum([2*t**6*(t-1)**0 for t in l_t])
-    ]
-
-    # make the summation functions for b (4 of them)
-    b_fns = [
-        lambda l_t, l_v: sum(v * (-2 * (t**0) * ((t-1)**3))
-                             for t, v in zip(l_t, l_v)),
-        lambda l_t, l_v: sum(v * (6 * (t**1) * ((t-1)**2))
-                             for t, v in zip(l_t, l_v)),
-        lambda l_t, l_v: sum(v * (-6 * (t**2) * ((t-1)**1))
-                             for t, v in zip(l_t, l_v)),
-        lambda l_t, l_v: sum(v * (2 * (t**3) * ((t-1)**0))
-                             for t, v in zip(l_t, l_v)),
-    ]
-
-    # compute the data we will put into matrix A
-    A_values = [fn(l_t) for fn in A_fns]
-    # fill the A matrix with data
-    A_matrix = Matrix(tuple(zip(*[iter(A_values)]*4)))
+def fit_cubicbezier_array(pts, l_t):
+    '''
+    least-squares fit of cubic bezier to pts (array (n,d)) at parameters l_t, solving all d dimensions at once.
+    returns (err, (4,d) array of control points), where err is sum over dimensions of the fit error in that dimension
+    '''
+    pts = np.asarray(pts, dtype=np.float64)
+    W = compute_cubic_weights_array(l_t)
+    # normal equations: (W^T W) X = W^T pts
     try:
-        A_inv = A_matrix.inverted()
-    except:
-        return (float('inf'), l_v[0], l_v[0], l_v[0], l_v[0])
-
-    # compute the data we will put into the b vector
-    b_values = [fn(l_t, l_v) for fn in b_fns]
-    # fill the b vector with data
-    b_vector = Vector(b_values)
-
-    # solve for the unknowns in vector x
-    v0, v1, v2, v3 = A_inv @ b_vector
+        X = np.linalg.solve(W.T @ W, W.T @ pts)
+    except np.linalg.LinAlgError:
+        return (float('inf'), np.repeat(pts[:1], 4, axis=0))
+    err = float(np.sqrt(((W @ X - pts)**2).sum(axis=0)).sum())
+    return (err, X)
 
-    err = compute_cubic_error(v0, v1, v2, v3, l_v, l_t) #/ len(l_v)
 
+def fit_cubicbezier(l_v, l_t):
+    #########################################################
+    # http://nbviewer.ipython.org/gist/anonymous/5688579
+    # fits one dimension of values l_v; see fit_cubicbezier_array
+    err, X = fit_cubicbezier_array(np.asarray(l_v, dtype=np.float64)[:,None], l_t)
+    v0, v1, v2, v3 = X[:,0].tolist()
     return (err, v0, v1, v2, v3)
 
 
@@ -126,87 +90,64 @@ def fit_cubicbezier_spline(
     if t3 == -1:
         t3 = count-1
     assert count > 2, "Need at least 2 points to fit cubic bezier"
-    if count == 2:
-        # special case: line
-        p0, p3 = l_co[0], l_co[-1]
-        diff = p3 - p0
-        return [(t0, t3, p0, p0+diff*0.33, p0+diff*0.66, p3)]
-    if count == 3:
-        new_co = [
-            l_co[0],
-            Point.average(l_co[:2]),
-            l_co[1],
-            Point.average(l_co[1:]),
-            l_co[2]
-        ]
-        return fit_cubicbezier_spline(
-            new_co, error_scale,
-            depth=depth,
-            t0=t0, t3=t3,
-            allow_split=allow_split, force_split=force_split
+    pts = np.array([tuple(co) for co in l_co], dtype=np.float64)
+    return [
+        (t0_, t3_, *(Point(p) for p in X.tolist()))
+        for (t0_, t3_, X) in _fit_cubicbezier_spline_array(
+            pts, error_scale, depth, t0, t3, allow_split, force_split, min_count_split, max_depth_split,
         )
-    l_d = [0] + [(v0-v1).length for v0, v1 in zip(l_co[:-1], l_co[1:])]
-    l_ad = [s for d, s in iter_running_sum(l_d)]
-    dist = sum(l_d)
+    ]
+
+
+def _fit_cubicbezier_spline_array(pts, error_scale, depth, t0, t3, allow_split, force_split, min_count_split, max_depth_split):
+    # same as fit_cubicbezier_spline, but works on (n,3) array and returns control points as (4,3) arrays
+    count = len(pts)
+    if count == 3:
+        new_pts = np.array([
+            pts[0],
+            (pts[0] + pts[1]) / 2,
+            pts[1],
+            (pts[1] + pts[2]) / 2,
+            pts[2],
+        ])
+        # note: split settings are not passed along (same as before)
+        return _fit_cubicbezier_spline_array(new_pts, error_scale, depth, t0, t3, allow_split, force_split, 15, 4)
+    l_ad = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(pts, axis=0), axis=1))])
+    dist = l_ad[-1]
     if dist <= 0:
-        # print(spc + 'fit_cubicbezier_spline: returning []')
-        return []  # [(t0,t3,l_co[0],l_co[0],l_co[0],l_co[0])]
-    l_t = [ad/dist for ad in l_ad]
+        return []
+    l_t = l_ad / dist
 
-    ex, x0, x1, x2, x3 = fit_cubicbezier([co[0] for co in l_co], l_t)
-    ey, y0, y1, y2, y3 = fit_cubicbezier([co[1] for co in l_co], l_t)
-    ez, z0, z1, z2, z3 = fit_cubicbezier([co[2] for co in l_co], l_t)
-    tot_error = ex+ey+ez
-    #print(f'error={tot_error}  max={error_scale}  force={force_split}  allow={allow_split}') #, l=4)
+    tot_error, X = fit_cubicbezier_array(pts, l_t)
 
     if not force_split:
         do_not_split = tot_error < error_scale
         do_not_split |= depth == max_depth_split
-        do_not_split |= len(l_co) <= min_count_split
+        do_not_split |= count <= min_count_split
         do_not_split |= not allow_split
         if do_not_split:
-            p0, p1 = Point((x0, y0, z0)), Point((x1, y1, z1))
-            p2, p3 = Point((x2, y2, z2)), Point((x3, y3, z3))
-            return [(t0, t3, p0, p1, p2, p3)]
+            return [(t0, t3, X)]
 
     # too much error in fit.  split sequence in two, and fit each sub-sequence
 
-    # find a good split point
-    ind_split = -1
-    mindot = 1.0
-    for ind in range(5, len(l_co)-5):
-        if l_t[ind] < 0.4:
-            continue
-        if l_t[ind] > 0.6:
-            break
-        # if l_ad[ind] < 0.1: continue
-        # if l_ad[ind] > dist-0.1: break
-
-        v0 = l_co[ind-4]
-        v1 = l_co[ind+0]
-        v2 = l_co[ind+4]
-        d0 = (v1-v0).normalized()
-        d1 = (v2-v1).normalized()
-        dot01 = d0.dot(d1)
-        if ind_split == -1 or dot01 < mindot:
-            ind_split = ind
-            mindot = dot01
-
-    if ind_split == -1:
+    # find a good split point: the sharpest turn near the middle of the sequence
+    inds = np.arange(5, count-5)
+    inds = inds[(l_t[inds] >= 0.4) & (l_t[inds] <= 0.6)]
+    if len(inds) == 0:
         # did not find a good splitting point!
-        p0, p1, p2, p3 = Point((x0, y0, z0)), Point(
-            (x1, y1, z1)), Point((x2, y2, z2)), Point((x3, y3, z3))
-        #p0,p3 = Point(l_co[0]),Point(l_co[-1])
-        return [(t0, t3, p0, p1, p2, p3)]
-
-    #print(spc + 'splitting at %d' % ind_split)
-
-    l_co0, l_co1 = l_co[:ind_split+1], l_co[ind_split:]   # share split point
+        return [(t0, t3, X)]
+    d0 = pts[inds] - pts[inds-4]
+    d1 = pts[inds+4] - pts[inds]
+    n0 = np.linalg.norm(d0, axis=1)
+    n1 = np.linalg.norm(d1, axis=1)
+    d0 = np.divide(d0, n0[:,None], out=np.zeros_like(d0), where=(n0[:,None] > 0))
+    d1 = np.divide(d1, n1[:,None], out=np.zeros_like(d1), where=(n1[:,None] > 0))
+    ind_split = int(inds[np.argmin((d0 * d1).sum(axis=1))])
+
+    pts0, pts1 = pts[:ind_split+1], pts[ind_split:]   # share split point
     tsplit = ind_split  # / (len(l_co)-1)
-    bezier0 = fit_cubicbezier_spline(
-        l_co0, error_scale, depth=depth+1, t0=t0, t3=tsplit)
-    bezier1 = fit_cubicbezier_spline(
-        l_co1, error_scale, depth=depth+1, t0=tsplit, t3=t3)
+    bezier0 = _fit_cubicbezier_spline_array(pts0, error_scale, depth+1, t0, tsplit, True, False, 15, 4)
+    bezier1 = _fit_cubicbezier_spline_array(pts1, error_scale, depth+1, tsplit, t3, True, False, 15, 4)
     return bezier0 + bezier1
 
 
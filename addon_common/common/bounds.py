@@ -0,0 +1,37 @@
+'''
+Copyright (C) 2023 CG Cookie
+http://cgcookie.com
+hello@cgcookie.com
+
+Created by Jonathan Denning, Jonathan Williamson
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import numpy as np
+
+
+'''
+Vertex coordinate arrays of Blender meshes, gathered with foreach_get rather than by walking verts in Python.
+
+Note: for extents of an object, use the 8 corners of Object.bound_box (see BBox(from_object=...)), which do not
+require evaluating or traversing the mesh at all.
+'''
+
+
+def get_mesh_coords(mesh):
+    ''' returns float32 array (nverts, 3) of vertex coordinates of Blender mesh '''
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    return coords.reshape((-1, 3))
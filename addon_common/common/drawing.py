@@ -51,7 +51,7 @@ from .globals import Globals
 from .hasher import Hasher
 from .maths import Point2D, Vec2D, Point, Ray, Direction, mid, Color, Normal, Frame
 from .profiler import profiler
-from .utils import iter_pairs
+from .utils import iter_pairs, LRUCache
 from . import gpustate
 
 
@@ -103,7 +103,7 @@ class Drawing:
         self.fontsize = None
         self.fontsize_scaled = None
         self.line_cache = {}
-        self.size_cache = {}
+        self.size_cache = LRUCache(max_size=4096)
         self.set_font_size(12)
         self._pixel_matrix = None
 
@@ -160,26 +160,23 @@ class Drawing:
 
         return fontsize_prev
 
-    def get_text_size_info(self, text, item, fontsize=None, fontid=None):
-        if fontsize or fontid: size_prev = self.set_font_size(fontsize, fontid=fontid)
+    re_digits = re.compile(r'(\d)')
 
-        if text is None: text, lines = '', []
-        elif type(text) is list: text, lines = '\n'.join(text), text
-        else: text, lines = text, text.splitlines()
-
-        fontid = fm.load(fontid)
+    def _get_text_size(self, text, lines, fontid):
         key = (text, self.fontsize_scaled, fontid)
-        # key = (text, self.fontsize_scaled, self.font_id)
-        if key not in self.size_cache:
+        d = self.size_cache.get(key)
+        if d is None:
             d = {}
             if not text:
+                d['raw width'] = 0
                 d['width'] = 0
                 d['height'] = 0
                 d['line height'] = self.line_height
             else:
-                get_width = lambda t: math.ceil(fm.dimensions(t, fontid=fontid)[0])
+                get_width = lambda t: fm.dimensions(t, fontid=fontid)[0]
                 get_height = lambda t: math.ceil(fm.dimensions(t, fontid=fontid)[1])
-                d['width'] = max(get_width(l) for l in lines)
+                d['raw width'] = max(get_width(l) for l in lines)   # unrounded, so runs can be summed (see get_text_size_info)
+                d['width'] = math.ceil(d['raw width'])
                 d['height'] = get_height(text)
                 d['line height'] = self.line_height * len(lines)
             self.size_cache[key] = d
@@ -191,8 +188,30 @@ class Drawing:
                 print('>   size: %s' % str(d))
                 print('--------------------------------------')
                 print('')
+        return d
+
+    def get_text_size_info(self, text, item, fontsize=None, fontid=None):
+        if fontsize or fontid: size_prev = self.set_font_size(fontsize, fontid=fontid)
+
+        if text is None: text, lines = '', []
+        elif type(text) is list: text, lines = '\n'.join(text), text
+        else: text, lines = text, text.splitlines()
+
+        fontid = fm.load(fontid)
+        if len(lines) == 1 and len(text) > 1 and self.re_digits.search(text):
+            # frequently changing numeric strings (ex: FPS, counts) would flood the cache,
+            # so measure them as separate runs of non-digits and individual digits.
+            # unrounded widths are summed and rounded once, so result matches measuring whole text
+            runs = [ self._get_text_size(run, [run], fontid) for run in self.re_digits.split(text) if run ]
+            d = {
+                'width':       math.ceil(sum(run['raw width'] for run in runs)),
+                'height':      max(run['height'] for run in runs),
+                'line height': self.line_height,
+            }
+        else:
+            d = self._get_text_size(text, lines, fontid)
         if fontsize: self.set_font_size(size_prev, fontid=fontid)
-        return self.size_cache[key][item]
+        return d[item]
 
     def get_text_width(self, text, fontsize=None, fontid=None):
         return self.get_text_size_info(text, 'width', fontsize=fontsize, fontid=fontid)
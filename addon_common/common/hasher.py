@@ -24,6 +24,7 @@ from struct import pack
 from hashlib import md5
 
 import bpy
+import numpy as np
 from bmesh.types import BMesh
 from mathutils import Vector, Matrix
 
@@ -133,7 +134,9 @@ def hash_object(obj:bpy.types.Object):
         (min(c[0] for c in bbox), min(c[1] for c in bbox), min(c[2] for c in bbox)),
         (max(c[0] for c in bbox), max(c[1] for c in bbox), max(c[2] for c in bbox)),
     )
-    vsum   = tuple(sum((v.co for v in me.vertices), Vector((0,0,0))))
+    coords = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get('co', coords)
+    vsum   = tuple(coords.reshape((-1, 3)).sum(axis=0, dtype=np.float64).tolist())
     xform  = tuple(e for l in obj.matrix_world for e in l)
     mods = []
     for mod in obj.modifiers:
@@ -0,0 +1,140 @@
+'''
+Copyright (C) 2023 CG Cookie
+http://cgcookie.com
+hello@cgcookie.com
+
+Created by Jonathan Denning, Jonathan Williamson
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import os
+import json
+import mmap
+import struct
+import threading
+
+import numpy as np
+
+
+'''
+Single-file cache of decoded RGBA8 images, so images do not need to be decoded again each session.
+
+    file   := header | index | data
+    header := magic b'CCIC' (4 bytes), version (uint32), len(index) (uint32)
+    index  := utf8 json  { name: [width, height, offset, source mtime_ns, source size], ... }
+    data   := raw RGBA8 pixels (top row first) of each image, starting at 16-byte aligned offsets
+
+All values are little-endian.  Offsets are from start of file.
+An entry is only used if its source file still has the same mtime and size (otherwise image is decoded as usual).
+The file is memory-mapped; `get` returns a copy of the pixels, so the map can be closed while images are in use.
+'''
+
+CACHE_MAGIC = b'CCIC'
+CACHE_VERSION = 1
+
+_header_fmt = '<4sII'
+_header_size = struct.calcsize(_header_fmt)
+_align = 16
+
+
+def _source_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ImageCacheFile:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self._index = {}
+        self._open()
+
+    def _open(self):
+        if not self.path or not os.path.exists(self.path): return
+        try:
+            f = open(self.path, 'rb')
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, lindex = struct.unpack_from(_header_fmt, mm, 0)
+            assert magic == CACHE_MAGIC and version == CACHE_VERSION, 'unknown image cache format'
+            index = json.loads(mm[_header_size:_header_size+lindex].decode('utf8'))
+            # make sure that all data is actually in file (ex: partially written)
+            assert all(offset + w * h * 4 <= len(mm) for (w, h, offset, _, _) in index.values())
+        except Exception as e:
+            print(f'Addon Common: could not read image cache {self.path}: {e}')
+            return
+        self._file, self._mmap, self._index = f, mm, index
+
+    def close(self):
+        with self._lock:
+            if self._mmap: self._mmap.close()
+            if self._file: self._file.close()
+            self._file, self._mmap, self._index = None, None, {}
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def is_valid(self, name, path_source):
+        entry = self._index.get(name)
+        if not entry or not path_source: return False
+        try:
+            return tuple(entry[3:5]) == _source_key(path_source)
+        except OSError:
+            return False
+
+    def get(self, name, path_source):
+        ''' returns copy of cached image as (height, width, 4) uint8 array, or None if not cached or stale '''
+        if not self.is_valid(name, path_source): return None
+        w, h, offset, _, _ = self._index[name]
+        with self._lock:
+            if not self._mmap: return None
+            return np.frombuffer(self._mmap, dtype=np.uint8, count=w*h*4, offset=offset).reshape((h, w, 4)).copy()
+
+    def write(self, images):
+        '''
+        writes new cache file containing images, then reopens it.
+        images is list of (name, path_source, image), where image is (height, width, 4) uint8 array.
+        new file is written next to cache and then moved into place, so readers never see a partial file.
+        '''
+        entries, offset = {}, 0
+        for name, path_source, image in images:
+            h, w, _ = image.shape
+            entries[name] = (w, h, offset, *_source_key(path_source))
+            offset += (w * h * 4 + _align - 1) // _align * _align
+        # data starts after index, but size of index depends on the offsets stored in it
+        start = 0
+        while True:
+            index = { name: [w, h, start + o, mt, sz] for (name, (w, h, o, mt, sz)) in entries.items() }
+            index_b = json.dumps(index).encode('utf8')
+            nstart = (_header_size + len(index_b) + _align - 1) // _align * _align
+            if nstart == start: break
+            start = nstart
+        index_b = index_b.ljust(start - _header_size)
+
+        path_tmp = f'{self.path}.tmp'
+        with open(path_tmp, 'wb') as f:
+            f.write(struct.pack(_header_fmt, CACHE_MAGIC, CACHE_VERSION, len(index_b)))
+            f.write(index_b)
+            for name, _, image in images:
+                f.seek(index[name][2])
+                f.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())
+        # must close map before replacing file (Windows cannot replace a mapped file)
+        self.close()
+        os.replace(path_tmp, self.path)
+        with self._lock: self._open()
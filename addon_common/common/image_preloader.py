@@ -21,12 +21,15 @@ Created by Jonathan Denning, Jonathan Williamson, and Patrick Moore
 
 import os
 import glob
+import time
 import atexit
+import threading
 
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 from .blender import get_path_from_addon_root
-from .ui_core_images import preload_image, set_image_cache
+from .image_cache import ImageCacheFile
+from .ui_core_images import preload_image, set_image_cache, load_image, get_image_path, set_image_cache_file
 
 
 # preload images to view faster
@@ -47,26 +50,59 @@ class ImagePreloader:
     def quitted(cls): return cls._quitted
 
     @classmethod
-    def start(cls, paths, *, version='thread'):
+    def start(cls, paths, *, version='thread', cache_path=None):
+        '''
+        decodes all png images found in paths (tuples relative to add-on root).
+        if cache_path is given, decoded images are written to an ImageCacheFile at that path, which is then
+        used by load_image.  only images missing from the cache (or whose source changed) are decoded.
+        '''
         path_images = []
-
-        path_cur = os.getcwd()
         for path in paths:
-            os.chdir(get_path_from_addon_root(*path))
-            path_images.extend(glob.glob('*.png'))
-        os.chdir(path_cur)
+            path_images.extend(
+                os.path.basename(fn)
+                for fn in glob.glob(os.path.join(get_path_from_addon_root(*path), '*.png'))
+            )
+
+        cache = None
+        if cache_path:
+            cache = ImageCacheFile(cache_path)
+            set_image_cache_file(cache)
+            path_images = [ path_image for path_image in path_images if not cache.is_valid(path_image, get_image_path(path_image)) ]
+            if not path_images:
+                print(f'CookieCutter: all images are cached')
+                return
+
+        def write_cache():
+            if not cache or cls.quitted(): return
+            images = []
+            for path_image in set(path_images) | set(cache):
+                path_source = get_image_path(path_image)
+                if not path_source: continue
+                images.append((path_image, path_source, load_image(path_image)))
+            try:
+                cache.write(images)
+                print(f'CookieCutter: wrote {len(images)} images to cache')
+            except Exception as e:
+                print(f'CookieCutter: could not write image cache: {e}')
 
         match version:
             case 'process':
                 # this version spins up new Processes, so Python's GIL isn't an issue
                 # :) loading is much FASTER!      (truly parallel loading)
                 # :( DIFFICULT to pause or abort  (no shared resources)
+                remaining = len(path_images)
+                remaining_lock = threading.Lock()
                 def setter(p):
+                    nonlocal remaining
                     if cls.quitted(): return
                     for path_image, img in p.result():
                         if img is None: continue
                         print(f'CookieCutter: {path_image} is preloaded')
                         set_image_cache(path_image, img)
+                    with remaining_lock:
+                        remaining -= 1
+                        if remaining: return
+                    write_cache()
                 executor = ProcessPoolExecutor() # ThreadPoolExecutor()
                 for path_image in path_images:
                     p = executor.submit(preload_image, path_image)
@@ -99,4 +135,5 @@ class ImagePreloader:
                             return
                         if cls.quitted(): return
                     print(f'CookieCutter: all images preloaded')
+                    write_cache()
                 ThreadPoolExecutor().submit(start)
@@ -25,6 +25,8 @@ from math import sqrt, acos, cos, sin, floor, ceil, isinf, sqrt, pi, isnan
 from typing import List
 from itertools import chain
 
+import numpy as np
+
 import gpu
 from mathutils import Matrix, Vector, Quaternion
 from bmesh.types import BMVert
@@ -1794,11 +1796,34 @@ def get_path_length(verts):
     '''
     if len(verts) < 2:
         return 0
-    l_tot = 0
-    for i in range(0,len(verts)-1):
-        d = verts[i+1] - verts[i]
-        l_tot += d.length
-    return l_tot
+    pts = np.asarray([tuple(v) for v in verts], dtype=np.float64)
+    return float(np.linalg.norm(np.diff(pts, axis=0), axis=1).sum())
+
+def resample_path_evenly(pts, segments, *, cyclic=False, shift=0):
+    '''
+    returns (segments - 1 + cyclic) points evenly spaced (by arc length) along path pts, as float64 array.
+    pts is array-like of shape (n, d).  the end points of non-cyclic paths are not included.
+    shift is in units of segment length (see space_evenly_on_path)
+    '''
+    pts = np.asarray(pts, dtype=np.float64)
+    n = len(pts)
+    segs = np.diff(np.vstack([pts, pts[:1]]) if cyclic else pts, axis=0)
+    seg_lens = np.linalg.norm(segs, axis=1)
+    cumulative_lengths = np.concatenate([[0.0], np.cumsum(seg_lens)])
+    arch_len = cumulative_lengths[-1]
+
+    # desired arc length of each new point, wrapped into [0, arch_len] for cyclic shifts
+    i = np.arange(segments - 1 + (1 if cyclic else 0))
+    desired = (i + (0 if cyclic else 1)) / segments * arch_len + shift * arch_len / segments
+    desired = np.where(desired > arch_len, desired - arch_len, np.where(desired < 0, desired + arch_len, desired))
+
+    # index of first cumulative length greater than desired length (end of segment containing new point)
+    j = np.clip(np.searchsorted(cumulative_lengths, desired, side='right'), 1, n)
+    extra = desired - cumulative_lengths[j - 1]
+    dirs = segs[j - 1]
+    lens = seg_lens[j - 1]
+    dirs = np.divide(dirs, lens[:,None], out=np.zeros_like(dirs), where=(lens[:,None] > 0))
+    return pts[j - 1] + extra[:,None] * dirs
 
 def space_evenly_on_path(verts, edges, segments, shift = 0, debug = False):  #prev deved for Open Dental CAD
     '''
@@ -1830,7 +1855,6 @@ def space_evenly_on_path(verts, edges, segments, shift = 0, debug = False):  #pr
     if segments >= len(verts):
         print('more segments requested than original verts')
 
-
     #determine if cyclic or not, first vert same as last vert
     if 0 in edges[-1]:
         cyclic = True
@@ -1842,85 +1866,17 @@ def space_evenly_on_path(verts, edges, segments, shift = 0, debug = False):  #pr
             print('not shifting because this is not a cyclic vert chain')
             shift = 0
 
-    #calc_length
-    arch_len = 0
-    cumulative_lengths = [0]#TODO, make this the right size and dont append
-    for i in range(0,len(verts)-1):
-        v0 = verts[i]
-        v1 = verts[i+1]
-        V = v1-v0
-        arch_len += V.length
-        cumulative_lengths.append(arch_len)
-
-    if cyclic:
-        v0 = verts[-1]
-        v1 = verts[0]
-        V = v1-v0
-        arch_len += V.length
-        cumulative_lengths.append(arch_len)
-        #print(cumulative_lengths)
-
-    #identify vert indicies of import
-    #this will be the largest vert which lies at
-    #no further than the desired fraction of the curve
-
-    #initialze new vert array and seal the end points
-    if cyclic:
-        new_verts = [[None]]*(segments)
-        #new_verts[0] = verts[0]
-
-    else:
-        new_verts = [[None]]*(segments + 1)
-        new_verts[0] = verts[0]
-        new_verts[-1] = verts[-1]
-
-
-    n = 0 #index to save some looping through the cumulative lengths list
-          #now we are leaving it 0 becase we may end up needing the beginning of the loop last
-          #and if we are subdividing, we may hit the same cumulative lenght several times.
-          #for now, use the slow and generic way, later developsomething smarter.
-    for i in range(0,segments- 1 + cyclic * 1):
-        desired_length_raw = (i + 1 + cyclic * -1)/segments * arch_len + shift * arch_len / segments
-        #print('the length we desire for the %i segment is %f compared to the total length which is %f' % (i, desired_length_raw, arch_len))
-        #like a mod function, but for non integers?
-        if desired_length_raw > arch_len:
-            desired_length = desired_length_raw - arch_len
-        elif desired_length_raw < 0:
-            desired_length = arch_len + desired_length_raw #this is the end, + a negative number
-        else:
-            desired_length = desired_length_raw
-
-        #find the original vert with the largets legnth
-        #not greater than the desired length
-        #I used to set n = J after each iteration
-        for j in range(n, len(verts)+1):
-
-            if cumulative_lengths[j] > desired_length:
-                #print('found a greater length at vert %i' % j)
-                #this was supposed to save us some iterations so that
-                #we don't have to start at the beginning each time....
-                #if j >= 1:
-                    #n = j - 1 #going one back allows us to space multiple verts on one edge
-                #else:
-                    #n = 0
-                break
-
-        extra = desired_length - cumulative_lengths[j-1]
-        if j == len(verts):
-            new_verts[i + 1 + cyclic * -1] = verts[j-1] + extra * (verts[0]-verts[j-1]).normalized()
-        else:
-            new_verts[i + 1 + cyclic * -1] = verts[j-1] + extra * (verts[j]-verts[j-1]).normalized()
-
-    eds = []
+    pts = resample_path_evenly([tuple(v) for v in verts], segments, cyclic=cyclic, shift=shift)
+    new_verts = [Vector(p) for p in pts.tolist()]
+    if not cyclic:
+        # seal the end points
+        new_verts = [verts[0]] + new_verts + [verts[-1]]
 
-    for i in range(0,len(new_verts)-1):
-        eds.append((i,i+1))
+    eds = [(i, i+1) for i in range(len(new_verts) - 1)]
     if cyclic:
         #close the loop
-        eds.append((i+1,0))
+        eds.append((len(new_verts) - 1, 0))
     if debug:
-        print(cumulative_lengths)
-        print(arch_len)
         print(eds)
 
     return new_verts, eds
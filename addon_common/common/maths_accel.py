@@ -210,6 +210,79 @@ class Accel2D:
         }
         return ret
 
+    @profiler.function
+    def get_along_segment(self, p0, p1, within, *, fn_filter=None):
+        '''
+        returns all elements in bins covered by segment p0-p1, expanded by within.
+        bins are visited with a DDA traversal, so only the cells the segment passes through
+        (and their neighbors within `within`) are touched rather than the whole bbox of p0-p1.
+        '''
+        if p0 is None or p1 is None: return set()
+        if not all(isfinite(v) for v in (p0.x, p0.y, p1.x, p1.y)): return set()
+
+        bl = self.bin_len
+        sx, sy = bl / self.sizex, bl / self.sizey
+        wi, wj = ceil(within * sx), ceil(within * sy)
+
+        # segment in (continuous) bin coordinates
+        x0, y0 = (p0.x - self.minx) * sx, (p0.y - self.miny) * sy
+        x1, y1 = (p1.x - self.minx) * sx, (p1.y - self.miny) * sy
+
+        # clip segment to grid (expanded by within) using Liang-Barsky
+        dx, dy = x1 - x0, y1 - y0
+        t0, t1 = 0.0, 1.0
+        for p, q in ((-dx, x0 + wi), (dx, bl + wi - x0), (-dy, y0 + wj), (dy, bl + wj - y0)):
+            if p == 0:
+                if q < 0: return set()
+                continue
+            t = q / p
+            if p < 0:
+                if t > t1: return set()
+                t0 = max(t0, t)
+            else:
+                if t < t0: return set()
+                t1 = min(t1, t)
+        x0, y0, x1, y1 = x0 + dx * t0, y0 + dy * t0, x0 + dx * t1, y0 + dy * t1
+
+        # DDA traversal (Amanatides & Woo) over bins touched by clipped segment
+        i, j = floor(x0), floor(y0)
+        ie, je = floor(x1), floor(y1)
+        step_i, step_j = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        tdelta_i = abs(1 / dx) if dx else float('inf')
+        tdelta_j = abs(1 / dy) if dy else float('inf')
+        tmax_i = ((i + 1 - x0) if dx > 0 else (x0 - i)) * tdelta_i if dx else float('inf')
+        tmax_j = ((j + 1 - y0) if dy > 0 else (y0 - j)) * tdelta_j if dy else float('inf')
+
+        cells = set()
+        def visit(i, j):
+            for ci in range(max(0, i - wi), min(bl - 1, i + wi) + 1):
+                for cj in range(max(0, j - wj), min(bl - 1, j + wj) + 1):
+                    cells.add((ci, cj))
+        visit(i, j)
+        for _ in range(abs(ie - i) + abs(je - j)):
+            if tmax_i < tmax_j:
+                i += step_i
+                tmax_i += tdelta_i
+            else:
+                j += step_j
+                tmax_j += tdelta_j
+            visit(i, j)
+
+        return {
+            elem
+            for ij in cells
+            for elem in self._get(ij)
+            if elem.is_valid and (fn_filter is None or fn_filter(elem))
+        }
+
+    @profiler.function
+    def get_verts_along_segment(self, p0, p1, within):
+        return self.get_along_segment(p0, p1, within, fn_filter=self._is_vert)
+
+    @profiler.function
+    def get_edges_along_segment(self, p0, p1, within):
+        return self.get_along_segment(p0, p1, within, fn_filter=self._is_edge)
+
     @profiler.function
     def get_verts(self, v2d, within):
         return self.get(v2d, within, fn_filter=self._is_vert)
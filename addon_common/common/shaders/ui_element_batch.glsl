@@ -0,0 +1,139 @@
+/*
+Copyright (C) 2023 CG Cookie
+http://cgcookie.com
+hello@cgcookie.com
+
+Created by Jonathan Denning
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+#version 330
+
+// batched variant of ui_element.glsl
+// every UI element is drawn as two triangles (six vertices) that all carry the element's options as vertex attributes,
+// so many UI elements can be drawn with a single draw call.  elements with images are not batched.
+
+uniform mat4 uMVPMatrix;
+uniform bool srgbTarget;
+
+
+////////////////////////////////////////
+// vertex shader
+
+in vec2 pos;
+in vec4 lrtb;
+in vec4 whd;                    // width, height, depth, unused
+in vec4 margin_lrtb;
+in vec4 padding_lrtb;
+in vec4 border_width_radius;
+in vec4 border_left_color;
+in vec4 border_right_color;
+in vec4 border_top_color;
+in vec4 border_bottom_color;
+in vec4 background_color;
+in vec4 scissor_lbrt;           // scissor box in framebuffer coords (right and top are exclusive)
+
+out vec2 screen_pos;
+flat out vec4 v_lrtb;
+flat out vec4 v_whd;
+flat out vec4 v_margin_lrtb;
+flat out vec4 v_padding_lrtb;
+flat out vec4 v_border_width_radius;
+flat out vec4 v_border_left_color;
+flat out vec4 v_border_right_color;
+flat out vec4 v_border_top_color;
+flat out vec4 v_border_bottom_color;
+flat out vec4 v_background_color;
+flat out vec4 v_scissor_lbrt;
+
+void main() {
+    // set vertex to bottom-left, top-left, top-right, or bottom-right location, depending on pos
+    vec2 p = vec2(
+        (pos.x < 0.5) ? (lrtb.x - 1.0) : (lrtb.y + 1.0),
+        (pos.y < 0.5) ? (lrtb.w - 1.0) : (lrtb.z + 1.0)
+    );
+
+    // convert depth to z-order
+    float zorder = 1.0 - whd.z / 1000.0;
+
+    screen_pos  = p;
+    gl_Position = uMVPMatrix * vec4(p, zorder, 1);
+
+    v_lrtb                = lrtb;
+    v_whd                 = whd;
+    v_margin_lrtb         = margin_lrtb;
+    v_padding_lrtb        = padding_lrtb;
+    v_border_width_radius = border_width_radius;
+    v_border_left_color   = border_left_color;
+    v_border_right_color  = border_right_color;
+    v_border_top_color    = border_top_color;
+    v_border_bottom_color = border_bottom_color;
+    v_background_color    = background_color;
+    v_scissor_lbrt        = scissor_lbrt;
+}
+
+
+
+////////////////////////////////////////
+// fragment shader
+
+in vec2 screen_pos;
+flat in vec4 v_lrtb;
+flat in vec4 v_whd;
+flat in vec4 v_margin_lrtb;
+flat in vec4 v_padding_lrtb;
+flat in vec4 v_border_width_radius;
+flat in vec4 v_border_left_color;
+flat in vec4 v_border_right_color;
+flat in vec4 v_border_top_color;
+flat in vec4 v_border_bottom_color;
+flat in vec4 v_background_color;
+flat in vec4 v_scissor_lbrt;
+
+out vec4 outColor;
+out float gl_FragDepth;
+
+float pos_l() { return v_lrtb.x; }
+float pos_r() { return v_lrtb.y; }
+float pos_t() { return v_lrtb.z; }
+float pos_b() { return v_lrtb.w; }
+
+float size_w() { return v_whd.x; }
+float size_h() { return v_whd.y; }
+
+float margin_l() { return v_margin_lrtb.x; }
+float margin_r() { return v_margin_lrtb.y; }
+float margin_t() { return v_margin_lrtb.z; }
+float margin_b() { return v_margin_lrtb.w; }
+float padding_l() { return v_padding_lrtb.x; }
+float padding_r() { return v_padding_lrtb.y; }
+float padding_t() { return v_padding_lrtb.z; }
+float padding_b() { return v_padding_lrtb.w; }
+
+float border_width()  { return v_border_width_radius.x; }
+float border_radius() { return v_border_width_radius.y; }
+vec4 border_left_color()   { return v_border_left_color; }
+vec4 border_right_color()  { return v_border_right_color; }
+vec4 border_top_color()    { return v_border_top_color; }
+vec4 border_bottom_color() { return v_border_bottom_color; }
+
+vec4 background_color() { return v_background_color; }
+
+bool outside_scissor() {
+    vec2 fc = gl_FragCoord.xy;
+    return fc.x < v_scissor_lbrt.x || fc.y < v_scissor_lbrt.y || fc.x >= v_scissor_lbrt.z || fc.y >= v_scissor_lbrt.w;
+}
+
+#include "ui_element_fragment.glsl"
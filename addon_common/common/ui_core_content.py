@@ -27,7 +27,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from . import ui_settings  # needs to be first
 from .ui_core_images    import get_loading_image, is_image_cached, load_texture, async_load_image, load_image
-from .ui_core_utilities import UI_Core_Utils, helper_wraptext, convert_token_to_cursor
+from .ui_core_utilities import UI_Core_Utils, helper_wraptext_words, helper_textsize, convert_token_to_cursor
 
 from .globals  import Globals
 from .maths    import Vec2D, Color, mid, Box2D, Size1D, Size2D, Point2D, RelPoint2D, Index2D, clamp, NumberUnit
@@ -118,10 +118,10 @@ class UI_Core_Content:
 
         content_before = self._computed_styles_before.get('content', None) if self._computed_styles_before else None
         if content_before is not None:
-            # TODO: cache this!!
-            self._child_before = self.new_element(tagName=self._tagName, innerText=content_before, pseudoelement='before', _parent=self)
+            if not self._child_before or self._child_before.innerText != content_before:
+                self._child_before = self.new_element(tagName=self._tagName, innerText=content_before, pseudoelement='before', _parent=self)
+                self._new_content = True
             self._child_before.clean()
-            self._new_content = True
             self._children_gen += [self._child_before]
         else:
             if self._child_before:
@@ -130,10 +130,10 @@ class UI_Core_Content:
 
         content_after  = self._computed_styles_after.get('content', None)  if self._computed_styles_after  else None
         if content_after is not None:
-            # TODO: cache this!!
-            self._child_after = self.new_element(tagName=self._tagName, innerText=content_after, pseudoelement='after', _parent=self)
+            if not self._child_after or self._child_after.innerText != content_after:
+                self._child_after = self.new_element(tagName=self._tagName, innerText=content_after, pseudoelement='after', _parent=self)
+                self._new_content = True
             self._child_after.clean()
-            self._new_content = True
             self._children_gen += [self._child_after]
         else:
             if self._child_after:
@@ -148,19 +148,17 @@ class UI_Core_Content:
             self.innerText = self._computed_styles['content']
 
         if self._innerText is not None:
-            # TODO: cache this!!
             textwrap_opts = {
                 'dpi':               Globals.drawing.get_dpi_mult(),
                 'text':              self._innerText,
                 'fontid':            self._fontid,
                 'fontsize':          self._fontsize,
-                'preserve_newlines': self._whitespace in {'pre',    'pre-line', 'pre-wrap'},
-                'collapse_spaces':   self._whitespace in {'normal', 'nowrap',   'pre-line'},
-                'wrap_text':         self._whitespace in {'normal', 'pre-wrap', 'pre-line'},
+                'whitespace':        self._whitespace,
             }
 
             # TODO: if whitespace:pre, then make self NOT wrap
-            innerTextWrapped = helper_wraptext(**textwrap_opts)
+            # note: wrapped text and words are cached across all elements
+            innerTextWrapped, innerTextLines = helper_wraptext_words(**textwrap_opts)
             # print('"%s"' % innerTextWrapped)
             # print(self, id(self), self._innerTextWrapped, innerTextWrapped)
             rewrap = False
@@ -173,7 +171,7 @@ class UI_Core_Content:
                 self._children_text = []
                 self._text_map = []
                 idx = 0
-                for l in self._innerTextWrapped.splitlines():
+                for words in innerTextLines:
                     if self._children_text:
                         ui_br = self._generate_new_ui_elem(tagName='br', text_child=True)
                         self._text_map.append({
@@ -184,13 +182,7 @@ class UI_Core_Content:
                             'pre': '',
                         })
                         idx += 1
-                    if self._whitespace in {'pre', 'nowrap'}:
-                        words = [l]
-                    else:
-                        words = re.split(r'([^ \n]* +)', l)
                     for word in words:
-                        if not word: continue
-                        for f,t in html_to_unicode.no_arrows.items(): word = word.replace(f, t)
                         ui_word = self._generate_new_ui_elem(innerTextAsIs=word, text_child=True)
                         #tagName=self._tagName, pseudoelement='text',
                         for i in range(len(word)):
@@ -424,18 +416,18 @@ class UI_Core_Content:
             with profiler.code('computing text sizes'):
                 # TODO: allow word breaking?
                 # size_prev = Globals.drawing.set_font_size(self._textwrap_opts['fontsize'], fontid=self._textwrap_opts['fontid'], force=True)
-                size_prev = Globals.drawing.set_font_size(self._parent._fontsize, fontid=self._parent._fontid) #, force=True)
                 ts = self._parent._textshadow
                 if ts is None: tsx,tsy = 0,0
                 else: tsx,tsy,tsc = ts
 
-                # subtract 1/4 width of space to make text look a little nicer
-                subw = (Globals.drawing.get_text_width(' ') * 0.25) if self._innerTextAsIs and self._innerTextAsIs[-1] == ' ' else 0
-
+                # note: text sizes are cached across all elements
+                w, h = helper_textsize(
+                    self._innerTextAsIs, self._parent._fontid, self._parent._fontsize,
+                    Globals.drawing.get_dpi_mult(), tsx, tsy,
+                )
                 static_content_size = Size2D()
-                static_content_size.set_all_widths(ceil(Globals.drawing.get_text_width(self._innerTextAsIs) - subw) + abs(tsx))
-                static_content_size.set_all_heights(ceil(Globals.drawing.get_line_height(self._innerTextAsIs)) + abs(tsy))
-                Globals.drawing.set_font_size(size_prev, fontid=self._parent._fontid) #, force=True)
+                static_content_size.set_all_widths(w)
+                static_content_size.set_all_heights(h)
                 #print(f'"{self._innerTextAsIs}": {static_content_size.width} x {static_content_size.height}')
 
         elif self._src in {'image', 'image loading'}:
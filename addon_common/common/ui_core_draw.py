@@ -93,6 +93,7 @@ class UI_Core_Draw:
                         child._draw(offset)
                     Globals.drawing.set_font_size(size_prev, fontid=self._fontid)
                 elif self._innerTextAsIs is not None:
+                    ui_draw.flush()
                     Globals.drawing.text_draw2D_simple(self._innerTextAsIs, (ol, ot))
                 else:
                     for child in self._children_all_sorted:
@@ -115,6 +116,7 @@ class UI_Core_Draw:
         ox,oy = offset
         with gpustate.ScissorStack.wrap(self._l+ox, self._t+oy, self._w, self._h):
             if self._cacheRenderBuf:
+                ui_draw.flush()
                 gpustate.blend('ALPHA_PREMULT')
                 texture_id = self._cacheRenderBuf.color_texture
                 if True:
@@ -141,6 +143,13 @@ class UI_Core_Draw:
             # do not already have a render buffer, so create one
             self._cacheRenderBuf = gpustate.FrameBuffer(self._w, self._h)
 
+    def _cache_draw_real(self, offset):
+        # batched elements must be drawn before switching framebuffers
+        ui_draw.flush()
+        with self._cacheRenderBuf.bind():
+            self._draw_real(offset)
+            ui_draw.flush()
+
     def _cache_hierarchical(self, depth):
         if self._innerTextAsIs is not None: return   # do not cache this low level!
         if self._innerText is not None: return
@@ -152,10 +161,9 @@ class UI_Core_Draw:
         self._cache_create()
 
         sl, st, sw, sh = 0, self._h - 1, self._w, self._h
-        with self._cacheRenderBuf.bind():
-            self._draw_real((-self._l, -self._b))
-            # with gpustate.ScissorStack.wrap(sl, st, sw, sh, clamp=False):
-            #     self._draw_real((-self._l, -self._b))
+        self._cache_draw_real((-self._l, -self._b))
+        # with gpustate.ScissorStack.wrap(sl, st, sw, sh, clamp=False):
+        #     self._draw_real((-self._l, -self._b))
 
     def _cache_textleaves(self, depth):
         for child in self._children_all_sorted:
@@ -167,15 +175,13 @@ class UI_Core_Draw:
             return
         self._cache_create()
         sl, st, sw, sh = 0, self._h - 1, self._w, self._h
-        with self._cacheRenderBuf.bind():
-            self._draw_real((-self._l, -self._b))
-            # with gpustate.ScissorStack.wrap(sl, st, sw, sh, clamp=False):
-            #     self._draw_real((-self._l, -self._b))
+        self._cache_draw_real((-self._l, -self._b))
+        # with gpustate.ScissorStack.wrap(sl, st, sw, sh, clamp=False):
+        #     self._draw_real((-self._l, -self._b))
 
     def _cache_onlyroot(self, depth):
         self._cache_create()
-        with self._cacheRenderBuf.bind():
-            self._draw_real((0,0))
+        self._cache_draw_real((0,0))
 
     @profiler.function
     def _cache(self, depth=0):
@@ -217,6 +223,7 @@ class UI_Core_Draw:
         if vscroll < 1: return
         with gpustate.ScissorStack.wrap(self._l, self._t, self._w, self._h, msg=str(self)):
             with profiler.code('drawing scrollbar'):
+                ui_draw.flush()
                 gpustate.blend('ALPHA_PREMULT', only='enable')
                 w = 3
                 h = self._h - (mt+bw+pt) - (mb+bw+pb) - 6
@@ -20,12 +20,15 @@ Created by Jonathan Denning, Jonathan Williamson
 '''
 
 import os
+import threading
 
 import gpu
+import numpy as np
 
+from . import ui_settings
 from .blender import tag_redraw_all, get_path_from_addon_common, get_path_from_addon_root
 from .decorators import debug_test_call, blender_version_wrapper, add_cache
-from .utils import iter_head, any_args, join
+from .utils import iter_head, any_args, join, LRUCache
 
 from ..ext import png
 from ..ext.apng import APNG
@@ -68,11 +71,15 @@ def get_image_path(fn, ext=None, subfolders=None):
         default=None,
     )
 
+'''
+images are numpy arrays of shape (height, width, 4) and dtype uint8 (RGBA8), top row first
+'''
+
 def load_image_png(path):
-    # note: assuming 4 channels (rgba) per pixel!
-    width, height, data, m = png.Reader(path).asRGBA()
-    img = [[row[i:i+4] for i in range(0, width*4, 4)] for row in data]
-    return img
+    # asRGBA8 converts any png (gray, palette, 16-bit, ...) to rows of RGBA8 bytes
+    width, height, rows, m = png.Reader(path).asRGBA8()
+    data = b''.join(rows)
+    return np.frombuffer(data, dtype=np.uint8).reshape((height, width, 4))
 
 def load_image_apng(path):
     im_apng = APNG.open(path)
@@ -82,32 +89,46 @@ def load_image_apng(path):
     img = [[r[i:i+4] for i in range(0,w*4,4)] for r in d]
     return img
 
-@add_cache('_cache', {})
+def _image_nbytes(img): return img.nbytes
+
+_image_cache_lock = threading.Lock()
+
+# optional ImageCacheFile of pre-decoded images (see image_cache.py and ImagePreloader)
+_image_cache_file = None
+def set_image_cache_file(image_cache_file):
+    global _image_cache_file
+    _image_cache_file = image_cache_file
+
+@add_cache('_cache', LRUCache(max_size=ui_settings.IMAGE_CACHE_MAX_BYTES, sizeof=_image_nbytes))
 def load_image(fn):
     # important: assuming all images have distinct names!
-    if fn not in load_image._cache:
-        # have not seen this image before
+    # note: image is decoded outside of lock, so two threads might decode same image (harmless)
+    with _image_cache_lock:
+        img = load_image._cache.get(fn)
+    if img is None:
+        # have not seen this image before (or it was evicted)
         path = get_image_path(fn)
         _,ext = os.path.splitext(fn)
         # print(f'UI: Loading image "{fn}" (path={path})')
-        if   ext == '.png':  img = load_image_png(path)
+        if _image_cache_file: img = _image_cache_file.get(fn, path)
+        if img is not None: pass    # pre-decoded
+        elif ext == '.png':  img = load_image_png(path)
         elif ext == '.apng': img = load_image_apng(path)
         else: assert False, f'load_image: unhandled type ({ext}) for {fn}'
-        load_image._cache[fn] = img
-    return load_image._cache[fn]
+        img = np.asarray(img, dtype=np.uint8)
+        with _image_cache_lock:
+            load_image._cache[fn] = img
+    return img
 
 @add_cache('_image', None)
 def get_unfound_image():
-    if not get_unfound_image._image:
+    if get_unfound_image._image is None:
         c0, c1 = [128,128,128,0], [128,128,128,128]
         w, h = 10, 10
-        image = []
-        for y in range(h):
-            row = []
-            for x in range(w):
-                c = c0 if (x+y)%2 == 0 else c1
-                row.append(c)
-            image.append(row)
+        checker = (np.add.outer(np.arange(h), np.arange(w)) % 2).astype(bool)
+        image = np.empty((h, w, 4), dtype=np.uint8)
+        image[~checker] = c0
+        image[checker]  = c1
         get_unfound_image._image = image
     return get_unfound_image._image
 
@@ -118,39 +139,53 @@ def get_loading_image(fn):
     return load_image(nfn) if get_image_path(nfn) else get_unfound_image()
 
 def is_image_cached(fn):
-    return fn in load_image._cache
+    return fn in load_texture._cache or fn in load_image._cache
 
 def has_thumbnail(fn):
     nfn = f'{os.path.splitext(fn)[0]}.thumb.png'
     return get_image_path(nfn) is not None
 
 def set_image_cache(fn, img):
-    if fn in load_image._cache: return
-    load_image._cache[fn] = img
+    with _image_cache_lock:
+        if fn in load_image._cache: return
+        load_image._cache[fn] = img
 
 def preload_image(*fns):
     return [ (fn, load_image(fn)) for fn in fns ]
 
-@add_cache('_cache', {})
+def _create_gputexture(image):
+    height, width, _ = image.shape
+    image = np.ascontiguousarray(image[::-1])   # flip image (GPU textures are bottom row first)
+    try:
+        # upload bytes as-is (no per-pixel conversion, 1/4 the size of FLOAT data)
+        buffer = gpu.types.Buffer('UBYTE', image.size, image.ravel())
+        return gpu.types.GPUTexture((width, height), format='RGBA8', data=buffer)
+    except (ValueError, TypeError):
+        # some Blender versions only accept FLOAT buffers as GPUTexture data
+        image = image.astype(np.float32).ravel() / 255.0
+        buffer = gpu.types.Buffer('FLOAT', image.size, image)
+        return gpu.types.GPUTexture((width, height), format='RGBA8', data=buffer)
+
+def _texture_nbytes(texture): return texture['width'] * texture['height'] * 4
+
+@add_cache('_cache', LRUCache(max_size=ui_settings.TEXTURE_CACHE_MAX_BYTES, sizeof=_texture_nbytes))
 def load_texture(fn_image, image=None):
-    if fn_image not in load_texture._cache:
+    texture = load_texture._cache.get(fn_image)
+    if texture is None:
         if image is None: image = load_image(fn_image)
+        image = np.asarray(image, dtype=np.uint8)
         # print(f'UI: Buffering texture "{fn_image}"')
-        height,width,depth = len(image),len(image[0]),len(image[0][0])
+        height,width,depth = image.shape
         assert depth == 4, 'Expected texture %s to have 4 channels per pixel (RGBA), not %d' % (fn_image, depth)
-        image = reversed(image) # flip image
-        image_flat = [d for r in image for c in r for d in c]
-        buffer = gpu.types.Buffer('FLOAT', (width * height * 4), [v / 255.0 for v in image_flat])
-        gputexture = gpu.types.GPUTexture((width, height), format='RGBA16F', data=buffer)
-
-        load_texture._cache[fn_image] = {
+        texture = {
             'width':  width,
             'height': height,
             'depth':  depth,
             'texid':  None, #texid,
-            'gputexture': gputexture,
+            'gputexture': _create_gputexture(image),
         }
-    return load_texture._cache[fn_image]
+        load_texture._cache[fn_image] = texture
+    return texture
 
 def async_load_image(fn_image, callback):
     img = load_image(fn_image)
@@ -86,6 +86,9 @@ class UI_Core_Layout:
                DO NOT PREVENT THIS, otherwise layout bugs will occur!
     '''
 
+    # number of elements actually laid out (not skipped as clean); reset and read by UI_Document.force_clean
+    _layout_count = 0
+
     def _layout2(self, **kwargs):
         if self._defer_clean or not self.is_visible: return
 
@@ -152,6 +155,8 @@ class UI_Core_Layout:
         if not self._dirtying_flow and not self._dirtying_children_flow and not tabled:
             return
 
+        UI_Core_Layout._layout_count += 1
+
         if ui_settings.DEBUG_LIST:
             self._debug_list.append(f'{time.ctime()} layout self={self._dirtying_flow} children={self._dirtying_children_flow} fitting_size={fitting_size}')
 
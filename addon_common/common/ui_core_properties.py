@@ -204,7 +204,11 @@ class UI_Core_Properties:
             #self.dirty('changing innerText changes size', 'size', children=True)
             self._new_content = True
             self.dirty_flow()
-            if self._parent: self._parent.dirty_content(cause='changing innerText')
+            if self._parent:
+                # text does not dirty its parent's flow (see _do_not_dirty_parent), and dirty_content is a
+                # no-op when parent content is already dirty, so explicitly relayout parent (and its table)
+                self._parent.dirty_content(cause='changing innerText')
+                self._parent.dirty_flow()
         elif len(self._children) == 1 and self._children[0]._pseudoelement == 'text':
             self._children[0].innerText = nText
         else:
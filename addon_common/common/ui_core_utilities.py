@@ -55,6 +55,7 @@ from .maths import Vec2D, Color, mid, Box2D, Size1D, Size2D, Point2D, RelPoint2D
 from .maths import floor_if_finite, ceil_if_finite
 from .profiler import profiler, time_it
 from .utils import iter_head, any_args, join
+from . import html_to_unicode
 
 from ..ext import png
 from ..ext.apng import APNG
@@ -336,6 +337,42 @@ def helper_wraptext(text='', width=float('inf'), fontid=0, fontsize=12, preserve
     if False: print('wrapped ' + str(random.random()))
     return text
 
+@lru_cache(maxsize=1024)
+def helper_wraptext_words(text='', width=float('inf'), fontid=0, fontsize=12, dpi=1, whitespace='normal'):
+    '''
+    wraps text and splits wrapped lines into words (text runs), returning (wrapped text, lines of words).
+    cached (LRU) and shared across all UI elements, so relayouts do not rewrap or resplit unchanged text.
+    '''
+    wrapped = helper_wraptext(
+        text=text, width=width, fontid=fontid, fontsize=fontsize, dpi=dpi,
+        preserve_newlines=(whitespace in {'pre',    'pre-line', 'pre-wrap'}),
+        collapse_spaces=(whitespace   in {'normal', 'nowrap',   'pre-line'}),
+        wrap_text=(whitespace         in {'normal', 'pre-wrap', 'pre-line'}),
+    )
+    lines = []
+    for l in wrapped.splitlines():
+        words = [l] if whitespace in {'pre', 'nowrap'} else re.split(r'([^ \n]* +)', l)
+        words = [word for word in words if word]
+        for i_word, word in enumerate(words):
+            for f,t in html_to_unicode.no_arrows.items(): word = word.replace(f, t)
+            words[i_word] = word
+        lines.append(tuple(words))
+    return (wrapped, tuple(lines))
+
+@lru_cache(maxsize=4096)
+def helper_textsize(text, fontid, fontsize, dpi, shadow_x=0, shadow_y=0):
+    '''
+    returns (width, height) of a single text run as drawn by a UI element.
+    cached (LRU) and shared across all UI elements.  note: dpi is only used as part of the cache key
+    '''
+    size_prev = Globals.drawing.set_font_size(fontsize, fontid=fontid)
+    # subtract 1/4 width of space to make text look a little nicer
+    subw = (Globals.drawing.get_text_width(' ') * 0.25) if text and text[-1] == ' ' else 0
+    width  = ceil(Globals.drawing.get_text_width(text) - subw) + abs(shadow_x)
+    height = ceil(Globals.drawing.get_line_height(text)) + abs(shadow_y)
+    Globals.drawing.set_font_size(size_prev, fontid=fontid)
+    return (width, height)
+
 
 @add_cache('guid', 0)
 def get_unique_ui_id(prefix='', postfix=''):
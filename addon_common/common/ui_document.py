@@ -44,6 +44,7 @@ from . import ui_settings
 from .gpustate import ScissorStack
 from .ui_linefitter import LineFitter
 from .ui_core import UI_Element
+from .ui_core_layout import UI_Core_Layout
 from .ui_core_preventmulticalls import UI_Core_PreventMultiCalls
 from .blender import tag_redraw_all
 from .ui_styling import UI_Styling, ui_defaultstylings
@@ -99,6 +100,7 @@ class UI_Document:
         self._draw_count = 0
         self._draw_time = 0
         self._draw_fps = 0
+        self.layout_count = 0       # number of elements laid out during last force_clean (debug)
 
     def add_exception_callback(self, fn):
         self._exception_callbacks += [fn]
@@ -660,20 +662,23 @@ class UI_Document:
         for o in self._callbacks['preclean']: o._call_preclean()
         self._body.clean()
         for o in self._callbacks['postclean']: o._call_postclean()
-        self._body._layout(
-            # linefitter=LineFitter(left=0, top=h-1, width=w, height=h),
-            fitting_size=sz,
-            fitting_pos=Point2D((0,h-1)),
-            parent_size=sz,
-            nonstatic_elem=self._body,
-            table_data={},
-        )
-        self._body.set_view_size(sz)
+
+        # only dirty subtrees (and the ancestors they dirtied) are laid out; clean elements return early
+        UI_Core_Layout._layout_count = 0
+        self._layout_body(sz, h)
         for o in self._callbacks['postflow']: o._call_postflow()
         for fn in self._callbacks['postflow once']: fn()
         self._callbacks['postflow once'].clear()
+        if self._reposition_tooltip_before_draw:
+            self._reposition_tooltip_before_draw = False
+            self._reposition_tooltip()
 
-        # UI_Core_PreventMultiCalls.reset_multicalls()
+        # second pass only if postflow callbacks or tooltip repositioning changed something
+        if self._body._dirtying_flow or self._body._dirtying_children_flow:
+            self._layout_body(sz, h)
+        self.layout_count = UI_Core_Layout._layout_count
+
+    def _layout_body(self, sz, h):
         self._body._layout(
             # linefitter=LineFitter(left=0, top=h-1, width=w, height=h),
             fitting_size=sz,
@@ -683,9 +688,6 @@ class UI_Document:
             table_data={},
         )
         self._body.set_view_size(sz)
-        if self._reposition_tooltip_before_draw:
-            self._reposition_tooltip_before_draw = False
-            self._reposition_tooltip()
 
     @profiler.function
     def draw(self, context):
@@ -705,7 +707,8 @@ class UI_Document:
         gpustate.depth_test('NONE')
 
         Globals.drawing.glCheckError('UI_Document.draw: drawing')
-        self._body.draw()
+        with Globals.ui_draw.batching():
+            self._body.draw()
         ScissorStack.end()
 
         self._draw_count += 1
@@ -21,6 +21,7 @@ Created by Jonathan Denning, Jonathan Williamson
 
 import bpy
 import gpu
+from contextlib import contextmanager
 from bpy.app import version as blender_version
 
 from gpu_extras.batch import batch_for_shader
@@ -28,8 +29,10 @@ from gpu_extras.batch import batch_for_shader
 from .ui_styling import UI_Styling
 
 from . import gpustate
+from . import ui_settings
 from .globals import Globals
 from .maths import Color, NumberUnit
+from .utils import LRUCache
 
 style_to_image_scale = {
     'fill':       0, # default.  stretch/squash to fill entire container
@@ -116,6 +119,17 @@ if not bpy.app.background:
     ui_draw_shader, ui_draw_ubos = gpustate.gpu_shader('UI_Draw', vertex_shader, fragment_shader, defines=defines)
     ui_draw_batch = batch_for_shader(ui_draw_shader, *draw_data)
 
+    # batched variant: all options are per-vertex attributes, so many elements can be drawn with one call
+    batched_defines = defines | { 'UI_DRAW_BATCHED': True }
+    vertex_shader, fragment_shader = gpustate.shader_parse_file('ui_element_batch.glsl', includeVersion=False)
+    ui_draw_batched_shader, _ = gpustate.gpu_shader('UI_Draw Batched', vertex_shader, fragment_shader, defines=batched_defines)
+
+batched_attribs = [
+    'lrtb', 'whd', 'margin_lrtb', 'padding_lrtb', 'border_width_radius',
+    'border_left_color', 'border_right_color', 'border_top_color', 'border_bottom_color',
+    'background_color', 'scissor_lbrt',
+]
+
 
 class UI_Draw:
     default_stylesheet = None
@@ -124,32 +138,144 @@ class UI_Draw:
     def load_stylesheet(path):
         UI_Draw.default_stylesheet = UI_Styling.from_file(path)
 
+    def __init__(self):
+        self._batched = None        # list of pending element options when batching, otherwise None
+        self._batched_scissor = None
+        # per-vertex options of each element, reused until element's layout or style changes.
+        # style is part of key by identity, because elements create a new style cache whenever style is dirtied
+        self._element_opts = LRUCache(max_size=4096)
+        # GPU batches of batched elements, reused when same elements are drawn with same options
+        self._gpubatches = LRUCache(max_size=64)
+        self.batched_stats = { 'elements': 0, 'draw calls': 0, 'batches built': 0 }
+
+    def get_batched_stats_str(self):
+        s = self.batched_stats
+        return f'{s["elements"]} elements, {s["draw calls"]} draw calls, {s["batches built"]} batches built'
+
     def update(self): pass
 
-    def draw(self, left, top, width, height, dpi_mult, style, texture_id=None, gputexture=None, texture_fit='fill', background_override=None, depth=None):
+    @contextmanager
+    def batching(self):
+        '''
+        collects UI elements without images and draws them with as few draw calls as possible.
+        NOTE: anything else that draws (text, textures, lines, etc.) or changes the framebuffer or
+              projection must call `flush()` first so that drawing order is preserved!
+        '''
+        if not ui_settings.BATCH_DRAWING or self._batched is not None:
+            yield None
+            return
+        self._batched = []
+        self._batched_scissor = None
+        try:
+            yield None
+            self.flush()
+        finally:
+            self._batched = None
+
+    def _compute_options(self, left, top, width, height, dpi_mult, style, background_override, depth):
         def_color = (0,0,0,0)
         def get_v(style_key, def_val):
             v = style.get(style_key, def_val)
             return v if not isinstance(v, NumberUnit) else (v.val() * dpi_mult)
+        return (
+            (float(left), float(left + (width - 1)), float(top), float(top - (height - 1))),
+            (float(width), float(height), float(depth or 0), 0),
+            tuple(get_v(f'margin-{p}',  0) for p in ['left', 'right', 'top', 'bottom']),
+            tuple(get_v(f'padding-{p}', 0) for p in ['left', 'right', 'top', 'bottom']),
+            (get_v('border-width', 0), get_v('border-radius', 0), 0, 0),
+            Color.as_vec4(get_v('border-left-color',   def_color)),
+            Color.as_vec4(get_v('border-right-color',  def_color)),
+            Color.as_vec4(get_v('border-top-color',    def_color)),
+            Color.as_vec4(get_v('border-bottom-color', def_color)),
+            Color.as_vec4(background_override if background_override else get_v('background-color', def_color)),
+        )
+
+    def _get_batched_options(self, left, top, width, height, dpi_mult, style, background_override, depth):
+        key = (id(style), left, top, width, height, dpi_mult, (tuple(background_override) if background_override else None), depth)
+        entry = self._element_opts.get(key)
+        if entry is None or entry[0] is not style:
+            opts = self._compute_options(left, top, width, height, dpi_mult, style, background_override, depth)
+            # options must be hashable so that batches can be reused (see flush)
+            entry = self._element_opts[key] = (style, tuple(tuple(opt) for opt in opts))
+        return entry[1]
 
+    def draw(self, left, top, width, height, dpi_mult, style, texture_id=None, gputexture=None, texture_fit='fill', background_override=None, depth=None):
+        if self._batched is not None:
+            if gputexture is None:
+                self._batch(self._get_batched_options(left, top, width, height, dpi_mult, style, background_override, depth))
+                return
+            # images are drawn immediately, so draw all pending elements first
+            self.flush()
+
+        opts = self._compute_options(left, top, width, height, dpi_mult, style, background_override, depth)
+
+        (
+            lrtb, whd, margin_lrtb, padding_lrtb, border_width_radius,
+            border_left_color, border_right_color, border_top_color, border_bottom_color,
+            background_color,
+        ) = opts
         ui_draw_shader.bind()
         ui_draw_ubos.options.uMVPMatrix          = gpu.matrix.get_projection_matrix() @ gpu.matrix.get_model_view_matrix()
-        ui_draw_ubos.options.lrtb                = (float(left), float(left + (width - 1)), float(top), float(top - (height - 1)))
-        ui_draw_ubos.options.wh                  = (float(width), float(height), 0, 0)
+        ui_draw_ubos.options.lrtb                = lrtb
+        ui_draw_ubos.options.wh                  = (whd[0], whd[1], 0, 0)
         ui_draw_ubos.options.depth               = (depth, 0, 0, 0)
-        ui_draw_ubos.options.margin_lrtb         = [ get_v(f'margin-{p}',  0) for p in ['left', 'right', 'top', 'bottom'] ]
-        ui_draw_ubos.options.padding_lrtb        = [ get_v(f'padding-{p}', 0) for p in ['left', 'right', 'top', 'bottom'] ]
-        ui_draw_ubos.options.border_width_radius = [ get_v('border-width', 0), get_v('border-radius', 0), 0, 0 ]
-        ui_draw_ubos.options.border_left_color   = Color.as_vec4(get_v('border-left-color',   def_color))
-        ui_draw_ubos.options.border_right_color  = Color.as_vec4(get_v('border-right-color',  def_color))
-        ui_draw_ubos.options.border_top_color    = Color.as_vec4(get_v('border-top-color',    def_color))
-        ui_draw_ubos.options.border_bottom_color = Color.as_vec4(get_v('border-bottom-color', def_color))
-        ui_draw_ubos.options.background_color    = Color.as_vec4(background_override if background_override else get_v('background-color', def_color))
+        ui_draw_ubos.options.margin_lrtb         = list(margin_lrtb)
+        ui_draw_ubos.options.padding_lrtb        = list(padding_lrtb)
+        ui_draw_ubos.options.border_width_radius = list(border_width_radius)
+        ui_draw_ubos.options.border_left_color   = border_left_color
+        ui_draw_ubos.options.border_right_color  = border_right_color
+        ui_draw_ubos.options.border_top_color    = border_top_color
+        ui_draw_ubos.options.border_bottom_color = border_bottom_color
+        ui_draw_ubos.options.background_color    = background_color
         ui_draw_ubos.options.image_settings      = [ (1 if gputexture is not None else 0), style_to_image_scale.get(texture_fit, 0), 0, 0 ]
         if gputexture: ui_draw_shader.uniform_sampler('image', gputexture)
         ui_draw_shader.uniform_bool('srgbTarget', blender_version < (5, 0, 0))
         ui_draw_ubos.update_shader()
         ui_draw_batch.draw(ui_draw_shader)
 
+    def _batch(self, opts):
+        if gpustate.ScissorStack.is_started:
+            sl, st, sw, sh = gpustate.ScissorStack.get_current_view()
+            if sw <= 0 or sh <= 0: return
+            scissor = (float(sl), float(st - (sh - 1)), float(sl + sw), float(st + 1))
+            bl, bb, br, bt = self._batched_scissor or scissor
+            self._batched_scissor = (min(bl, scissor[0]), min(bb, scissor[1]), max(br, scissor[2]), max(bt, scissor[3]))
+        else:
+            scissor = (-1e9, -1e9, 1e9, 1e9)
+        self._batched.append(opts + (scissor,))
+
+    def flush(self):
+        '''
+        draws all pending batched elements with one draw call.
+        the GPU batch is only rebuilt (and uploaded) if an element was added, removed, moved, or restyled.
+        '''
+        if not self._batched: return
+        batched, self._batched = tuple(self._batched), []
+        scissor, self._batched_scissor = self._batched_scissor, None
+
+        batch = self._gpubatches.get(batched)
+        if batch is None:
+            # each element is expanded to six vertices (two triangles), each with a copy of element's options
+            corners = draw_data[1]['pos']
+            content = { 'pos': corners * len(batched) }
+            for i_attrib, attrib in enumerate(batched_attribs):
+                content[attrib] = [ opts[i_attrib] for opts in batched for _ in corners ]
+            batch = self._gpubatches[batched] = batch_for_shader(ui_draw_batched_shader, 'TRIS', content)
+            self.batched_stats['batches built'] += 1
+
+        if scissor:
+            # scissor each element in fragment shader, so open up scissor box to include all batched elements
+            l, b, r, t = map(int, scissor)
+            gpustate.scissor(l, b, r - l, t - b)
+        ui_draw_batched_shader.bind()
+        ui_draw_batched_shader.uniform_float('uMVPMatrix', gpu.matrix.get_projection_matrix() @ gpu.matrix.get_model_view_matrix())
+        ui_draw_batched_shader.uniform_bool('srgbTarget', blender_version < (5, 0, 0))
+        batch.draw(ui_draw_batched_shader)
+        if scissor:
+            gpustate.ScissorStack._set_scissor()
+
+        self.batched_stats['elements'] += len(batched)
+        self.batched_stats['draw calls'] += 1
+
 
 ui_draw = Globals.set(UI_Draw())
@@ -30,6 +30,11 @@ DEBUG_LIST      = False
 
 CACHE_METHOD    = 2             # 0:none, 1:only root, 2:hierarchical, 3:text leaves, 4:hierarchical but random
 
+BATCH_DRAWING   = True          # draw UI elements (without images) with as few draw calls as possible
+
 ASYNC_IMAGE_LOADING = True
 
+IMAGE_CACHE_MAX_BYTES   = 256 * 1024 * 1024     # decoded RGBA8 images kept in memory (least recently used are dropped)
+TEXTURE_CACHE_MAX_BYTES = 256 * 1024 * 1024     # RGBA8 GPU textures kept alive by the texture cache
+
 
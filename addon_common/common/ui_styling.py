@@ -47,7 +47,7 @@ from .blender import get_path_from_addon_common
 from .decorators import blender_version_wrapper, debug_test_call, add_cache
 from .maths import Point2D, Vec2D, clamp, mid, Color, NumberUnit
 from .profiler import profiler
-from .utils import iter_head, UniqueCounter, join
+from .utils import iter_head, UniqueCounter, join, LRUCache
 
 
 '''
@@ -435,11 +435,16 @@ class UI_Style_RuleSet:
     def __repr__(self): return self.__str__()
 
     @staticmethod
-    @add_cache('_cache', {})
     def _split_selector(sel):
+        return dict(UI_Style_RuleSet._split_selector_cached(sel))  # NOTE: _not_ a deep copy!
+
+    @staticmethod
+    @add_cache('_cache', {})
+    def _split_selector_cached(sel):
         # (?:(?P<type>[.#:[]+)?(?P<name>[^\n .#:[=\]]+)(?:=\"(?P<val>[^\"]+)\")?]?)
-        cache = UI_Style_RuleSet._split_selector._cache
-        osel = str(sel)
+        # NOTE: returned dict is shared, so it must not be modified!  use _split_selector to get a copy
+        cache = UI_Style_RuleSet._split_selector_cached._cache
+        osel = sel if type(sel) is str else str(sel)
         if osel not in cache:
             p = {'type':'*', 'class':set(), 'id':'', 'pseudoelement':'', 'pseudoclass':set(), 'attribs':set(), 'attribvals':{}}
 
@@ -463,13 +468,16 @@ class UI_Style_RuleSet:
             if p['pseudoelement']: p['names'].add(p['pseudoelement'])
 
             cache[osel] = p
-        return dict(cache[osel])  # NOTE: _not_ a deep copy!
+        return cache[osel]
 
     @staticmethod
     @add_cache('_cache', {})
     def _join_selector_parts(p):
         cache = UI_Style_RuleSet._join_selector_parts._cache
-        op = str(p)
+        op = (
+            p['type'], p['id'], frozenset(p['class']), p['pseudoelement'], frozenset(p['pseudoclass']),
+            frozenset(p['attribs']), frozenset(p['attribvals'].items()),
+        )
         if op not in cache:
             sel = p['type'] or '*'
             if p['id']:            sel += f'#{p["id"]}'
@@ -538,7 +546,7 @@ class UI_Style_RuleSet:
 
     @staticmethod
     def match_selector(sel_elem, sel_style, strip=None):
-        split = UI_Style_RuleSet._split_selector
+        split = UI_Style_RuleSet._split_selector_cached
         # print('UI_Style_RuleSet', sel_elem, sel_style)
         sel_elem  = UI_Styling.strip_selector_parts(sel_elem, strip)
         sel_style = UI_Styling.strip_selector_parts(sel_style, strip)
@@ -564,10 +572,10 @@ class UI_Style_RuleSet:
         uid = ruleset._uid
         inline = ruleset._inline
         defaults = ruleset._defaults
-        k = f'{uid} {selector} {inline} {defaults}'
+        k = (uid, tuple(selector), inline, defaults)
         cache = UI_Style_RuleSet.selector_specificity._cache
         if k not in cache:
-            split = UI_Style_RuleSet._split_selector
+            split = UI_Style_RuleSet._split_selector_cached
             a = 1 if inline else -1 if defaults else 0  # inline/defaults
             b = 0                   # id
             c = 0                   # class, pseudoclass, attrib, attribval
@@ -649,7 +657,7 @@ class UI_Styling:
                 elif k == '__selectors':
                     v = str(node_cur[k]).replace('"', '\\"')
                     print(f'{spc}"{k2}":"{v}",')
-                elif k == '__parent':
+                elif k in {'__parent', '__edges'}:
                     pass
                 elif k == '__uid':
                     print(f'{spc}"__uid":{node_cur[k]},')
@@ -675,9 +683,7 @@ class UI_Styling:
                 elif k == '__selectors':
                     v = str(node_cur[k]).replace('"', '\\"')
                     print(f'{spc}"{k2}":"{v}",')
-                elif k == '__parent':
-                    pass
-                elif k == '__uid':
+                elif k in {'__parent', '__edges', '__uid'}:
                     pass
                 else:
                     print(f'{spc}"{k2}":{{')
@@ -768,10 +774,31 @@ class UI_Styling:
                     node_cur.setdefault('__selectors', list()).append(nselector)            # only informational (debugging)
             return trie
 
+        def compile_trie(node):
+            # precompile edge labels into (kind, key, val, next node) so that matching does not parse labels
+            edges = []
+            for (label, node_next) in node.items():
+                if label.startswith('__'): continue
+                compile_trie(node_next)
+                if   label == ' ':      edges.append(('descendant', None, None, node_next))
+                elif label == '>':      edges.append(('child', None, None, node_next))
+                elif label == '*':      edges.append(('any', None, None, node_next))
+                elif label[0] == '#':   edges.append(('id', label[1:], None, node_next))
+                elif label[0] == '.':   edges.append(('class', label[1:], None, node_next))
+                elif label[:2] == '::': edges.append(('pseudoelement', label[2:], None, node_next))
+                elif label[0] == ':':   edges.append(('pseudoclass', label[1:], None, node_next))
+                elif label[0] == '[':
+                    attrib_key, *attrib_val = label[1:-1].split('=')    # remove square brackets and split on `=`
+                    if attrib_val: edges.append(('attribval', attrib_key, attrib_val[0][1:-1], node_next))  # remove quotes
+                    else:          edges.append(('attrib', attrib_key, None, node_next))
+                else:                   edges.append(('type', label, None, node_next))
+            node['__edges'] = edges
+            return node
+
         if not self._trie_full:
-            self._trie_full = build_trie()
+            self._trie_full = compile_trie(build_trie())
         if not self._trie_stripped:
-            self._trie_stripped = build_trie(strip={
+            self._trie_stripped = compile_trie(build_trie(strip={
                 # 'type',
                 # 'classes',
                 # 'id',
@@ -779,105 +806,80 @@ class UI_Styling:
                 'pseudoclasses',
                 'attributes',
                 'attributevalues',
-            })
+            }))
 
     def get_matching_rules(self, selector, full_trie=True):
         self.optimize()
         rules = []
-        split = UI_Style_RuleSet._split_selector
+        split = UI_Style_RuleSet._split_selector_cached
         parts = [split(p) for p in selector]
         if not parts: return []
-        def m(node_cur, part, parts, pseudoelement_handled, depth):
-            nonlocal rules
-            part_has_pseudoelement = bool(part['pseudoelement'])
-            for (edge_label, node_next) in node_cur.items():
-                if edge_label == ' ':
-                    ps = parts
-                    while ps:
-                        p,ps = ps[-1],ps[:-1]
-                        m(node_next, p, ps, False, depth+1)
-                elif edge_label == '>':
-                    if parts:
-                        m(node_next, parts[-1], parts[:-1], False, depth+1)
-                elif edge_label == '*' and (pseudoelement_handled or not part_has_pseudoelement):
-                    m(node_next, part, parts, pseudoelement_handled, depth+1)
-                elif edge_label[0] == '#':
-                    if edge_label[1:] == part['id']:
-                        m(node_next, part, parts, pseudoelement_handled, depth+1)
-                elif edge_label[0] == '.':
-                    if edge_label[1:] in part['class']:
-                        m(node_next, part, parts, pseudoelement_handled, depth+1)
-                elif edge_label[:2] == '::':
-                    if edge_label[2:] == part['pseudoelement']:
-                        m(node_next, part, parts, True, depth+1)
-                elif edge_label[0] == ':':
-                    if edge_label[1:] in part['pseudoclass']:
-                        m(node_next, part, parts, pseudoelement_handled, depth+1)
-                elif edge_label[0] == '[':
-                    attrib_parts = edge_label[1:-1].split('=')      # remove square brackets and split on `=`
-                    attrib_key = attrib_parts[0]
-                    if len(attrib_parts) == 1:
-                        if attrib_key in part['attribs']:
-                            m(node_next, part, parts, pseudoelement_handled, depth+1)
-                    else:
-                        attrib_val = attrib_parts[1][1:-1]          # remove quotes from attribute value
-                        if part['attribvals'].get(attrib_key) == attrib_val:
-                            m(node_next, part, parts, pseudoelement_handled, depth+1)
-                elif edge_label in {'__selectors', '__parent', '__uid'}:
-                    pass
-                elif edge_label == '__rulesets':
-                    rules.extend(node_cur['__rulesets'])
-                else:
-                    # assuming type
-                    if edge_label == part['type'] and (pseudoelement_handled or not part_has_pseudoelement):
-                        m(node_next, part, parts, pseudoelement_handled, depth+1)
-        m(self._trie_full if full_trie else self._trie_stripped, parts[-1], parts[:-1], False, 0)
+        def m(node_cur, part, parts, pseudoelement_handled):
+            if '__rulesets' in node_cur: rules.extend(node_cur['__rulesets'])
+            type_ok = pseudoelement_handled or not part['pseudoelement']
+            for (kind, key, val, node_next) in node_cur['__edges']:
+                match kind:
+                    case 'descendant':
+                        ps = parts
+                        while ps:
+                            p,ps = ps[-1],ps[:-1]
+                            m(node_next, p, ps, False)
+                    case 'child':
+                        if parts: m(node_next, parts[-1], parts[:-1], False)
+                    case 'any':
+                        if type_ok: m(node_next, part, parts, pseudoelement_handled)
+                    case 'type':
+                        if type_ok and key == part['type']: m(node_next, part, parts, pseudoelement_handled)
+                    case 'id':
+                        if key == part['id']: m(node_next, part, parts, pseudoelement_handled)
+                    case 'class':
+                        if key in part['class']: m(node_next, part, parts, pseudoelement_handled)
+                    case 'pseudoelement':
+                        if key == part['pseudoelement']: m(node_next, part, parts, True)
+                    case 'pseudoclass':
+                        if key in part['pseudoclass']: m(node_next, part, parts, pseudoelement_handled)
+                    case 'attrib':
+                        if key in part['attribs']: m(node_next, part, parts, pseudoelement_handled)
+                    case 'attribval':
+                        if part['attribvals'].get(key) == val: m(node_next, part, parts, pseudoelement_handled)
+        m(self._trie_full if full_trie else self._trie_stripped, parts[-1], parts[:-1], False)
         rules.sort(key=lambda sr:sr[0])
         return [r for (s,r) in rules]
 
     def has_matches_trie(self, selector, full_trie=True):
         self.optimize()
-        rules = []
-        def m(node_cur, part, parts, depth):
-            nonlocal rules
-            for (edge_label, node_next) in node_cur.items():
-                if   edge_label == ' ':
-                    ps = parts
-                    while ps:
-                        p,ps = ps[-1],ps[:-1]
-                        if m(node_next, p, ps, depth+1): return True
-                elif edge_label == '>':
-                    if parts and m(node_next, parts[-1], parts[:-1], depth+1): return True
-                elif edge_label == '*':
-                    if m(node_next, part, parts, depth+1): return True
-                elif edge_label[0] == '#':
-                    if edge_label[1:] == part['id'] and m(node_next, part, parts, depth+1): return True
-                elif edge_label[0] == '.':
-                    if edge_label[1:] in part['class'] and m(node_next, part, parts, depth+1): return True
-                elif edge_label[:2] == '::':
-                    if edge_label[2:] == part['pseudoelement'] and m(node_next, part, parts, depth+1): return True
-                elif edge_label[0] == ':':
-                    if edge_label[1:] in part['pseudoclass'] and m(node_next, part, parts, depth+1): return True
-                elif edge_label[0] == '[':
-                    attrib_parts = edge_label[1:-1].split('=')      # remove square brackets and split on `=`
-                    attrib_key = attrib_parts[0]
-                    if len(attrib_parts) == 1:
-                        if attrib_key in part['attribs'] and m(node_next, part, parts, depth+1): return True
-                    else:
-                        attrib_val = attrib_parts[1][1:-1]          # remove quotes from attribute value
-                        if part['attribvals'].get(attrib_key) == attrib_val and m(node_next, part, parts, depth+1): return True
-                elif edge_label in {'__selectors', '__parent', '__uid'}:
-                    pass
-                elif edge_label == '__rulesets':
-                    return True
-                else:
-                    # assuming type
-                    if edge_label == part['type'] and m(node_next, part, parts, depth+1): return True
+        def m(node_cur, part, parts):
+            if '__rulesets' in node_cur: return True
+            for (kind, key, val, node_next) in node_cur['__edges']:
+                match kind:
+                    case 'descendant':
+                        ps = parts
+                        while ps:
+                            p,ps = ps[-1],ps[:-1]
+                            if m(node_next, p, ps): return True
+                    case 'child':
+                        if parts and m(node_next, parts[-1], parts[:-1]): return True
+                    case 'any':
+                        if m(node_next, part, parts): return True
+                    case 'type':
+                        if key == part['type'] and m(node_next, part, parts): return True
+                    case 'id':
+                        if key == part['id'] and m(node_next, part, parts): return True
+                    case 'class':
+                        if key in part['class'] and m(node_next, part, parts): return True
+                    case 'pseudoelement':
+                        if key == part['pseudoelement'] and m(node_next, part, parts): return True
+                    case 'pseudoclass':
+                        if key in part['pseudoclass'] and m(node_next, part, parts): return True
+                    case 'attrib':
+                        if key in part['attribs'] and m(node_next, part, parts): return True
+                    case 'attribval':
+                        if part['attribvals'].get(key) == val and m(node_next, part, parts): return True
             return False
-        split = UI_Style_RuleSet._split_selector
+        split = UI_Style_RuleSet._split_selector_cached
         parts = [split(p) for p in selector]
         if not parts: return False
-        return m(self._trie_full if full_trie else self._trie_stripped, parts[-1], parts[:-1], 0)
+        return m(self._trie_full if full_trie else self._trie_stripped, parts[-1], parts[:-1])
 
 
     @staticmethod
@@ -895,6 +897,7 @@ class UI_Styling:
 
     def __init__(self, lines=None, inline=False, defaults=False):
         self._uid = UI_Styling.uid_generator.next()
+        self._version = 0
         self._inline = inline
         self._defaults = defaults
         self._rules = []
@@ -923,6 +926,7 @@ class UI_Styling:
     def dirty_optimization(self):
         self._trie_full = None
         self._trie_stripped = None
+        self._version += 1          # invalidates computed styles (see compute_style)
 
     @property
     def simple_str(self): return f'<UI_Styling{self._uid}>'
@@ -931,7 +935,7 @@ class UI_Styling:
     def get_decllist(self, selector):
         cache = self._decllist_cache
         if not self._rules: return []
-        oselector = str(selector)
+        oselector = tuple(selector)
         if oselector not in cache:
             # print('UI_Styling.get_decllist', selector)
             with profiler.code('UI_Styling.get_decllist: creating cached value'):
@@ -1035,12 +1039,22 @@ class UI_Styling:
         decllist = { k:v for (k,v) in decllist.items() if v != 'initial' }
         return decllist
 
+    _computed_style_cache = LRUCache(max_size=4096)
+
     @staticmethod
     @profiler.function
     def compute_style(selector, *stylings):
+        '''
+        returns computed style (dict) of selector.
+        results are cached per (selector, stylings), so returned dict is shared and must not be modified!
+        '''
         if selector is None: return {}
-        full_decllist = [dl for styling in stylings if styling for dl in styling.get_decllist(selector)]
-        decllist = UI_Styling._expand_declarations(full_decllist)
+        key = (tuple(selector), tuple((styling._uid, styling._version) if styling else None for styling in stylings))
+        decllist = UI_Styling._computed_style_cache.get(key)
+        if decllist is None:
+            full_decllist = [dl for styling in stylings if styling for dl in styling.get_decllist(selector)]
+            decllist = UI_Styling._expand_declarations(full_decllist)
+            UI_Styling._computed_style_cache[key] = decllist
         return decllist
 
     @staticmethod
@@ -1048,7 +1062,7 @@ class UI_Styling:
     def strip_selector_parts(selector, strip):
         if not strip: return selector
         cache = UI_Styling.strip_selector_parts._cache
-        oselector = str((selector, strip))
+        oselector = (tuple(selector), frozenset(strip))
         if oselector not in cache:
             nselector = []
             strip_type            = 'type' in strip
@@ -1060,7 +1074,7 @@ class UI_Styling:
             strip_attributevalues = 'attributevalues' in strip
             for sel in selector:
                 # p = {'type':'', 'class':set(), 'id':'', 'pseudoelement':set(), 'pseudoclass':set(), 'attribs':set(), 'attribvals':{}}
-                p = UI_Style_RuleSet._split_selector(str(sel))
+                p = UI_Style_RuleSet._split_selector(sel)
                 if strip_type:            p['type'] = '*'
                 if strip_id:              p['id'] = ''
                 if strip_classes:         p['class'] = set()
@@ -1086,7 +1100,7 @@ class UI_Styling:
             'attributevalues',
         }
         nselector = UI_Styling.strip_selector_parts(selector, strip)
-        onselector = str(nselector)
+        onselector = (tuple(nselector), tuple(styling._uid if styling else None for styling in stylings))
         if onselector not in cache:
             nstyling = UI_Styling()
             # include only the rules that _might_ apply to selector (assumes some selector parts change but others do not)
@@ -23,6 +23,7 @@ import re
 import time
 import inspect
 from copy import deepcopy
+from functools import lru_cache
 
 import bpy
 
@@ -283,6 +284,26 @@ def action_strip_mods(action, *, ctrl=True, shift=True, alt=True, oskey=True, cl
     if drag_click:   action = action.replace('+DRAG',   '')
     return action
 
+# order of flags in tuples passed to action_strip_mods_flags
+_strip_mods_names = ('ctrl', 'shift', 'alt', 'oskey', 'click', 'double_click', 'drag_click')
+_strip_mods_none  = (False,) * len(_strip_mods_names)
+
+@lru_cache(maxsize=4096)
+def action_strip_mods_flags(action, flags):
+    # same as action_strip_mods, but flags is a (hashable) tuple ordered as _strip_mods_names, so result can be cached
+    return action_strip_mods(action, **dict(zip(_strip_mods_names, flags)))
+
+def strip_mods_flags(*, ignoremods=False, ignorectrl=False, ignoreshift=False, ignorealt=False, ignoreoskey=False, ignoremulti=False, ignoreclick=False, ignoredouble=False, ignoredrag=False):
+    return (
+        ignorectrl   or ignoremods,
+        ignoreshift  or ignoremods,
+        ignorealt    or ignoremods,
+        ignoreoskey  or ignoremods,
+        ignoreclick  or ignoremulti,
+        ignoredouble or ignoremulti,
+        ignoredrag   or ignoremulti,
+    )
+
 def action_add_mods(action, *, ctrl=False, shift=False, alt=False, oskey=False, click=False, double_click=False, drag_click=False):
     if not action: return action
     action = translate_action.get(action, action)
@@ -351,6 +372,9 @@ class Actions:
                     action, op_props = kmi_to_action(kmi), kmi_to_op_properties(kmi)
                     self.keymaps_blender_operators[action] += [op_props]
 
+        # compiled tables depend only on keymaps, so they persist across events and context updates
+        self.invalidate_keymaps()
+
         self.timer      = False     # is action from timer?
         self.time_delta = 0         # elapsed time since last "step" (units=seconds)
         self.time_last  = time.time()
@@ -585,6 +609,36 @@ class Actions:
 
     def _convert(self, action):
         return (self.keymaps_universal[action] | self.keymaps_contextual[action]) or { action }
+
+    def invalidate_keymaps(self):
+        '''
+        clears compiled keymap tables.  must be called if keymaps_universal or a contextual keymap is changed in place
+        (ActionHandler swaps contextual keymaps by object, which does not require invalidating)
+        '''
+        self._compiled_keymaps = {}
+
+    def _compiled(self, actions, flags):
+        '''
+        returns frozenset of event types (with mods stripped according to flags) that trigger any of actions,
+        using the current contextual keymap.  results are cached per contextual keymap, so after the first
+        call for a given actions and flags, matching an event is a set lookup
+        '''
+        keymap = self.keymaps_contextual
+        compiled = self._compiled_keymaps.get(id(keymap))
+        if not compiled or compiled[0] is not keymap:
+            # keep reference to keymap, so its id is not reused while cached
+            compiled = self._compiled_keymaps[id(keymap)] = (keymap, {})
+        match actions:
+            case str():          key = actions
+            case set() | list(): key = frozenset(actions)
+            case _:              key = actions
+        table = compiled[1]
+        event_types = table.get((key, flags))
+        if event_types is None:
+            event_types = table[(key, flags)] = frozenset(
+                action_strip_mods_flags(p, flags) for p in self.convert(actions)
+            )
+        return event_types
     def convert(self, actions):
         match actions:
             case set():  pass                     # already a set; no need to do anything
@@ -604,18 +658,12 @@ class Actions:
 
     def unuse(self, actions, ignoremods=False, ignorectrl=False, ignoreshift=False, ignorealt=False, ignoreoskey=False, ignoremulti=False, ignoreclick=False, ignoredouble=False, ignoredrag=False):
         if not actions: return
-        strip_mods = lambda p: action_strip_mods(
-            p,
-            ctrl         = ignorectrl   or ignoremods,
-            shift        = ignoreshift  or ignoremods,
-            alt          = ignorealt    or ignoremods,
-            oskey        = ignoreoskey  or ignoremods,
-            click        = ignoreclick  or ignoremulti,
-            double_click = ignoredouble or ignoremulti,
-            drag_click   = ignoredrag   or ignoremulti,
+        flags = strip_mods_flags(
+            ignoremods=ignoremods, ignorectrl=ignorectrl, ignoreshift=ignoreshift, ignorealt=ignorealt, ignoreoskey=ignoreoskey,
+            ignoremulti=ignoremulti, ignoreclick=ignoreclick, ignoredouble=ignoredouble, ignoredrag=ignoredrag,
         )
-        actions = [ strip_mods(p) for p in self.convert(actions) ]
-        keys = [k for k,v in self.now_pressed.items() if strip_mods(v) in actions]
+        event_types = self._compiled(actions, flags)
+        keys = [k for k,v in self.now_pressed.items() if action_strip_mods_flags(v, flags) in event_types]
         for k in keys: del self.now_pressed[k]
         self.mousedown = None
         self.mousedown_left = None
@@ -636,18 +684,12 @@ class Actions:
 
     def using(self, actions, using_all=False, ignoremods=False, ignorectrl=False, ignoreshift=False, ignorealt=False, ignoreoskey=False, ignoremulti=False, ignoreclick=False, ignoredouble=False, ignoredrag=False):
         if actions is None: return False
-        strip_mods = lambda p: action_strip_mods(
-            p,
-            ctrl         = ignorectrl   or ignoremods,
-            shift        = ignoreshift  or ignoremods,
-            alt          = ignorealt    or ignoremods,
-            oskey        = ignoreoskey  or ignoremods,
-            click        = ignoreclick  or ignoremulti,
-            double_click = ignoredouble or ignoremulti,
-            drag_click   = ignoredrag   or ignoremulti,
+        flags = strip_mods_flags(
+            ignoremods=ignoremods, ignorectrl=ignorectrl, ignoreshift=ignoreshift, ignorealt=ignorealt, ignoreoskey=ignoreoskey,
+            ignoremulti=ignoremulti, ignoreclick=ignoreclick, ignoredouble=ignoredouble, ignoredrag=ignoredrag,
         )
-        actions = [ strip_mods(p) for p in self.convert(actions) ]
-        results = [ strip_mods(p) in actions for p in self.now_pressed.values() ]
+        event_types = self._compiled(actions, flags)
+        results = [ action_strip_mods_flags(p, flags) in event_types for p in self.now_pressed.values() ]
         return all(results) if using_all else any(results)
 
     def using_onlymods(self, actions, exact=True):
@@ -672,20 +714,15 @@ class Actions:
     def pressed(self, actions, unpress=True, ignoremods=False, ignorectrl=False, ignoreshift=False, ignorealt=False, ignoreoskey=False, ignoremulti=False, ignoreclick=False, ignoredouble=False, ignoredrag=False, ignoremouse=False):
         if actions is None: return False
         if not self.just_pressed: return False
-        actions = self.convert(actions)
-        just_pressed = action_strip_mods(
-            self.just_pressed,
-            ctrl         = ignorectrl   or ignoremods,
-            shift        = ignoreshift  or ignoremods,
-            alt          = ignorealt    or ignoremods,
-            oskey        = ignoreoskey  or ignoremods,
-            click        = ignoreclick  or ignoremulti,
-            double_click = ignoredouble or ignoremulti,
-            drag_click   = ignoredrag   or ignoremulti,
-            mouse        = ignoremouse,
+        if ignoremouse and 'MOUSE' in self.just_pressed: return False
+        flags = strip_mods_flags(
+            ignoremods=ignoremods, ignorectrl=ignorectrl, ignoreshift=ignoreshift, ignorealt=ignorealt, ignoreoskey=ignoreoskey,
+            ignoremulti=ignoremulti, ignoreclick=ignoreclick, ignoredouble=ignoredouble, ignoredrag=ignoredrag,
         )
+        just_pressed = action_strip_mods_flags(self.just_pressed, flags)
         if not just_pressed: return False
-        ret = just_pressed in actions
+        # note: actions are not stripped of mods (only the pressed event is)
+        ret = just_pressed in self._compiled(actions, _strip_mods_none)
         if ret and unpress: self.unpress()
         return ret
 
@@ -28,6 +28,7 @@ import inspect
 import operator
 import itertools
 import importlib
+from collections import OrderedDict
 
 import bpy
 from mathutils import Vector, Matrix
@@ -495,6 +496,54 @@ class Dict():
     def values(self):   return self.__dict__['__d'].values()
     def __iter__(self): return iter(self.__dict__['__d'])
 
+class LRUCache:
+    '''
+    a size-bounded dictionary that evicts least recently used items, and keeps hit/miss stats
+    by default each item has size 1; pass sizeof to bound by something else (ex: bytes)
+    '''
+    def __init__(self, max_size=1024, *, sizeof=None):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        self._d = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+    def _sizeof(self, v): return self.sizeof(v) if self.sizeof else 1
+    def __len__(self): return len(self._d)
+    def __contains__(self, k): return k in self._d
+    def get(self, k, default=None):
+        if k not in self._d:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._d.move_to_end(k)
+        return self._d[k]
+    def __getitem__(self, k):
+        v = self._d[k]
+        self._d.move_to_end(k)
+        return v
+    def __setitem__(self, k, v):
+        if k in self._d: self.size -= self._sizeof(self._d[k])
+        self._d[k] = v
+        self.size += self._sizeof(v)
+        self._d.move_to_end(k)
+        # always keep most recent item, even if it alone is bigger than max_size
+        while self.size > self.max_size and len(self._d) > 1:
+            _, ov = self._d.popitem(last=False)
+            self.size -= self._sizeof(ov)
+            self.evictions += 1
+    def clear(self):
+        self._d.clear()
+        self.size = 0
+    def stats(self):
+        return {
+            'size': self.size, 'max size': self.max_size, 'count': len(self._d),
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+        }
+    def __str__(self):
+        total = self.hits + self.misses
+        rate = (100 * self.hits / total) if total else 0
+        return f'{self.size}/{self.max_size}, {rate:0.1f}% hits ({self.hits} hits, {self.misses} misses, {self.evictions} evictions)'
+
 def has_duplicates(lst):
     l = len(lst)
     if l == 0: return False
@@ -0,0 +1,51 @@
+import timeit
+
+from ..common.utils import Dict
+from ..common.useractions import Actions, action_strip_mods
+
+# measures cost of matching a pressed event against actions, as tools and FSM states do many times per modal event
+# run from within Blender (useractions requires bpy)
+
+keymap = Dict({
+    'action':  {'LEFTMOUSE+CLICK', 'SHIFT+LEFTMOUSE+CLICK'},
+    'select':  {'RIGHTMOUSE+CLICK', 'SHIFT+RIGHTMOUSE+CLICK', 'CTRL+RIGHTMOUSE+CLICK'},
+    'cancel':  {'ESC', 'RIGHTMOUSE+CLICK'},
+    'confirm': {'RET', 'NUMPAD_ENTER', 'LEFTMOUSE+CLICK'},
+    'grab':    {'G'},
+    'rotate':  {'R'},
+    'scale':   {'S'},
+}, get_default_fn=set)
+queries = ['action', 'select', 'cancel', 'confirm', {'grab', 'rotate', 'scale'}, 'insert', 'delete']
+
+# create instance without a Blender context
+actions = Actions.__new__(Actions)
+actions.keymaps_universal  = Dict(get_default_fn=set)
+actions.keymaps_contextual = keymap
+actions.invalidate_keymaps()
+actions.reset_state(all_state=False)
+actions.just_pressed = 'SHIFT+RIGHTMOUSE+CLICK'
+actions.now_pressed  = {'RIGHTMOUSE': 'SHIFT+RIGHTMOUSE', 'G': 'G'}
+
+def uncompiled():
+    # matching as done before keymaps were compiled
+    for q in queries:
+        just_pressed = action_strip_mods(actions.just_pressed, ctrl=False, shift=False, alt=False, oskey=False, click=False, double_click=False, drag_click=False)
+        just_pressed in actions.convert(q)
+        qs = [ action_strip_mods(p, click=False, double_click=False, drag_click=False) for p in actions.convert(q) ]
+        any(action_strip_mods(p, click=False, double_click=False, drag_click=False) in qs for p in actions.now_pressed.values())
+
+def compiled():
+    for q in queries:
+        actions.pressed(q, unpress=False)
+        actions.using(q, ignoremods=True)
+
+kwargs = {
+    'number': 10000,
+    'globals': globals(),
+}
+
+timings = []
+timings += [timeit.timeit('uncompiled()', **kwargs)]
+timings += [timeit.timeit('compiled()',   **kwargs)]
+
+print(timings)
@@ -0,0 +1,219 @@
+import math
+import random
+import timeit
+
+from mathutils import Vector, Matrix
+
+from ..common.maths import Point
+from ..common.utils import iter_running_sum
+from ..common.bezier import fit_cubicbezier_spline
+
+# compares numpy fit_cubicbezier_spline against the previous per-point loop implementation (copied below)
+# strokes are synthetic (noisy spirals), similar to dense hand-drawn strokes
+# run from within Blender (bezier requires mathutils)
+
+def compute_cubic_weights_loop(t):
+    t0, t1 = t, (1-t)
+    return (t1**3, 3*t0*t1**2, 3*t0**2*t1, t0**3)
+
+
+def interpolate_cubic_loop(v0, v1, v2, v3, t):
+    b0, b1, b2, b3 = compute_cubic_weights_loop(t)
+    return v0*b0 + v1*b1 + v2*b2 + v3*b3
+
+
+def compute_cubic_error_loop(v0, v1, v2, v3, l_v, l_t):
+    return math.sqrt(sum(
+        (interpolate_cubic_loop(v0, v1, v2, v3, t) - v)**2
+        for v, t in zip(l_v, l_t)
+    ))
+
+
+def fit_cubicbezier_loop(l_v, l_t):
+    #########################################################
+    # http://nbviewer.ipython.org/gist/anonymous/5688579
+
+    # make the summation functions for A (16 of them)
+    A_fns = [
+        lambda l_t: sum([2*t**0*(t-1)**6 for t in l_t]),
+        lambda l_t: sum([-6*t**1*(t-1)**5 for t in l_t]),
+        lambda l_t: sum([6*t**2*(t-1)**4 for t in l_t]),
+        lambda l_t: sum([-2*t**3*(t-1)**3 for t in l_t]),
+
+        lambda l_t: sum([-6*t**1*(t-1)**5 for t in l_t]),
+        lambda l_t: sum([18*t**2*(t-1)**4 for t in l_t]),
+        lambda l_t: sum([-18*t**3*(t-1)**3 for t in l_t]),
+        lambda l_t: sum([6*t**4*(t-1)**2 for t in l_t]),
+
+        lambda l_t: sum([6*t**2*(t-1)**4 for t in l_t]),
+        lambda l_t: sum([-18*t**3*(t-1)**3 for t in l_t]),
+        lambda l_t: sum([18*t**4*(t-1)**2 for t in l_t]),
+        lambda l_t: sum([-6*t**5*(t-1)**1 for t in l_t]),
+
+        lambda l_t: sum([-2*t**3*(t-1)**3 for t in l_t]),
+        lambda l_t: sum([6*t**4*(t-1)**2 for t in l_t]),
+        lambda l_t: sum([-6*t**5*(t-1)**1 for t in l_t]),
+        lambda l_t: sum([2*t**6*(t-1)**0 for t in l_t])
+    ]
+
+    # make the summation functions for b (4 of them)
+    b_fns = [
+        lambda l_t, l_v: sum(v * (-2 * (t**0) * ((t-1)**3))
+                             for t, v in zip(l_t, l_v)),
+        lambda l_t, l_v: sum(v * (6 * (t**1) * ((t-1)**2))
+                             for t, v in zip(l_t, l_v)),
+        lambda l_t, l_v: sum(v * (-6 * (t**2) * ((t-1)**1))
+                             for t, v in zip(l_t, l_v)),
+        lambda l_t, l_v: sum(v * (2 * (t**3) * ((t-1)**0))
+                             for t, v in zip(l_t, l_v)),
+    ]
+
+    # compute the data we will put into matrix A
+    A_values = [fn(l_t) for fn in A_fns]
+    # fill the A matrix with data
+    A_matrix = Matrix(tuple(zip(*[iter(A_values)]*4)))
+    try:
+        A_inv = A_matrix.inverted()
+    except:
+        return (float('inf'), l_v[0], l_v[0], l_v[0], l_v[0])
+
+    # compute the data we will put into the b vector
+    b_values = [fn(l_t, l_v) for fn in b_fns]
+    # fill the b vector with data
+    b_vector = Vector(b_values)
+
+    # solve for the unknowns in vector x
+    v0, v1, v2, v3 = A_inv @ b_vector
+
+    err = compute_cubic_error_loop(v0, v1, v2, v3, l_v, l_t) #/ len(l_v)
+
+    return (err, v0, v1, v2, v3)
+
+
+def fit_cubicbezier_spline_loop(
+    l_co, error_scale, depth=0,
+    t0=0, t3=-1, allow_split=True, force_split=False,
+    min_count_split=15, max_depth_split=4,
+):
+    '''
+    fits cubic bezier to given points
+    returns list of tuples of (t0,t3,p0,p1,p2,p3)
+    that best fits the given points l_co
+    where t0 and t3 are the passed-in t0 and t3
+    and p0,p1,p2,p3 are the control points of bezier
+    '''
+    count = len(l_co)
+    if t3 == -1:
+        t3 = count-1
+    assert count > 2, "Need at least 2 points to fit cubic bezier"
+    if count == 2:
+        # special case: line
+        p0, p3 = l_co[0], l_co[-1]
+        diff = p3 - p0
+        return [(t0, t3, p0, p0+diff*0.33, p0+diff*0.66, p3)]
+    if count == 3:
+        new_co = [
+            l_co[0],
+            Point.average(l_co[:2]),
+            l_co[1],
+            Point.average(l_co[1:]),
+            l_co[2]
+        ]
+        return fit_cubicbezier_spline_loop(
+            new_co, error_scale,
+            depth=depth,
+            t0=t0, t3=t3,
+            allow_split=allow_split, force_split=force_split
+        )
+    l_d = [0] + [(v0-v1).length for v0, v1 in zip(l_co[:-1], l_co[1:])]
+    l_ad = [s for d, s in iter_running_sum(l_d)]
+    dist = sum(l_d)
+    if dist <= 0:
+        # print(spc + 'fit_cubicbezier_spline: returning []')
+        return []  # [(t0,t3,l_co[0],l_co[0],l_co[0],l_co[0])]
+    l_t = [ad/dist for ad in l_ad]
+
+    ex, x0, x1, x2, x3 = fit_cubicbezier_loop([co[0] for co in l_co], l_t)
+    ey, y0, y1, y2, y3 = fit_cubicbezier_loop([co[1] for co in l_co], l_t)
+    ez, z0, z1, z2, z3 = fit_cubicbezier_loop([co[2] for co in l_co], l_t)
+    tot_error = ex+ey+ez
+    #print(f'error={tot_error}  max={error_scale}  force={force_split}  allow={allow_split}') #, l=4)
+
+    if not force_split:
+        do_not_split = tot_error < error_scale
+        do_not_split |= depth == max_depth_split
+        do_not_split |= len(l_co) <= min_count_split
+        do_not_split |= not allow_split
+        if do_not_split:
+            p0, p1 = Point((x0, y0, z0)), Point((x1, y1, z1))
+            p2, p3 = Point((x2, y2, z2)), Point((x3, y3, z3))
+            return [(t0, t3, p0, p1, p2, p3)]
+
+    # too much error in fit.  split sequence in two, and fit each sub-sequence
+
+    # find a good split point
+    ind_split = -1
+    mindot = 1.0
+    for ind in range(5, len(l_co)-5):
+        if l_t[ind] < 0.4:
+            continue
+        if l_t[ind] > 0.6:
+            break
+        # if l_ad[ind] < 0.1: continue
+        # if l_ad[ind] > dist-0.1: break
+
+        v0 = l_co[ind-4]
+        v1 = l_co[ind+0]
+        v2 = l_co[ind+4]
+        d0 = (v1-v0).normalized()
+        d1 = (v2-v1).normalized()
+        dot01 = d0.dot(d1)
+        if ind_split == -1 or dot01 < mindot:
+            ind_split = ind
+            mindot = dot01
+
+    if ind_split == -1:
+        # did not find a good splitting point!
+        p0, p1, p2, p3 = Point((x0, y0, z0)), Point(
+            (x1, y1, z1)), Point((x2, y2, z2)), Point((x3, y3, z3))
+        #p0,p3 = Point(l_co[0]),Point(l_co[-1])
+        return [(t0, t3, p0, p1, p2, p3)]
+
+    #print(spc + 'splitting at %d' % ind_split)
+
+    l_co0, l_co1 = l_co[:ind_split+1], l_co[ind_split:]   # share split point
+    tsplit = ind_split  # / (len(l_co)-1)
+    bezier0 = fit_cubicbezier_spline_loop(
+        l_co0, error_scale, depth=depth+1, t0=t0, t3=tsplit)
+    bezier1 = fit_cubicbezier_spline_loop(
+        l_co1, error_scale, depth=depth+1, t0=tsplit, t3=t3)
+    return bezier0 + bezier1
+
+
+def stroke(npts):
+    pts = []
+    for i in range(npts):
+        a = 4 * math.pi * i / (npts - 1)
+        r = 1 + a / 5
+        pts.append(Point((
+            math.cos(a) * r + random.gauss(0, 0.01),
+            math.sin(a) * r + random.gauss(0, 0.01),
+            a / 10,
+        )))
+    return pts
+
+kwargs = {
+    'number': 10,
+    'globals': globals(),
+}
+
+timings = []
+for npts in [100, 1_000, 5_000]:
+    pts = stroke(npts)
+    timings += [(
+        npts,
+        timeit.timeit('fit_cubicbezier_spline_loop(pts, 0.01)', **kwargs),
+        timeit.timeit('fit_cubicbezier_spline(pts, 0.01)',      **kwargs),
+    )]
+
+print(timings)
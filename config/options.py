@@ -79,12 +79,13 @@ retopoflow_urls = {
 retopoflow_files = {
     'options filename':     'RetopoFlow_options.json',
     'screenshot filename':  'RetopoFlow_screenshot.png',
-    'instrument filename':  'RetopoFlow_instrument.txt',
+    'instrument filename':  'RetopoFlow_instrument.rfsn',
     'log filename':         'RetopoFlow_log.txt',
     # 'debug filename':       'RetopoFlow_debug.txt',     # hard-coded in __init__.py
     'backup filename':      'RetopoFlow_backup.blend',    # if working on unsaved blend file
     'profiler filename':    'RetopoFlow_profiler.txt',
     'keymaps filename':     'RetopoFlow_keymaps.json',
+    'image cache filename': 'RetopoFlow_images.cache',    # decoded help and icon images
 }
 
 # objects / blender data created by retopoflow
@@ -196,11 +197,15 @@ class Options:
         'show experimental':    False,  # should show experimental tools?
 
         'preload help images':  False,
+        'cache help images':    True,   # keep decoded help and icon images in a file, so they are not decoded each session
         'async mesh loading':   True,   # True: load source meshes asynchronously
         'async image loading':  True,
 
         # AUTO SAVE
         'last auto save path':  '',     # file path of last auto save (used for recover)
+        'last auto save journal path': '',  # file path of last auto save journal (used for recover)
+        'auto save journal':    True,   # True: in between .blend auto saves, write latest target snapshot to journal (replacing previous)
+        'auto save journal interval': 30.0,  # seconds between journal snapshots (only when changes were made)
 
         # STARTUP
         'check auto save':      True,       # give warning about disabled auto save at start
@@ -225,6 +230,7 @@ class Options:
         # DEBUG, PROFILE, INSTRUMENT SETTINGS
         'profiler':             False,  # enable profiler?
         'instrument':           False,  # enable instrumentation?
+        'instrument snapshot interval': 10.0,   # seconds between full target snapshots in instrumentation file
         'debug level':          0,      # debug level, 0--5 (for printing to console). 0=no print; 5=print all
         'debug actions':        False,  # print actions (except MOUSEMOVE) to console
 
@@ -247,6 +253,7 @@ class Options:
         'accel recompute delay':    0.125,      # seconds to wait to prevent recomputing accel structs too quickly after navigation
         'view change delay':        0.250,      # seconds to wait before calling view change callbacks (> accel recompute delay)
         'target change delay':      0.010,      # seconds to wait before calling target change callbacks
+        'target write delay':       0.500,      # seconds to wait between writing edited target back to Blender mesh (always written on save and exit)
 
         'move rotate object if no selection': True,
 
@@ -633,6 +640,10 @@ class Options:
         base, ext = os.path.splitext(filename)
         return os.path.join(path, f'{base}{suffix}{ext}')
 
+    def get_auto_save_journal_filepath(self):
+        base, _ = os.path.splitext(self.get_auto_save_filepath())
+        return f'{base}.rfjournal'
+
 
 class Themes:
     # fallback color for when specified key is not found
@@ -101,13 +101,17 @@ if import_succeeded:
     # point BlenderIcon to correct icon path
     BlenderIcon.path_icons = get_path_from_addon_root('icons')
 
-    if options['preload help images']:
-        # start preloading images
-        ImagePreloader.start([
-            ('help'),
-            ('icons'),
-            ('addon_common', 'common', 'images'),
-        ])
+    if options['preload help images'] or options['cache help images']:
+        # start preloading images (only decodes images that are not already in image cache)
+        ImagePreloader.start(
+            [
+                ('help',),
+                ('help', 'images'),
+                ('icons',),
+                ('addon_common', 'common', 'images'),
+            ],
+            cache_path=(options.get_path('image cache filename') if options['cache help images'] else None),
+        )
 
 
 ##################################################################################
@@ -164,6 +164,8 @@ class RetopoFlow(
         options.clear_callbacks()
         self.blender_ui_reset()
         self.undo_clear()
+        self.done_journal()
+        self.instrument_done()
         self.done_target()
         self.done_sources()
         FontManager.unload_fontids()
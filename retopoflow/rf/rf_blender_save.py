@@ -21,6 +21,7 @@ Created by Jonathan Denning, Jonathan Williamson
 
 import os
 import bpy
+import bmesh
 import json
 import time
 from datetime import datetime
@@ -38,6 +39,7 @@ from ...addon_common.common.decorators import blender_version_wrapper
 from ...addon_common.common.blender import (
     set_object_selection,
     set_active_object,
+    link_object,
     toggle_screen_header,
     toggle_screen_toolbar,
     toggle_screen_properties,
@@ -45,18 +47,20 @@ from ...addon_common.common.blender import (
     show_error_message,
     BlenderSettings,
     get_view3d_space,
+    ModifierWrapper_Mirror,
 )
 from ...addon_common.common.blender_preferences import get_preferences
 from ...addon_common.common.maths import BBox
 from ...addon_common.common.debug import dprint
 
 from .rf_blender_objects import RetopoFlow_Blender_Objects
+from ..rfmesh.rfmesh_snapshot import (
+    SnapshotWriter, read_last_snapshot, read_journal_header, pack_journal_header,
+    FLAG_SELECT, FLAG_HIDE,
+)
 
 
-@persistent
-def revert_auto_save_after_load(*_, **__):
-    # remove recover handler
-    bpy.app.handlers.load_post.remove(revert_auto_save_after_load)
+def _view3d_override():
     window = bpy.context.window
     screen = window.screen
     area = next((a for a in screen.areas if a.type == 'VIEW_3D'), None)
@@ -65,9 +69,22 @@ def revert_auto_save_after_load(*_, **__):
     assert space_data
     region = next((r for r in area.regions if r.type == 'WINDOW'), None)
     assert region
-    with bpy.context.temp_override(window=window, screen=screen, area=area, space_data=space_data, region=region):
+    return bpy.context.temp_override(window=window, screen=screen, area=area, space_data=space_data, region=region)
+
+@persistent
+def revert_auto_save_after_load(*_, **__):
+    # remove recover handler
+    bpy.app.handlers.load_post.remove(revert_auto_save_after_load)
+    with _view3d_override():
         RetopoFlow_Blender_Save.recovery_revert()
 
+@persistent
+def replay_journal_after_load(*_, **__):
+    # remove recover handler
+    bpy.app.handlers.load_post.remove(replay_journal_after_load)
+    with _view3d_override():
+        RetopoFlow_Blender_Save.recover_auto_save_journal(options['last auto save journal path'])
+
 
 class RetopoFlow_Blender_Save:
     '''
@@ -222,57 +239,169 @@ class RetopoFlow_Blender_Save:
     def handle_auto_save(self):
         prefs = get_preferences(self.actions.context)
         use_auto_save = prefs.filepaths.use_auto_save_temporary_files
+        use_journal = options['auto save journal']
         auto_save_time = prefs.filepaths.auto_save_time * 60
+        journal_time = options['auto save journal interval']
 
         if not use_auto_save: return    # Blender's auto save is disabled  :(
 
         if not hasattr(self, 'time_to_save'):
             # RF just started, so do not save yet
             self.last_change_count = None
+            self.last_journal_change_count = None
             # record the next time to save
             self.time_to_save = time.time() + auto_save_time
-        elif time.time() > self.time_to_save:
-            # it is time to save, but only if current tool is in main and changes were made!
-            if self.rftool._fsm_in_main():
-                if self.save_backup():
-                    # save was successful!
-                    # record the next time to save
-                    self.time_to_save = time.time() + auto_save_time
-                else:
-                    # save was unsuccessful :(
-                    # try again in 10secs
-                    self.time_to_save = time.time() + 10
+            self.time_to_journal = time.time() + journal_time
+            return
+
+        # only save if current tool is in main and changes were made!
+        if not self.rftool._fsm_in_main(): return
+
+        # journal is cheap, so it is saved often in between .blend backups.
+        # .blend backups are still saved, because journal holds only geometry, selection, and hidden state
+        if use_journal and time.time() > self.time_to_journal:
+            # if unsuccessful, try again in 10secs
+            self.time_to_journal = time.time() + (journal_time if self.save_journal() else 10)
+        if time.time() > self.time_to_save:
+            # if unsuccessful, try again in 10secs
+            self.time_to_save = time.time() + (auto_save_time if self.save_backup() else 10)
+
+    @staticmethod
+    def _get_auto_save_paths():
+        # returns existing auto save paths (.blend and journal), most recent first
+        paths = [options['last auto save journal path'], options['last auto save path']]
+        paths = [path for path in paths if path and os.path.exists(path)]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
 
     @staticmethod
     def has_auto_save():
-        filepath = options['last auto save path']
-        return filepath and os.path.exists(filepath)
+        return bool(RetopoFlow_Blender_Save._get_auto_save_paths())
 
     @staticmethod
     def get_auto_save_filename():
-        return options['last auto save path']
+        paths = RetopoFlow_Blender_Save._get_auto_save_paths()
+        return paths[0] if paths else options['last auto save path']
 
     @staticmethod
     def recover_auto_save():
-        filepath = options['last auto save path']
+        paths = RetopoFlow_Blender_Save._get_auto_save_paths()
+        filepath = paths[0] if paths else None
         print(f'backup recover: {filepath}')
-        if not filepath or not os.path.exists(filepath):
+        if not filepath:
             print(f'  DOES NOT EXIST!')
             return
+        if filepath == options['last auto save journal path']:
+            header = read_journal_header(filepath)
+            if header and header.blend_filepath and os.path.exists(header.blend_filepath):
+                if not RetopoFlow_Blender_Save._is_current_blend(header.blend_filepath):
+                    # journal was recorded while working on another file, so open that file before replaying
+                    print(f'  opening {header.blend_filepath} before replaying journal')
+                    bpy.app.handlers.load_post.append(replay_journal_after_load)
+                    bpy.ops.wm.open_mainfile(filepath=header.blend_filepath)
+                    return
+            if RetopoFlow_Blender_Save.recover_auto_save_journal(filepath): return
+            # could not replay journal, so fall back to opening last auto saved .blend (if any)
+            filepath = options['last auto save path']
+            if not filepath or not os.path.exists(filepath):
+                print(f'  could not recover from journal, and no auto saved .blend exists')
+                return
         bpy.app.handlers.load_post.append(revert_auto_save_after_load)
         bpy.ops.wm.open_mainfile(filepath=filepath)
 
+    @staticmethod
+    def _is_current_blend(filepath):
+        if not bpy.data.filepath: return False
+        return os.path.normcase(os.path.abspath(bpy.data.filepath)) == os.path.normcase(os.path.abspath(filepath))
+
+    @staticmethod
+    def recover_auto_save_journal(filepath):
+        '''
+        replays last snapshot in journal onto target object, if current file is the file the journal was recorded in
+        (see recover_auto_save, which opens the recorded file first when it still exists).
+        the target keeps its object and mesh datablocks (materials, modifiers, vertex group names, etc.), but only
+        geometry, selection, and hidden state are recovered; per-element data (UVs, weights, etc.) is reset.
+        if the journal cannot be verified to belong to current file, snapshot is replayed into a new object instead,
+        so that no unrelated object is overwritten.
+        '''
+        header = read_journal_header(filepath)
+        if not header:
+            print(f'  journal has no header')
+            return False
+        snapshot = read_last_snapshot(filepath)
+        if not snapshot:
+            print(f'  journal contains no complete snapshots')
+            return False
+        print(f'  replaying "{snapshot.action}" snapshot of {header.name} ({len(snapshot.verts)} verts, {len(snapshot.faces)} faces)')
+
+        if bpy.context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        obj = None
+        if RetopoFlow_Blender_Save._is_current_blend(header.blend_filepath):
+            obj = bpy.data.objects.get(header.name)
+            if obj and obj.type != 'MESH':
+                print(f'  object {header.name} is not a mesh')
+                obj = None
+        else:
+            print(f'  journal was recorded in {header.blend_filepath or "an unsaved file"}, not current file')
+
+        bm = bmesh.new()
+        if obj:
+            # keep mesh layers (UV maps, etc.) of target, but replace its geometry
+            bm.from_mesh(obj.data)
+            bmesh.ops.delete(bm, geom=list(bm.verts), context='VERTS')
+        else:
+            name = f'{header.name} (recovered)'
+            obj = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+            link_object(obj)
+            obj.matrix_world = Matrix(header.matrix)
+
+        bmvs = [bm.verts.new(co) for co in snapshot.verts]
+        for bmv, flags in zip(bmvs, snapshot.vert_flags):
+            bmv.select, bmv.hide = bool(flags & FLAG_SELECT), bool(flags & FLAG_HIDE)
+        for (i0, i1), flags in zip(snapshot.edges, snapshot.edge_flags):
+            bme = bm.edges.get((bmvs[i0], bmvs[i1])) or bm.edges.new((bmvs[i0], bmvs[i1]))
+            bme.select, bme.hide = bool(flags & FLAG_SELECT), bool(flags & FLAG_HIDE)
+        for face, flags in zip(snapshot.faces, snapshot.face_flags):
+            try:
+                bmf = bm.faces.new([bmvs[i] for i in face])
+            except ValueError:
+                # face already exists (should not happen)
+                continue
+            bmf.select, bmf.hide = bool(flags & FLAG_SELECT), bool(flags & FLAG_HIDE)
+        bm.to_mesh(obj.data)
+        bm.free()
+        obj.data.update()
+
+        mirror_mod = ModifierWrapper_Mirror.get_from_object(obj)
+        if any(snapshot.symmetry) and not mirror_mod:
+            mirror_mod = ModifierWrapper_Mirror.create_new(obj)
+        if mirror_mod:
+            mirror_mod.x, mirror_mod.y, mirror_mod.z = snapshot.symmetry
+
+        # clean up any RetopoFlow session leftovers, then make target active
+        RetopoFlow_Blender_Save.recovery_revert()
+        set_object_selection(obj, True)
+        set_active_object(obj)
+        return True
+
     @staticmethod
     def delete_auto_save():
-        filepath = options['last auto save path']
-        print(f'backup delete: {filepath}')
-        if not filepath or not os.path.exists(filepath):
-            print(f'  DOES NOT EXIST!')
-            return
-        os.remove(filepath)
+        for key in ['last auto save path', 'last auto save journal path']:
+            filepath = options[key]
+            print(f'backup delete: {filepath}')
+            if not filepath or not os.path.exists(filepath):
+                print(f'  DOES NOT EXIST!')
+                continue
+            os.remove(filepath)
 
     def save_emergency(self):
         try:
+            if getattr(self, '_journal', None):
+                # journal is cheap, so get latest snapshot written out before attempting full save
+                self._journal.write(self.rftarget.to_snapshot(action='emergency'))
+                self.done_journal()
+            self.write_target()
             filepath = options.get_auto_save_filepath(suffix='EMERGENCY', emergency=True)
             bpy.ops.wm.save_as_mainfile(
                 filepath=filepath,
@@ -290,6 +419,44 @@ class RetopoFlow_Blender_Save:
                 title='RetopoFlow Error',
             )
 
+    def save_journal(self):
+        '''
+        writes compact snapshot of target to journal file, replacing previous snapshot.
+        snapshot is packed on main thread, but writing to disk is handled by background thread.
+        '''
+        if hasattr(self, '_journal_broken'): return True     # .blend backups are still saved (see handle_auto_save)
+        if self.last_journal_change_count == self.change_count:
+            print(f'RetopoFlow: skipping journal save (no changes detected)')
+            return True
+
+        if not getattr(self, '_journal', None):
+            filepath = options.get_auto_save_journal_filepath()
+            print(f'RetopoFlow: starting auto save journal {filepath}')
+            try:
+                # keep previous journal around, just like the .blend backups
+                if os.path.exists(filepath): os.replace(filepath, f'{filepath}1')
+                # world matrix of target without RetopoFlow's normalization scaling (see rf_normalize)
+                factor = sessionoptions['normalize']['mesh scaling factor']
+                matrix = Matrix.Scale(1.0 / factor, 4) @ self.rftarget.obj.matrix_world
+                header = pack_journal_header(bpy.data.filepath, self.rftarget.obj.name, matrix)
+                # each snapshot replaces previous one, so journal does not grow during long sessions
+                self._journal = SnapshotWriter(filepath, header=header, compact=True)
+            except Exception as e:
+                print(f'  caught exception: {e}')
+                print(f'  relying on .blend backups only')
+                self._journal_broken = True
+                return True
+            options['last auto save journal path'] = filepath
+
+        self._journal.write(self.rftarget.to_snapshot(action=self.get_last_action()))
+        self.last_journal_change_count = self.change_count
+        return True
+
+    def done_journal(self):
+        if not getattr(self, '_journal', None): return
+        self._journal.close()
+        self._journal = None
+
     def save_backup(self):
         if hasattr(self, '_backup_broken'): return
         if self.last_change_count == self.change_count:
@@ -323,6 +490,7 @@ class RetopoFlow_Blender_Save:
         if 'rename prev' not in errors:
             try:
                 print(f'  saving...')
+                self.write_target()
                 bpy.ops.wm.save_as_mainfile(
                     filepath=filepath,
                     compress=True,          # write compressed file
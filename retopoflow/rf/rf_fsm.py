@@ -46,6 +46,8 @@ class RetopoFlow_FSM(CookieCutter): # CookieCutter must be here in order to over
     def setup_states(self):
         self.view_version = None
         self._last_rfwidget = None
+        self._ui_geometry_pending = False
+        self._ui_geometry_draw_count = None
         self.fast_update_timer = self.actions.start_timer(120.0, enabled=False)
 
     def update(self, timer=True):
@@ -85,8 +87,16 @@ class RetopoFlow_FSM(CookieCutter): # CookieCutter must be here in order to over
         if self.rftarget_version != rftarget_version:
             self.rftarget_version = rftarget_version
             self.update_rot_object()
-            self.callback_target_change()
-            tag_redraw_all('RF_FSM target change')
+            rftarget_geometry_version = self.rftarget.get_version(selection=False)
+            geometry_changed = self.rftarget_geometry_version != rftarget_geometry_version
+            self.rftarget_geometry_version = rftarget_geometry_version
+            self.callback_target_change(geometry=geometry_changed)
+        if self._ui_geometry_pending:
+            # coalesce ui updates: at most once per frame, and always right before drawing
+            if not timer or self._ui_geometry_draw_count != self._draw_count:
+                self._ui_geometry_pending = False
+                self._ui_geometry_draw_count = self._draw_count
+                self.update_ui_geometry()
 
         view_version = self.get_view_version()
         if self.view_version != view_version:
@@ -96,18 +106,36 @@ class RetopoFlow_FSM(CookieCutter): # CookieCutter must be here in order to over
             self.callback_view_change()
             tag_redraw_all('RF_FSM view change')
 
+        # write deferred target changes back to Blender mesh (rate-limited)
+        self.rftarget.clean()
+        normals_updated = self.rftarget.take_normals_updated()
+
         self.actions.hit_pos,self.actions.hit_norm,_,_ = self.raycast_sources_mouse()
         fpsdiv = self.document.body.getElementById('fpsdiv')
-        if fpsdiv: fpsdiv.innerText = f'UI FPS: {self.document._draw_fps:.2f}'
+        if fpsdiv and fpsdiv.innerText != (fps := f'UI FPS: {self.document._draw_fps:.2f}'):
+            fpsdiv.innerText = fps
+            # update cache stats at same (slow) rate as FPS, otherwise debug ui would relayout every frame
+            cachediv = self.document.body.getElementById('textsizecachediv')
+            if cachediv: cachediv.innerText = f'Text Size Cache: {Globals.drawing.size_cache}'
+            layoutdiv = self.document.body.getElementById('layoutcountdiv')
+            if layoutdiv: layoutdiv.innerText = f'UI Elements Laid Out: {self.document.layout_count}'
+            uidrawdiv = self.document.body.getElementById('uidrawdiv')
+            if uidrawdiv: uidrawdiv.innerText = f'UI Batched Drawing: {Globals.ui_draw.get_batched_stats_str()}'
+            normalsdiv = self.document.body.getElementById('normalscountdiv')
+            if normalsdiv: normalsdiv.innerText = f'Face Normals Updated: {normals_updated}'
 
     # @CallGovernor.limit(fn_delay=lambda:options['target change delay'])
-    def callback_target_change(self):
+    def callback_target_change(self, *, geometry=True):
         # throttling this fn will cause target_change and draw callbacks to get out-of-sync
         # ex: contours depends on data collected in target change callback!
+        # so tool callbacks are always dispatched before next event is handled; only ui work is coalesced (see update)
         self.rftool._callback('target change')
+        if geometry:
+            self.rftool._callback('target geometry change')
         if self.rftool.rfwidget:
             self.rftool.rfwidget._callback_widget('target change')
-        self.update_ui_geometry()
+        if geometry:
+            self._ui_geometry_pending = True
         tag_redraw_all('RF_FSM target change')
 
     @CallGovernor.limit(fn_delay=lambda:options['view change delay'])
@@ -19,43 +19,45 @@ Created by Jonathan Denning, Jonathan Williamson, and Patrick Moore
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
-import bpy
-import json
-from queue import Queue
-
+import time
 
 from ...config.options import options
+from ..rfmesh.rfmesh_snapshot import SnapshotWriter, pack_action
+
+
+'''
+Instrumentation records every undo-pushed action to a binary file on disk (see rfmesh_snapshot for format).
+Each action writes a small action record (name, time, geometry counts), and a full snapshot of the target
+is written at most once every `options['instrument snapshot interval']` seconds.
+Records are written by a background thread through a bounded queue; records are dropped rather than blocking
+when the queue is full.
+
+Reading:
+    from retopoflow.rfmesh.rfmesh_snapshot import iter_records
+    for record in iter_records(path_to_instrument_file): ...
+'''
 
 class RetopoFlow_Instrumentation:
-    instrument_queue = Queue()
-    instrument_thread = None
+    instrument_writer = None
+    instrument_snapshot_time = 0
 
     def instrument_write(self, action):
         if not options['instrument']: return
 
-        tb_name = options.get_path('instrument_filename')
-        if tb_name not in bpy.data.texts: bpy.data.texts.new(tb_name)
-        tb = bpy.data.texts[tb_name]
-
-        target_json = self.rftarget.to_json()
-        data = {'action': action, 'target': target_json}
-        data_str = json.dumps(data, separators=[',',':'], indent=0)
-        self.instrument_queue.put(data_str)
-
-        # write data to end of textblock asynchronously
-        # TODO: try writing to file (text/binary), because writing to textblock is _very_ slow! :(
-        def write_out():
-            while True:
-                if self.instrument_queue.empty():
-                    time.sleep(0.1)
-                    continue
-                data_str = self.instrument_queue.get()
-                data_str = data_str.splitlines()
-                tb.write('')        # position cursor to end
-                for line in data_str:
-                    tb.write(line)
-                tb.write('\n')
-        if not self.instrument_thread:
-            # executor only needed to start the following instrument_thread
-            executor = ThreadPoolExecutor()
-            self.instrument_thread = executor.submit(write_out)
+        if not self.instrument_writer:
+            path = options.get_path('instrument filename')
+            RetopoFlow_Instrumentation.instrument_writer = SnapshotWriter(path, truncate=False, drop_when_full=True)
+
+        now = time.time()
+        self.instrument_writer.write(pack_action(action, self.rftarget.get_geometry_counts(), timestamp=now))
+        if now - self.instrument_snapshot_time >= options['instrument snapshot interval']:
+            self.instrument_writer.write(self.rftarget.to_snapshot(action=action))
+            RetopoFlow_Instrumentation.instrument_snapshot_time = now
+
+    def instrument_done(self):
+        writer = RetopoFlow_Instrumentation.instrument_writer
+        if not writer: return
+        writer.close()
+        if writer.dropped: print(f'RetopoFlow: instrumentation dropped {writer.dropped} records')
+        RetopoFlow_Instrumentation.instrument_writer = None
+        RetopoFlow_Instrumentation.instrument_snapshot_time = 0
@@ -241,6 +241,7 @@ class RetopoFlow_Normalize:
 
     @staticmethod
     def _compute_unit_scaling_factor():
+        # note: only the 8 bound_box corners are used, so sources are not traversed (or evaluated) here
         def get_source_bbox(s):
             verts = [s.matrix_world @ Vector((v[0], v[1], v[2], 1)) for v in s.bound_box]
             verts = [(v[0] / v[3], v[1] / v[3], v[2] / v[3]) for v in verts]
@@ -68,9 +68,16 @@ class RetopoFlow_Sources:
     def setup_sources_symmetry(self):
         xyplane,xzplane,yzplane = self.rftarget.get_xy_plane(),self.rftarget.get_xz_plane(),self.rftarget.get_yz_plane()
         w2l_point = self.rftarget.w2l_point
-        rfsources_xyplanes = [e for rfs in self.rfsources for e in rfs.plane_intersection(xyplane)]
-        rfsources_xzplanes = [e for rfs in self.rfsources for e in rfs.plane_intersection(xzplane)]
-        rfsources_yzplanes = [e for rfs in self.rfsources for e in rfs.plane_intersection(yzplane)]
+
+        def plane_intersections(plane):
+            # sources with bounds entirely on one side of plane cannot intersect it, so skip walking their edges
+            def crosses(rfs):
+                sides = { plane.side(corner) for corner in rfs.get_bbox().corners }
+                return 0 in sides or len(sides) > 1
+            return [e for rfs in self.rfsources if crosses(rfs) for e in rfs.plane_intersection(plane)]
+        rfsources_xyplanes = plane_intersections(xyplane)
+        rfsources_xzplanes = plane_intersections(xzplane)
+        rfsources_yzplanes = plane_intersections(yzplane)
 
         def gen_accel(edges, Point_to_Point2D):
             nonlocal w2l_point
@@ -130,6 +137,33 @@ class RetopoFlow_Sources:
         if xy is None: return None,None,None,None
         return self.raycast_sources_Ray(self.Point2D_to_Ray(xy, min_dist=self.drawing.space.clip_start), correct_mirror=correct_mirror, ignore_backface=ignore_backface)
 
+    def raycast_sources_Point2Ds(self, xys, *, correct_mirror=None, ignore_backface=None):
+        '''
+        same as raycast_sources_Point2D, but for many points.
+        options and snapping sources are looked up once rather than for each point
+        '''
+        if correct_mirror is None: correct_mirror = options['symmetry mirror input']
+        ignore_backface = self.ray_ignore_backface_sources() if ignore_backface is None else ignore_backface
+        rfsources = [rfsource for rfsource in self.rfsources if self.get_rfsource_snap(rfsource)]
+        clip_start = self.drawing.space.clip_start
+        hits = []
+        for xy in xys:
+            if xy is None:
+                hits.append((None,None,None,None))
+                continue
+            ray = self.Point2D_to_Ray(xy, min_dist=clip_start)
+            bp,bn,bi,bd = None,None,None,None
+            for rfsource in rfsources:
+                hp,hn,hi,hd = rfsource.raycast(ray, ignore_backface=ignore_backface)
+                if hp is None:     continue     # did we miss?
+                if isinf(hd):      continue     # is distance infinitely far away?
+                if isnan(hd):      continue     # is distance NaN?  (issue #1062)
+                if bp and bd < hd: continue     # have we seen a closer hit already?
+                bp,bn,bi,bd = hp,hn,hi,hd
+            if correct_mirror and bp and bn: bp, bn = self.mirror_point_normal(bp, bn)
+            hits.append((bp,bn,bi,bd))
+        return hits
+
     def raycast_sources_Point2D_all(self, xy:Point2D):
         if xy is None: return None,None,None,None
         return self.raycast_sources_Ray_all(self.Point2D_to_Ray(xy, min_dist=self.drawing.space.clip_start))
@@ -155,6 +189,18 @@ class RetopoFlow_Sources:
                 bp,bn,bi,bd = hp,hn,hi,hd
         return (bp,bn,bi,bd)
 
+    def nearest_sources_Points(self, points, max_dist=float('inf')):
+        ''' same as nearest_sources_Point, but for many points at once '''
+        best = [(None,None,None,None)] * len(points)
+        for rfsource in self.rfsources:
+            if not self.get_rfsource_snap(rfsource): continue
+            for idx, hit in enumerate(rfsource.nearest_points(points, max_dist=max_dist)):
+                bp,_,_,bd = best[idx]
+                hp,_,_,hd = hit
+                if bp is None or (hp is not None and hd < bd):
+                    best[idx] = hit
+        return best
+
 
     ###################################################
     # plane intersection
@@ -20,6 +20,7 @@ Created by Jonathan Denning, Jonathan Williamson
 '''
 
 import bpy
+import numpy as np
 
 from mathutils import Matrix, Vector
 from bpy_extras.view3d_utils import (
@@ -140,6 +141,25 @@ class RetopoFlow_Spaces:
         if xy is None: return None
         return Point2D(xy)
 
+    def Points_to_Point2Ds(self, xyzs, *, matrix=None):
+        '''
+        same as Point_to_Point2D, but projects float array (n, 3) of points at once.
+        if given, matrix transforms points to world space first (ex: object-local coordinates).
+        returns float array (n, 2), where points behind view are NaN
+        '''
+        region = self.actions.region
+        mx = self.actions.r3d.perspective_matrix
+        if matrix is not None: mx = mx @ matrix
+        mx = np.array(mx, dtype=np.float64)
+        xyzs = np.asarray(xyzs, dtype=np.float64).reshape((-1, 3))
+        prj = xyzs @ mx[:, :3].T + mx[:, 3]
+        w = prj[:, 3]
+        front = w > 0.0
+        half = np.array((region.width / 2.0, region.height / 2.0))
+        xys = np.full((len(xyzs), 2), np.nan)
+        xys[front] = half + half * (prj[front, :2] / w[front, None])
+        return xys
+
     alerted_small_clip_start = False
     def Point_to_depth(self, xyz):
         '''
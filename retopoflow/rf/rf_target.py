@@ -25,13 +25,16 @@ import traceback
 from itertools import chain
 
 import bpy
+import numpy as np
 
 from mathutils import Vector
+from mathutils.kdtree import KDTree
 from mathutils.geometry import intersect_line_line_2d as intersect_segment_segment_2d
 
 from ...config.options import visualization, options, retopoflow_datablocks
 from ...addon_common.common.debug import dprint, Debugger
 from ...addon_common.common.decorators import timed_call
+from ...addon_common.common.hasher import Hasher
 from ...addon_common.common.profiler import profiler, time_it
 from ...addon_common.common.utils import iter_pairs, Dict
 from ...addon_common.common.maths import Point, Vec, Direction, Normal, Ray, XForm, BBox
@@ -58,6 +61,7 @@ class RetopoFlow_Target:
         opts = visualization.get_target_settings()
         self.rftarget_draw = RFMeshRender.new(self.rftarget, opts)
         self.rftarget_version = None
+        self.rftarget_geometry_version = None
         self.hide_target()
 
         self.accel_defer_recomputing = False
@@ -66,6 +70,10 @@ class RetopoFlow_Target:
         self.accel_data_unsel = Dict(get_default=None)
         self.accel_recompute = True
 
+        self._visibility_cache = {}
+        self._visibility_cache_all = None
+        self._visibility_cache_version = None
+
         self._draw_count = 0
 
     @property
@@ -148,9 +156,14 @@ class RetopoFlow_Target:
 
     def teardown_target(self):
         # IMPORTANT: changes here should also go in rf_blender_save.backup_recover()
+        self.write_target()
         self.rftarget.obj_viewport_unhide()
         self.rftarget.obj_render_unhide()
 
+    def write_target(self):
+        # force writing any deferred target changes to Blender mesh
+        self.rftarget.clean(force=True)
+
     def done_target(self):
         del self.rftarget_draw
         del self.rftarget
@@ -491,6 +504,76 @@ class RetopoFlow_Target:
     def visible_faces(self, verts=None, faces=None): return self.rftarget.visible_faces(self.gen_is_visible(), verts=verts, faces=faces)
     def visible_geom(self): return (verts := self.visible_verts()), self.visible_edges(verts=verts), self.visible_faces(verts=verts)
 
+
+    #######################################
+    # shared visibility cache
+    # visibility of target verts is remembered per target / view version, so tools can
+    # query visibility of a subset without re-raycasting verts that are already known
+
+    def _get_visibility_cache(self):
+        version = Hasher(
+            self.get_target_version(selection=False),
+            self.get_view_version(),
+            options['visible bbox factor'],
+            options['visible dist offset'],
+            options['selection occlusion test'],
+            options['selection backface test'],
+            self.ray_ignore_backface_sources(),
+        )
+        if self._visibility_cache_version != version:
+            self._visibility_cache = {}
+            self._visibility_cache_all = None
+            self._visibility_cache_version = version
+        if self._visibility_cache_all is None:
+            # accel struct (if up-to-date) already knows visibility of _all_ verts
+            accel_data = self.accel_data_all
+            if all([
+                accel_data.verts is not None,
+                accel_data.target_version              == self.get_target_version(selection=None),
+                accel_data.view_version                == self.get_view_version(),
+                accel_data.visible_bbox_factor         == options['visible bbox factor'],
+                accel_data.visible_dist_offset         == options['visible dist offset'],
+                accel_data.selection_occlusion_test    == options['selection occlusion test'],
+                accel_data.selection_backface_test     == options['selection backface test'],
+                accel_data.ray_ignore_backface_sources == self.ray_ignore_backface_sources(),
+            ]):
+                self._visibility_cache_all = accel_data.verts
+        return self._visibility_cache
+
+    @profiler.function
+    def visible_verts_cached(self, verts=None):
+        '''
+        returns set of visible verts among verts (or all verts if None).
+        only verts with unknown visibility are tested against sources.
+        '''
+        cache = self._get_visibility_cache()
+        if (all_vis := self._visibility_cache_all) is not None:
+            if verts is None: return set(self.filter_is_valid(all_vis))
+            return { bmv for bmv in verts if bmv in all_vis }
+        if verts is None:
+            self._visibility_cache_all = self.visible_verts()
+            return set(self._visibility_cache_all)
+        verts = set(self.filter_is_valid(verts))
+        unknown = [bmv for bmv in verts if bmv not in cache]
+        if unknown:
+            vis = self.visible_verts(verts=unknown)
+            cache.update((bmv, bmv in vis) for bmv in unknown)
+        return { bmv for bmv in verts if cache[bmv] }
+
+    def visible_edges_cached(self, edges=None):
+        # edge is visible if ANY of its verts are visible
+        if edges is None: edges = self.rftarget.get_revealed_edges()
+        edges = set(self.filter_is_valid(edges))
+        vis_verts = self.visible_verts_cached(verts={ bmv for bme in edges for bmv in bme.verts })
+        return { bme for bme in edges if any(bmv in vis_verts for bmv in bme.verts) }
+
+    def visible_faces_cached(self, faces=None):
+        # face is visible if ALL of its verts are visible
+        if faces is None: faces = self.rftarget.get_revealed_faces()
+        faces = set(self.filter_is_valid(faces))
+        vis_verts = self.visible_verts_cached(verts={ bmv for bmf in faces for bmv in bmf.verts })
+        return { bmf for bmf in faces if all(bmv in vis_verts for bmv in bmf.verts) }
+
     def nonvisible_verts(self):             return self.rftarget.visible_verts(self.gen_is_nonvisible())
     def nonvisible_edges(self, verts=None): return self.rftarget.visible_edges(self.gen_is_nonvisible(), verts=verts)
     def nonvisible_faces(self, verts=None): return self.rftarget.visible_faces(self.gen_is_nonvisible(), verts=verts)
@@ -696,6 +779,19 @@ class RetopoFlow_Target:
         vert.co = xyz
         vert.normal = norm
 
+    def snap_verts(self, verts, *, snap_to_symmetry=None):
+        '''
+        same as snap_vert, but for many verts with one batched nearest query.
+        snap_to_symmetry is either None or a list with symmetry planes for each vert
+        '''
+        verts = [(i, vert) for (i, vert) in enumerate(verts) if vert and vert.is_valid]
+        hits = self.nearest_sources_Points([vert.co for (_, vert) in verts])
+        for (i, vert), (xyz, norm, _, _) in zip(verts, hits):
+            if snap_to_symmetry and snap_to_symmetry[i]:
+                xyz = self.snap_to_symmetry(xyz, snap_to_symmetry[i])
+            vert.co = xyz
+            vert.normal = norm
+
     def snap2D_vert(self, vert:RFVert):
         if not vert or  not vert.is_valid: return
         xy = self.Point_to_Point2D(vert.co)
@@ -722,6 +818,20 @@ class RetopoFlow_Target:
         vert.normal = norm
         return xyz
 
+    def set2D_verts(self, verts, xys, snap_to_symmetry=None):
+        '''
+        same as set2D_vert, but for many verts with one batched raycast query.
+        snap_to_symmetry is either None or a list with symmetry planes for each vert
+        '''
+        verts = [(i, vert, xy) for (i, (vert, xy)) in enumerate(zip(verts, xys)) if vert and vert.is_valid]
+        hits = self.raycast_sources_Point2Ds([xy for (_, _, xy) in verts])
+        for (i, vert, _), (xyz, norm, _, _) in zip(verts, hits):
+            if xyz is None: continue
+            if snap_to_symmetry and snap_to_symmetry[i]:
+                xyz = self.snap_to_symmetry(xyz, snap_to_symmetry[i])
+            vert.co = xyz
+            vert.normal = norm
+
     def set2D_crawl_vert(self, vert:RFVert, xy:Point2D):
         if not vert or  not vert.is_valid: return
         hits = self.raycast_sources_Point2D_all(xy)
@@ -801,6 +911,9 @@ class RetopoFlow_Target:
     def update_face_normal(self, face):
         return self.rftarget.update_face_normal(face)
 
+    def update_face_normals(self, faces):
+        return self.rftarget.update_face_normals(faces)
+
     def clean_duplicate_bmedges(self, vert):
         return self.rftarget.clean_duplicate_bmedges(vert)
 
@@ -825,6 +938,9 @@ class RetopoFlow_Target:
     def get_target_geometry_counts(self):
         return self.rftarget.get_geometry_counts()
 
+    def get_target_topology_version(self):
+        return self.rftarget.get_topology_version()
+
     ###################################################
 
     # determines if any of the edges cross
@@ -1071,18 +1187,36 @@ class RetopoFlow_Target:
 
         if merge_dist is None: return
 
-        bmverts = set(bmverts)
-        accel_data = self.get_custom_vis_accel(
-            selection_only=False,
-            include_verts=True, include_edges=False, include_faces=False,
-            symmetry=False,
-        )
-        snappable_bmverts = { bmv for bmv in accel_data.verts if bmv not in bmverts }
-        kwargs = { 'max_dist': self.drawing.scale(merge_dist), 'vis_accel': accel_data }
+        max_dist = self.drawing.scale(merge_dist)
+        moved = [(bmv, xy) for bmv in set(bmverts) if bmv.is_valid and (xy := self.Point_to_Point2D(bmv.co))]
+        if not moved: return []
+        moved_xy = np.array([xy for (_, xy) in moved], dtype=np.float64)
+
+        # only verts inside the screen-space bounding box of moved verts (grown by merge dist) can be merged into,
+        # so visibility is tested for these few candidates rather than for whole target
+        lo, hi = moved_xy.min(axis=0) - max_dist, moved_xy.max(axis=0) + max_dist
+        moved_set = { bmv for (bmv, _) in moved }
+        candidates = [bmv for bmv in self.rftarget.verts_in_region2D(self.Points_to_Point2Ds, lo, hi) if bmv not in moved_set]
+        candidates = self.visible_verts_cached(candidates)
+        fwd = self.Vec_forward()
+        candidates = [
+            (bmv, xy)
+            for bmv in candidates
+            for xy in self.iter_point2D_symmetries(bmv.co, bmv.normal, fwd=fwd)
+        ]
+        if not candidates: return []
+
+        # resolve nearest candidate of each moved vert with 2D kd-tree of candidate projections (z=0),
+        # so cost scales with moved + candidates rather than moved * candidates
+        kdt = KDTree(len(candidates))
+        for i, (_, xy) in enumerate(candidates):
+            kdt.insert((xy[0], xy[1], 0.0), i)
+        kdt.balance()
         update_verts = []
-        for bmv in bmverts:
-            if not (xy := self.Point_to_Point2D(bmv.co)): continue
-            if not (bmv1 := self.accel_nearest2D_vert(point=xy, **kwargs)[0]): continue
+        for (bmv, xy) in moved:
+            _, i, d = kdt.find((xy[0], xy[1], 0.0))
+            if i is None or d > max_dist: continue
+            bmv1 = candidates[i][0]
             bmv1.merge_robust(bmv)
             update_verts.append(bmv1)
 
@@ -1100,13 +1234,7 @@ class RetopoFlow_Target:
         bbox = self.rftarget.get_selection_bbox()
         if bbox.min == None:
             if not options['move rotate object if no selection']: return
-            #bbox = BBox.merge(src.get_bbox() for src in self.rfsources)
-            bboxes = []
-            for s in self.rfsources:
-                verts = [(s.obj.matrix_world @ Vector((v[0], v[1], v[2], 1))) for v in s.obj.bound_box]
-                verts = [(v[0]/v[3], v[1]/v[3], v[2]/v[3]) for v in verts]
-                bboxes.append(BBox(from_coords=verts))
-            bbox = BBox.merge(bboxes)
+            bbox = BBox.merge([src.get_bbox() for src in self.rfsources])
         # print('update_rot_object', bbox)
         diff = bbox.max - bbox.min
         rot_object = bpy.data.objects[retopoflow_datablocks['rotate object']]
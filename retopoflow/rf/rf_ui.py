@@ -182,16 +182,16 @@ class RetopoFlow_UI:
         if changed:
             self.ui_options.dirty(cause='update', parent=True, children=True)
 
-    def update_ui_geometry(self):
+    def update_ui_geometry(self, force=False):
         if not self.ui_geometry: return
-        vis = self.ui_geometry.is_visible
-        # TODO: FIX WORKAROUND HACK!
-        #       toggle visibility as workaround hack for relaying out table :(
-        if vis: self.ui_geometry.is_visible = False
-        self.ui_geometry.getElementById('geometry-verts').innerText = f'{self.rftarget.get_vert_count()}'
-        self.ui_geometry.getElementById('geometry-edges').innerText = f'{self.rftarget.get_edge_count()}'
-        self.ui_geometry.getElementById('geometry-faces').innerText = f'{self.rftarget.get_face_count()}'
-        if vis: self.ui_geometry.is_visible = True
+        counts = self.rftarget.get_geometry_counts()
+        if not force and counts == getattr(self, '_ui_geometry_counts', None): return
+        self._ui_geometry_counts = counts
+        # changing innerText dirties flow of the containing cells, which relays out only the geometry table
+        nv, ne, nf = counts
+        self.ui_geometry.getElementById('geometry-verts').innerText = f'{nv}'
+        self.ui_geometry.getElementById('geometry-edges').innerText = f'{ne}'
+        self.ui_geometry.getElementById('geometry-faces').innerText = f'{nf}'
 
     def minimize_geometry_window(self, target):
         if target.id != 'geometrydialog': return
@@ -208,7 +208,7 @@ class RetopoFlow_UI:
         self.ui_geometry_min.is_visible = False
         self.ui_geometry.left = self.ui_geometry_min.left
         self.ui_geometry.top  = self.ui_geometry_min.top
-        self.update_ui_geometry()
+        self.update_ui_geometry(force=True)
         self.document.force_clean(self.actions.context)
 
     def minimize_options_window(self, target):
@@ -303,7 +303,7 @@ class RetopoFlow_UI:
             self.ui_geometry_min = self.document.body.getElementById('geometrydialog-minimized')
             self.ui_geometry.is_visible = options['show geometry window']
             self.ui_geometry_min.is_visible = not options['show geometry window']
-            self.update_ui_geometry()
+            self.update_ui_geometry(force=True)
 
         def setup_tiny_ui():
             nonlocal humanread
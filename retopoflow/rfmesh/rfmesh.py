@@ -20,12 +20,13 @@ Created by Jonathan Denning, Jonathan Williamson
 '''
 
 import math
+import time
 import copy
 import heapq
 import numpy as np
 import random
 from dataclasses import dataclass, field
-from itertools import takewhile, filterfalse
+from itertools import takewhile, filterfalse, compress
 
 import bpy
 import bmesh
@@ -42,6 +43,7 @@ from mathutils.kdtree import KDTree
 from mathutils.geometry import normal as compute_normal, intersect_point_tri, intersect_point_tri_2d
 
 from ...addon_common.common.blender import ModifierWrapper_Mirror
+from ...addon_common.common.bounds import get_mesh_coords
 from ...addon_common.common.maths import Point, Normal, Direction
 from ...addon_common.common.maths import Point2D
 from ...addon_common.common.maths import Ray, XForm, BBox, Plane
@@ -54,6 +56,8 @@ from ...addon_common.terminal import term_printer
 
 from ...config.options import options
 
+from .rfmesh_snapshot import pack_snapshot
+
 from .rfmesh_wrapper import (
     BMElemWrapper, RFVert, RFEdge, RFFace, RFEdgeSequence
 )
@@ -97,11 +101,7 @@ class RFMesh():
     ):
         # checking for NaNs
         # print('RFMesh.__setup__: checking for NaNs')
-        hasnan = any(
-            math.isnan(v)
-            for emv in obj.data.vertices
-            for v in emv.co
-        )
+        hasnan = bool(np.isnan(get_mesh_coords(obj.data)).any())
         if hasnan:
             # print('RFMesh.__setup__: Mesh data contains NaN in vertex coordinate! Cleaning and validating mesh...')
             obj.data.validate(verbose=True, clean_customdata=False)
@@ -117,6 +117,7 @@ class RFMesh():
         self.hash = hash_object(self.obj)
         self._version = None
         self._version_selection = None
+        self._version_topology = None
 
         if bme is not None:
             self.bme = bme
@@ -150,6 +151,7 @@ class RFMesh():
         self.selection_center = Point((0, 0, 0))
         self.store_state()
         self.dirty()
+        self.dirty_topology()
         if False:
             term_printer.boxed(
                 f'{obj.name}',
@@ -185,12 +187,20 @@ class RFMesh():
             self._version = UniqueCounter.next()
         self._version_selection = UniqueCounter.next()
 
+    def dirty_topology(self):
+        # must be called whenever elements are created, deleted, or rewired (moving verts does not change topology)
+        self._version_topology = UniqueCounter.next()
+
     def clean(self):
         pass
 
     def get_version(self, selection=True):
         return Hasher(self._version, (self._version_selection if selection else 0))
 
+    def get_topology_version(self):
+        # note: element counts are included in case elements were created or deleted without calling dirty_topology
+        return (self._version_topology, len(self.bme.verts), len(self.bme.edges), len(self.bme.faces))
+
     @profiler.function
     def get_bvh(self):
         ver = self.get_version(selection=False)
@@ -239,6 +249,50 @@ class RFMesh():
             self.geocounts_version = ver
         return self.geocounts
 
+    @profiler.function
+    def get_topology_index(self):
+        '''
+        returns (vert_index, edge_verts, face_verts, face_starts) for current topology, where
+            vert_index:  dict of BMVert -> index into bme.verts
+            edge_verts:  int array (nedges, 2) of vert indices of each edge
+            face_verts:  int array of vert indices of all faces, concatenated (CSR face -> verts)
+            face_starts: int array of offset into face_verts of first vert of each face
+        '''
+        ver = self.get_topology_version()
+        if not hasattr(self, 'topoindex') or self.topoindex_version != ver:
+            vert_index = { bmv: i for (i, bmv) in enumerate(self.bme.verts) }
+            edge_verts = np.array([ vert_index[bmv] for bme in self.bme.edges for bmv in bme.verts ], dtype=np.int64).reshape((-1, 2))
+            face_sizes = [ len(bmf.verts) for bmf in self.bme.faces ]
+            face_verts = np.array([ vert_index[bmv] for bmf in self.bme.faces for bmv in bmf.verts ], dtype=np.int64)
+            face_starts = np.zeros(len(face_sizes), dtype=np.int64)
+            if face_sizes: np.cumsum(face_sizes[:-1], out=face_starts[1:])
+            self.topoindex = (vert_index, edge_verts, face_verts, face_starts)
+            self.topoindex_version = ver
+        return self.topoindex
+
+    @profiler.function
+    def get_vert_components(self):
+        '''
+        returns int array with connected component label of each vert, where the label is the smallest vert index in component
+        '''
+        ver = self.get_topology_version()
+        if not hasattr(self, 'components') or self.components_version != ver:
+            vert_index, edge_verts, _, _ = self.get_topology_index()
+            labels = np.arange(len(vert_index), dtype=np.int64)
+            v0, v1 = edge_verts[:,0], edge_verts[:,1]
+            while True:
+                # every label is a root here, so edges with equal labels are already within one component
+                l0, l1 = labels[v0], labels[v1]
+                if np.array_equal(l0, l1): break
+                # hook roots to smaller roots, then compress paths (pointer jumping)
+                lmin = np.minimum(l0, l1)
+                np.minimum.at(labels, l0, lmin)
+                np.minimum.at(labels, l1, lmin)
+                while not np.array_equal(nlabels := labels[labels], labels): labels = nlabels
+            self.components = labels
+            self.components_version = ver
+        return self.components
+
     ##########################################################
 
     def store_state(self):
@@ -297,6 +351,7 @@ class RFMesh():
         # print('RFMesh.triangulate: found %d non-triangles' % len(faces))
         # bmesh.ops.triangulate(self.bme, faces=faces)
         bmesh.ops.triangulate(self.bme, faces=self.bme.faces)
+        self.dirty_topology()
 
     @profiler.function
     def plane_split(self, plane: Plane):
@@ -314,6 +369,7 @@ class RFMesh():
             use_snap_center=True,
             clear_outer=False, clear_inner=False
         )
+        self.dirty_topology()
 
     @profiler.function
     def plane_intersection(self, plane: Plane):
@@ -717,6 +773,20 @@ class RFMesh():
         d = (point - wp).length
         return (wp,wn,i,d)
 
+    def nearest_points(self, points, max_dist=float('inf')):
+        # same as nearest, but for many points (BVH and transforms are looked up once)
+        find_nearest = self.get_bvh().find_nearest
+        w2l_point, l2w_point, l2w_normal = self.xform.w2l_point, self.xform.l2w_point, self.xform.l2w_normal
+        hits = []
+        for point in points:
+            p,n,i,_ = find_nearest(w2l_point(point), max_dist)
+            if p is None:
+                hits.append((None,None,None,None))
+                continue
+            wp = l2w_point(p)
+            hits.append((wp, l2w_normal(n), i, (point - wp).length))
+        return hits
+
     def nearest_bmvert_Point(self, point:Point, verts=None):
         if verts is None:
             verts = [bmv for bmv in self.bme.verts if bmv.is_valid and not bmv.hide]
@@ -777,6 +847,21 @@ class RFMesh():
             nearest.append((self._wrap_bmedge(bme), dist))
         return nearest
 
+    def verts_in_region2D(self, Points_to_Point2Ds, lo, hi):
+        '''
+        returns all valid, revealed verts that project inside screen-space box [lo, hi].
+        Points_to_Point2Ds projects float array of points (n,3) with given local-to-world matrix to (n,2)
+        '''
+        # note: positions are gathered on each call rather than cached per version, because verts
+        #       are often moved (ex: during a drag) without dirtying the mesh until the move is done
+        bmvs = list(filter(RFMesh.fn_is_valid_revealed, self.bme.verts))
+        if not bmvs: return []
+        coords = np.fromiter((c for bmv in bmvs for c in bmv.co), dtype=np.float64, count=len(bmvs)*3).reshape((-1, 3))
+        xys = Points_to_Point2Ds(coords, matrix=self.xform.mx_p)
+        with np.errstate(invalid='ignore'):
+            inside = np.all((xys >= lo) & (xys <= hi), axis=1)
+        return [self._wrap_bmvert(bmv) for bmv in compress(bmvs, inside) if bmv.is_valid]
+
     def nearest2D_bmverts_Point2D(self, xy:Point2D, dist2D:float, Point_to_Point2Ds, *, verts=None, fwd=None):
         # TODO: compute distance from camera to point
         # TODO: sort points based on 3d distance
@@ -1142,7 +1227,27 @@ class RFMesh():
                         bmf.select = True
         self.dirty(selectionOnly=True)
 
+    def _get_loop_cache(self):
+        # loop queries depend on topology and (for ambiguous vertices) on vert positions, so cache per geometry version
+        # note: element counts are included, because tools might create geometry and query loops before dirtying
+        ver = (self.get_version(selection=False), len(self.bme.verts), len(self.bme.edges), len(self.bme.faces))
+        if not hasattr(self, 'loopcache') or self.loopcache_version != ver:
+            self.loopcache = {}
+            self.loopcache_version = ver
+        return self.loopcache
+
+    def _cached_loop_query(self, kind, edge, fn):
+        cache = self._get_loop_cache()
+        key = (kind, self._unwrap(edge))
+        if key not in cache:
+            cache[key] = fn(edge)
+        return cache[key]
+
     def get_quadwalk_edgesequence(self, edge):
+        # note: returned RFEdgeSequence is shared with later calls until geometry changes
+        return self._cached_loop_query('quadwalk', edge, self._get_quadwalk_edgesequence)
+
+    def _get_quadwalk_edgesequence(self, edge):
         bme = self._unwrap(edge)
         touched = set()
         edges = []
@@ -1229,6 +1334,9 @@ class RFMesh():
         return (bme0, flipped, bmf0, True)
 
     def is_quadstrip_looped(self, edge):
+        return self._cached_loop_query('quadstrip looped', edge, self._is_quadstrip_looped)
+
+    def _is_quadstrip_looped(self, edge):
         edge = self._unwrap(edge)
         _,_,_,looped = self._crawl_quadstrip_to_loopend(edge)
         return looped
@@ -1257,6 +1365,10 @@ class RFMesh():
             bme,bmf = bme_next,bmf_next
 
     def get_face_loop(self, edge):
+        edges, is_looped = self._cached_loop_query('face loop', edge, self._get_face_loop)
+        return (list(edges), is_looped)
+
+    def _get_face_loop(self, edge):
         r'''
               +--  this diamond quad causes problems!
               |
@@ -1280,6 +1392,10 @@ class RFMesh():
         return (edges, is_looped)
 
     def get_edge_loop(self, edge):
+        edges, loop = self._cached_loop_query('edge loop', edge, self._get_edge_loop)
+        return (list(edges), loop)
+
+    def _get_edge_loop(self, edge):
         touched = set()
         edges = [edge]
 
@@ -1325,6 +1441,10 @@ class RFMesh():
         return (edges, loop)
 
     def get_inner_edge_loop(self, edge):
+        edges, loop = self._cached_loop_query('inner edge loop', edge, self._get_inner_edge_loop)
+        return (list(edges), loop)
+
+    def _get_inner_edge_loop(self, edge):
         # returns edge loop that follows the inside, boundary
         bme = self._unwrap(edge)
         if len(bme.link_faces) != 1: return ([], False)
@@ -1362,15 +1482,19 @@ class RFMesh():
 
     def select_invert(self):
         if True:
-            sel_verts = [bmv for bmv in self.bme.verts if not bmv.select]
-            for bmf in self.bme.faces: bmf.select = all(bmv in sel_verts for bmv in bmf.verts)
-            for bme in self.bme.edges: bme.select = all(bmv in sel_verts for bmv in bme.verts)
-            for bmv in self.bme.verts: bmv.select = (bmv in sel_verts)
+            # select verts that are not selected, and edges and faces whose verts will all be selected
+            _, edge_verts, face_verts, face_starts = self.get_topology_index()
+            sel_verts = np.array([ not bmv.select for bmv in self.bme.verts ], dtype=bool)
+            sel_edges = sel_verts[edge_verts[:,0]] & sel_verts[edge_verts[:,1]]
+            sel_faces = np.logical_and.reduceat(sel_verts[face_verts], face_starts) if len(face_starts) else sel_verts[:0]
+            for bmf, s in zip(self.bme.faces, sel_faces.tolist()): bmf.select = s
+            for bme, s in zip(self.bme.edges, sel_edges.tolist()): bme.select = s
+            for bmv, s in zip(self.bme.verts, sel_verts.tolist()): bmv.select = s
         else:
             for bmv in self.bme.verts: bmv.select = not bmv.select
             for bme in self.bme.edges: bme.select = not bme.select
             for bmf in self.bme.faces: bmf.select = not bmf.select
-        self.dirty()
+        self.dirty(selectionOnly=True)
 
     def select_linked(self, *, select=True, connected_to=None):
         if connected_to is None:
@@ -1385,25 +1509,22 @@ class RFMesh():
         pworking, working = working, set()
         for e in pworking:
             if isinstance(e, RFVert) or isinstance(e, BMVert):
-                working.add(e)
+                working.add(self._unwrap(e))
             else:
                 for v in e.verts:
-                    working.add(v)
-        linked_verts = set(working)
-        while working:
-            bmv = working.pop()
-            for bme in bmv.link_edges:
-                bmvo = bme.other_vert(bmv)
-                if bmvo in linked_verts: continue
-                working.add(bmvo)
-                linked_verts.add(bmvo)
-        for bmv in linked_verts:
-            bmv.select = select
-            for bme in bmv.link_edges:
-                bme.select = select
-            for bmf in bmv.link_faces:
-                bmf.select = select
-        self.dirty()
+                    working.add(self._unwrap(v))
+
+        # select all elements in the connected components of working verts
+        vert_index, edge_verts, face_verts, face_starts = self.get_topology_index()
+        labels = self.get_vert_components()
+        seeds = [ vert_index[bmv] for bmv in working if bmv in vert_index ]
+        linked_verts = np.isin(labels, labels[seeds])
+        linked_edges = linked_verts[edge_verts[:,0]]
+        linked_faces = linked_verts[face_verts[face_starts]]
+        for bmv in compress(self.bme.verts, linked_verts.tolist()): bmv.select = select
+        for bme in compress(self.bme.edges, linked_edges.tolist()): bme.select = select
+        for bmf in compress(self.bme.faces, linked_faces.tolist()): bmf.select = select
+        self.dirty(selectionOnly=True)
 
 
 class RFSource(RFMesh):
@@ -1508,16 +1629,31 @@ class RFTarget(RFMesh):
         self.setup_displace()
 
         self.editmesh_version = None
+        self.editmesh_time = 0
+        self.editmesh_elems = None
         self.xy_symmetry_accel = xy_symmetry_accel
         self.xz_symmetry_accel = xz_symmetry_accel
         self.yz_symmetry_accel = yz_symmetry_accel
         self.unit_scaling_factor = unit_scaling_factor
 
+        # faces with normals that need updating, collected during an operation and updated together (see update_normals)
+        self.normals_dirty = set()
+        self.normals_updated = 0    # number of face normals updated since last call to take_normals_updated (debug)
+
     @property
     def layer_pin(self):
         il = self.bme.verts.layers.int
         return il['pin'] if 'pin' in il else il.new('pin')
 
+    def to_snapshot(self, action=''):
+        ''' packs target mesh into a compact binary snapshot record (see rfmesh_snapshot) '''
+        return pack_snapshot(
+            self.bme,
+            action=action or '',
+            name=self.obj.name,
+            symmetry=(self.mirror_mod.x, self.mirror_mod.y, self.mirror_mod.z),
+        )
+
     def setup_mirror(self):
         self.mirror_mod = ModifierWrapper_Mirror.get_from_object(self.obj)
         if not self.mirror_mod:
@@ -1619,6 +1755,7 @@ class RFTarget(RFMesh):
         # deepcopy all remaining settings
         for k,v in self.__dict__.items():
             if k not in {'prev_state'} and k in rftarget.__dict__: continue
+            if k in {'topoindex', 'components', 'loopcache'}: continue  # caches of bmesh elements are rebuilt on demand
             setattr(rftarget, k, copy.deepcopy(v, memo))
         return rftarget
 
@@ -1645,16 +1782,22 @@ class RFTarget(RFMesh):
         self.restore_state()
 
 
-    def clean(self):
+    def clean(self, *, force=False):
         super().clean()
+        self.update_normals()
 
         version = self.get_version()
         if self.editmesh_version == version: return
+        # writing back to Blender mesh is expensive, so writes are rate-limited while editing.
+        # force is used when the Blender mesh must be up-to-date (ex: saving, exiting)
+        if not force and (time.time() - self.editmesh_time) < options['target write delay']: return
         self.editmesh_version = version
+        self.editmesh_time = time.time()
 
         try:
-            self._clean_mesh()
-            self._clean_selection()
+            if force or not self._clean_mesh_bulk():
+                self._clean_mesh()
+                self._clean_selection()
             self._clean_mirror()
             self._clean_displace()
         except Exception as e:
@@ -1669,14 +1812,34 @@ class RFTarget(RFMesh):
         self.obj.data = new_mesh
         bpy.data.meshes.remove(prev_mesh)
         new_mesh.name = prev_mesh_name
+        # remember elements (in order) written to mesh, so later writes can skip rebuilding mesh if topology is unchanged
+        self.editmesh_elems = (list(self.bme.verts), list(self.bme.edges), list(self.bme.faces))
+
+    def _clean_mesh_bulk(self):
+        '''
+        writes vert positions, selection, and hidden state to Blender mesh using foreach_set.
+        only possible if no elements were created or deleted since last _clean_mesh; returns False otherwise.
+        '''
+        if not self.editmesh_elems: return False
+        bmvs, bmes, bmfs = self.editmesh_elems
+        me = self.obj.data
+        counts = (len(self.bme.verts), len(self.bme.edges), len(self.bme.faces))
+        if counts != (len(bmvs), len(bmes), len(bmfs)): return False
+        if counts != (len(me.vertices), len(me.edges), len(me.polygons)): return False
+        if not all(bmelem.is_valid for bmelems in self.editmesh_elems for bmelem in bmelems): return False
+
+        me.vertices.foreach_set('co', [c for bmv in bmvs for c in bmv.co])
+        for bmelems, mcollection in zip(self.editmesh_elems, (me.vertices, me.edges, me.polygons)):
+            mcollection.foreach_set('select', [bmelem.select for bmelem in bmelems])
+            mcollection.foreach_set('hide',   [bmelem.hide   for bmelem in bmelems])
+        me.update()
+        return True
 
     def _clean_selection(self):
-        for bmv,emv in zip(self.bme.verts, self.obj.data.vertices):
-            emv.select = bmv.select
-        for bme,eme in zip(self.bme.edges, self.obj.data.edges):
-            eme.select = bme.select
-        for bmf,emf in zip(self.bme.faces, self.obj.data.polygons):
-            emf.select = bmf.select
+        me = self.obj.data
+        me.vertices.foreach_set('select', [bmv.select for bmv in self.bme.verts])
+        me.edges.foreach_set('select',    [bme.select for bme in self.bme.edges])
+        me.polygons.foreach_set('select', [bmf.select for bmf in self.bme.faces])
 
     def _clean_mirror(self):
         self.mirror_mod.write()
@@ -1728,6 +1891,7 @@ class RFTarget(RFMesh):
         # assuming co and norm are in world space!
         # so, do not set co directly; need to xform to local first.
         bmv = self.bme.verts.new((0,0,0))
+        self.dirty_topology()
         rfv = self._wrap_bmvert(bmv)
         rfv.co = co
         rfv.normal = norm
@@ -1738,6 +1902,7 @@ class RFTarget(RFMesh):
             return None
         verts = [self._unwrap(v) for v in verts]
         bme = self.bme.edges.new(verts)
+        self.dirty_topology()
         return self._wrap_bmedge(bme)
 
     def new_face(self, verts):
@@ -1756,7 +1921,8 @@ class RFTarget(RFMesh):
         nverts = deduplicate_list(verts)
         if len(nverts) < 3: return None
         bmf = self.bme.faces.new(nverts)
-        self.update_face_normal(bmf)
+        self.dirty_topology()
+        self._update_bmface_normal(bmf)     # new face must be oriented immediately (not deferred)
         return self._wrap_bmface(bmf)
 
     def merge_vertices(self, vert1, vert2, merge_point: str = 'CENTER'):
@@ -1790,6 +1956,7 @@ class RFTarget(RFMesh):
             verts=[bmv1, bmv2],
             merge_co=pos
         )
+        self.dirty_topology()
 
         # Update the normal
         bmv1.normal = norm
@@ -1801,6 +1968,7 @@ class RFTarget(RFMesh):
     def holes_fill(self, edges, sides):
         edges = list(map(self._unwrap, edges))
         ret = holes_fill(self.bme, edges=edges, sides=sides)
+        self.dirty_topology()
         print('RetopoFlow holes_fill', ret)
 
 
@@ -1810,6 +1978,7 @@ class RFTarget(RFMesh):
         if not co or not norm: return None
         bmvs = [self._unwrap(v) for v in rfvs]
         pointmerge(self.bme, verts=bmvs)
+        self.dirty_topology()
         rfv = self._wrap_bmvert(bmvs[0])
         rfv.co = co
         rfv.normal = norm
@@ -1865,6 +2034,7 @@ class RFTarget(RFMesh):
     def delete_verts(self, verts):
         for bmv in map(self._unwrap, verts):
             if bmv.is_valid and not bmv.hide: self.bme.verts.remove(bmv)
+        self.dirty_topology()
 
     def delete_edges(self, edges, del_empty_verts=True):
         edges = { self._unwrap(e) for e in edges if e.is_valid and not e.hide }
@@ -1873,6 +2043,7 @@ class RFTarget(RFMesh):
         if del_empty_verts:
             for bmv in verts:
                 if len(bmv.link_edges) == 0: self.bme.verts.remove(bmv)
+        self.dirty_topology()
 
     def delete_faces(self, faces, del_empty_edges=True, del_empty_verts=True):
         faces = { self._unwrap(f) for f in faces if f.is_valid and not f.hide }
@@ -1885,36 +2056,58 @@ class RFTarget(RFMesh):
         if del_empty_verts:
             for bmv in verts:
                 if len(bmv.link_faces) == 0: self.bme.verts.remove(bmv)
+        self.dirty_topology()
 
     def dissolve_verts(self, verts, use_face_split=False, use_boundary_tear=False):
         verts = [ self._unwrap(v) for v in verts if v.is_valid and not v.hide ]
         dissolve_verts(self.bme, verts=verts, use_face_split=use_face_split, use_boundary_tear=use_boundary_tear)
+        self.dirty_topology()
 
     def dissolve_edges(self, edges, use_verts=True, use_face_split=False):
         edges = [ self._unwrap(e) for e in edges if e.is_valid and not e.hide ]
         dissolve_edges(self.bme, edges=edges, use_verts=use_verts, use_face_split=use_face_split)
+        self.dirty_topology()
 
     def dissolve_faces(self, faces, use_verts=True):
         faces = [ self._unwrap(f) for f in faces if f.is_valid and not f.hide ]
         dissolve_faces(self.bme, faces=faces, use_verts=use_verts)
+        self.dirty_topology()
 
     def update_verts_faces(self, verts):
-        faces = { f for v in verts if v.is_valid for f in self._unwrap(v).link_faces }
-        for bmf in faces:
-            n = compute_normal(v.co for v in bmf.verts)
-            vnorm = sum((v.normal for v in bmf.verts), Vector())
-            if n.dot(vnorm) < 0:
-                bmf.normal_flip()
-            bmf.normal_update()
+        self.normals_dirty |= { f for v in verts if v.is_valid for f in self._unwrap(v).link_faces }
 
     def update_face_normal(self, face):
-        bmf = self._unwrap(face)
+        self.normals_dirty.add(self._unwrap(face))
+
+    def update_face_normals(self, faces):
+        self.normals_dirty |= { self._unwrap(f) for f in faces if f.is_valid }
+
+    def update_normals(self):
+        '''
+        updates normals of all faces marked by update_verts_faces, update_face_normal, and update_face_normals,
+        then updates normals of the verts of those faces.  faces are flipped to agree with their vert normals
+        (ex: vert normals from snapping to sources) before vert normals are recomputed.
+        called when target is cleaned, so normals are updated at most once per face per frame.
+        '''
+        if not self.normals_dirty: return
+        bmfs = [bmf for bmf in self.normals_dirty if bmf.is_valid]
+        self.normals_dirty = set()
+        for bmf in bmfs: self._update_bmface_normal(bmf)
+        for bmv in { bmv for bmf in bmfs for bmv in bmf.verts }:
+            bmv.normal_update()
+        self.normals_updated += len(bmfs)
+
+    def _update_bmface_normal(self, bmf):
         n = compute_normal(v.co for v in bmf.verts)
         vnorm = sum((v.normal for v in bmf.verts), Vector())
         if n.dot(vnorm) < 0:
             bmf.normal_flip()
         bmf.normal_update()
 
+    def take_normals_updated(self):
+        count, self.normals_updated = self.normals_updated, 0
+        return count
+
     def clean_duplicate_bmedges(self, vert):
         if not vert.is_valid: return {}
         bmv = self._unwrap(vert)
@@ -1955,6 +2148,7 @@ class RFTarget(RFMesh):
             if not handled:
                 # assert handled, 'unhandled count of linked faces %d, %d' % (l0,l1)
                 print('clean_duplicate_bmedges: unhandled count of linked faces %d, %d' % (l0,l1))
+        if lbme_dup: self.dirty_topology()
         return mapping
 
     def remove_duplicate_bmfaces(self, vert):
@@ -2020,14 +2214,17 @@ class RFTarget(RFMesh):
         bmv = [v for v in self.bme.verts if not v.hide]
         remove_doubles(self.bme, verts=bmv, dist=dist)
         self.dirty()
+        self.dirty_topology()
 
     def remove_selected_doubles(self, dist):
         remove_doubles(self.bme, verts=[bmv for bmv in self.bme.verts if bmv.select], dist=dist)
         self.dirty()
+        self.dirty_topology()
 
     def remove_by_distance(self, verts, dist):
         remove_doubles(self.bme, verts=[self._unwrap(v) for v in verts], dist=dist)
         self.dirty()
+        self.dirty_topology()
 
     def flip_face_normals(self):
         verts = set()
@@ -2040,9 +2237,12 @@ class RFTarget(RFMesh):
         self.dirty()
 
     def recalculate_face_normals(self, *, verts=None, faces=None):
-        if faces is None: faces = { bmf for bmf in self.bme.faces if bmf.select }
-        else:             faces = { self._unwrap(bmf) for bmf in faces }
-        if verts:         faces |= { self._unwrap(bmf) for bmv in verts for bmf in bmv.link_faces}
+        # only fall back to selected faces if neither verts nor faces are given
+        if faces is None and verts is None: faces = { bmf for bmf in self.bme.faces if bmf.select }
+        else:                               faces = { self._unwrap(bmf) for bmf in (faces or []) }
+        if verts:                           faces |= { self._unwrap(bmf) for bmv in verts for bmf in bmv.link_faces}
         recalc_face_normals(self.bme, faces=list(faces))
-        for bmv in (bmv for bmf in faces for bmv in bmf.verts): bmv.normal_update()
+        self.normals_dirty -= faces
+        for bmv in { bmv for bmf in faces for bmv in bmf.verts }: bmv.normal_update()
+        self.normals_updated += len(faces)
         self.dirty()
@@ -0,0 +1,343 @@
+'''
+Copyright (C) 2023 CG Cookie
+http://cgcookie.com
+hello@cgcookie.com
+
+Created by Jonathan Denning, Jonathan Williamson
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import os
+import sys
+import time
+import struct
+import threading
+from array import array
+from queue import Queue, Full
+from dataclasses import dataclass, field
+
+
+'''
+Compact binary snapshots of a target mesh, used by the crash-recovery journal and by instrumentation.
+
+A snapshot file is a sequence of records appended one after another.  Each record is
+
+    record  := magic (4 bytes) | payload size (uint32) | payload
+
+where magic is b'RFSN' for a mesh snapshot, b'RFAC' for a (small) action record, or b'RFJH' for a journal header.
+
+A mesh snapshot payload is
+
+    payload := header | action (utf8) | name (utf8) | arrays
+
+    header  := version (uint8), timestamp (float64), symmetry x,y,z (3 x bool),
+               len(action), len(name), nverts, nedges, nfaces, nloops (6 x uint32)
+    arrays  := vert coords   float32[nverts * 3]
+               vert flags    uint8[nverts]          (bit 0: select, bit 1: hide)
+               edge verts    int32[nedges * 2]
+               edge flags    uint8[nedges]
+               face sizes    int32[nfaces]
+               face verts    int32[nloops]
+               face flags    uint8[nfaces]
+
+An action record payload is
+
+    payload := header | action (utf8)
+    header  := version (uint8), timestamp (float64), len(action), nverts, nedges, nfaces (4 x uint32)
+
+A journal header payload identifies where the snapshots came from, so recovery can verify it is replaying into
+the right file and place the recovered object correctly
+
+    payload := header | blend filepath (utf8) | name (utf8)
+    header  := version (uint8), timestamp (float64), len(blend filepath), len(name) (2 x uint32),
+               object to world matrix (16 x float64, row-major)
+
+All values are little-endian.  Coordinates are in object-local space.
+A record that was only partially written (ex: crash while writing) is ignored by the reader.
+Use `iter_records(path)` to read all records in a file, `iter_snapshots(path)` to read only the mesh
+snapshots, `read_journal_header(path)` to get the journal header, or `read_last_snapshot(path)` to get the
+latest mesh snapshot (without decoding the earlier ones).
+'''
+
+SNAPSHOT_MAGIC = b'RFSN'
+ACTION_MAGIC = b'RFAC'
+JOURNAL_MAGIC = b'RFJH'
+SNAPSHOT_VERSION = 1
+
+_record_fmt = '<4sI'
+_header_fmt = '<Bd???IIIIII'
+_action_fmt = '<BdIIII'
+_journal_fmt = '<BdII16d'
+_record_size = struct.calcsize(_record_fmt)
+_header_size = struct.calcsize(_header_fmt)
+_action_size = struct.calcsize(_action_fmt)
+_journal_size = struct.calcsize(_journal_fmt)
+
+FLAG_SELECT = 0b01
+FLAG_HIDE   = 0b10
+
+
+@dataclass
+class MeshSnapshot:
+    action: str = ''
+    name: str = ''
+    timestamp: float = 0.0
+    symmetry: tuple = (False, False, False)
+    verts: list = field(default_factory=list)        # [(x,y,z), ...]
+    vert_flags: list = field(default_factory=list)
+    edges: list = field(default_factory=list)        # [(i0,i1), ...]
+    edge_flags: list = field(default_factory=list)
+    faces: list = field(default_factory=list)        # [(i0,i1,i2,...), ...]
+    face_flags: list = field(default_factory=list)
+
+
+@dataclass
+class ActionRecord:
+    action: str = ''
+    timestamp: float = 0.0
+    counts: tuple = (0, 0, 0)       # (nverts, nedges, nfaces)
+
+
+@dataclass
+class JournalHeader:
+    blend_filepath: str = ''        # empty if .blend was never saved
+    name: str = ''                  # name of target object
+    timestamp: float = 0.0
+    matrix: tuple = ()              # object to world matrix of target, as 4 rows of 4 floats
+
+
+def _to_bytes(arr):
+    if sys.byteorder != 'little': arr.byteswap()
+    return arr.tobytes()
+
+def _from_bytes(typecode, buf, offset, count):
+    arr = array(typecode)
+    size = arr.itemsize * count
+    arr.frombytes(buf[offset:offset+size])
+    if sys.byteorder != 'little': arr.byteswap()
+    return arr, offset + size
+
+def _flags(bmelem):
+    return (FLAG_SELECT if bmelem.select else 0) | (FLAG_HIDE if bmelem.hide else 0)
+
+
+def pack_snapshot(bme, *, action='', name='', symmetry=(False, False, False), timestamp=None):
+    ''' packs BMesh into a snapshot record (bytes) '''
+    bmvs, bmes, bmfs = bme.verts, bme.edges, bme.faces
+    vert_index = { bmv: i for (i, bmv) in enumerate(bmvs) }
+
+    verts      = array('f', [c for bmv in bmvs for c in bmv.co])
+    vert_flags = array('B', [_flags(bmv) for bmv in bmvs])
+    edges      = array('i', [vert_index[bmv] for bme_ in bmes for bmv in bme_.verts])
+    edge_flags = array('B', [_flags(bme_) for bme_ in bmes])
+    face_sizes = array('i', [len(bmf.verts) for bmf in bmfs])
+    face_verts = array('i', [vert_index[bmv] for bmf in bmfs for bmv in bmf.verts])
+    face_flags = array('B', [_flags(bmf) for bmf in bmfs])
+
+    action_b, name_b = action.encode('utf8'), name.encode('utf8')
+    sx, sy, sz = (bool(s) for s in symmetry)
+    header = struct.pack(
+        _header_fmt,
+        SNAPSHOT_VERSION, (time.time() if timestamp is None else timestamp), sx, sy, sz,
+        len(action_b), len(name_b), len(bmvs), len(bmes), len(bmfs), len(face_verts),
+    )
+    payload = b''.join([
+        header, action_b, name_b,
+        _to_bytes(verts), _to_bytes(vert_flags),
+        _to_bytes(edges), _to_bytes(edge_flags),
+        _to_bytes(face_sizes), _to_bytes(face_verts), _to_bytes(face_flags),
+    ])
+    return struct.pack(_record_fmt, SNAPSHOT_MAGIC, len(payload)) + payload
+
+
+def pack_action(action, counts, *, timestamp=None):
+    ''' packs action name and geometry counts into a small action record (bytes) '''
+    action_b = action.encode('utf8')
+    nv, ne, nf = counts
+    payload = struct.pack(
+        _action_fmt,
+        SNAPSHOT_VERSION, (time.time() if timestamp is None else timestamp), len(action_b), nv, ne, nf,
+    ) + action_b
+    return struct.pack(_record_fmt, ACTION_MAGIC, len(payload)) + payload
+
+
+def pack_journal_header(blend_filepath, name, matrix, *, timestamp=None):
+    ''' packs source .blend filepath and target object identity into a journal header record (bytes) '''
+    blend_b, name_b = blend_filepath.encode('utf8'), name.encode('utf8')
+    payload = struct.pack(
+        _journal_fmt,
+        SNAPSHOT_VERSION, (time.time() if timestamp is None else timestamp), len(blend_b), len(name_b),
+        *(v for row in matrix for v in row),
+    ) + blend_b + name_b
+    return struct.pack(_record_fmt, JOURNAL_MAGIC, len(payload)) + payload
+
+
+def unpack_journal_header(payload):
+    ''' unpacks payload of a journal header record into a JournalHeader '''
+    version, timestamp, lb, ln, *matrix = struct.unpack_from(_journal_fmt, payload, 0)
+    assert version == SNAPSHOT_VERSION, f'Unknown snapshot version {version}'
+    o = _journal_size
+    blend_filepath = payload[o:o+lb].decode('utf8'); o += lb
+    name           = payload[o:o+ln].decode('utf8')
+    matrix = tuple(tuple(matrix[i:i+4]) for i in range(0, 16, 4))
+    return JournalHeader(blend_filepath=blend_filepath, name=name, timestamp=timestamp, matrix=matrix)
+
+
+def unpack_action(payload):
+    ''' unpacks payload of an action record into an ActionRecord '''
+    version, timestamp, la, nv, ne, nf = struct.unpack_from(_action_fmt, payload, 0)
+    assert version == SNAPSHOT_VERSION, f'Unknown snapshot version {version}'
+    action = payload[_action_size:_action_size+la].decode('utf8')
+    return ActionRecord(action=action, timestamp=timestamp, counts=(nv, ne, nf))
+
+
+def unpack_snapshot(payload):
+    ''' unpacks payload of a snapshot record into a MeshSnapshot '''
+    version, timestamp, sx, sy, sz, la, ln, nv, ne, nf, nl = struct.unpack_from(_header_fmt, payload, 0)
+    assert version == SNAPSHOT_VERSION, f'Unknown snapshot version {version}'
+    o = _header_size
+    action = payload[o:o+la].decode('utf8'); o += la
+    name   = payload[o:o+ln].decode('utf8'); o += ln
+    verts,      o = _from_bytes('f', payload, o, nv * 3)
+    vert_flags, o = _from_bytes('B', payload, o, nv)
+    edges,      o = _from_bytes('i', payload, o, ne * 2)
+    edge_flags, o = _from_bytes('B', payload, o, ne)
+    face_sizes, o = _from_bytes('i', payload, o, nf)
+    face_verts, o = _from_bytes('i', payload, o, nl)
+    face_flags, o = _from_bytes('B', payload, o, nf)
+
+    faces, i = [], 0
+    for size in face_sizes:
+        faces.append(tuple(face_verts[i:i+size]))
+        i += size
+
+    return MeshSnapshot(
+        action=action, name=name, timestamp=timestamp, symmetry=(sx, sy, sz),
+        verts=[tuple(verts[i:i+3]) for i in range(0, nv * 3, 3)],
+        vert_flags=list(vert_flags),
+        edges=[tuple(edges[i:i+2]) for i in range(0, ne * 2, 2)],
+        edge_flags=list(edge_flags),
+        faces=faces,
+        face_flags=list(face_flags),
+    )
+
+
+_unpackers = {
+    SNAPSHOT_MAGIC: unpack_snapshot,
+    ACTION_MAGIC:   unpack_action,
+    JOURNAL_MAGIC:  unpack_journal_header,
+}
+
+def _iter_record_spans(f):
+    ''' yields (magic, payload offset, payload size) of all complete records in open file f, without reading payloads '''
+    end = os.fstat(f.fileno()).st_size
+    offset = 0
+    while offset + _record_size <= end:
+        f.seek(offset)
+        magic, size = struct.unpack(_record_fmt, f.read(_record_size))
+        if magic not in _unpackers: return
+        offset += _record_size
+        if offset + size > end: return
+        yield (magic, offset, size)
+        offset += size
+
+def iter_records(path):
+    ''' yields all complete records (MeshSnapshot, ActionRecord, or JournalHeader) in file at path '''
+    if not path or not os.path.exists(path): return
+    with open(path, 'rb') as f:
+        for magic, offset, size in list(_iter_record_spans(f)):
+            f.seek(offset)
+            yield _unpackers[magic](f.read(size))
+
+def _read_record(path, fn_pick):
+    ''' decodes only the record picked by fn_pick from list of record spans (or returns None) '''
+    if not path or not os.path.exists(path): return None
+    with open(path, 'rb') as f:
+        span = fn_pick(list(_iter_record_spans(f)))
+        if not span: return None
+        magic, offset, size = span
+        f.seek(offset)
+        return _unpackers[magic](f.read(size))
+
+
+def iter_snapshots(path):
+    ''' yields all complete mesh snapshot records in file at path '''
+    for record in iter_records(path):
+        if isinstance(record, MeshSnapshot): yield record
+
+
+def read_last_snapshot(path):
+    ''' returns last complete snapshot record in file at path (or None), skipping over payloads of earlier records '''
+    return _read_record(path, lambda spans: next((span for span in reversed(spans) if span[0] == SNAPSHOT_MAGIC), None))
+
+
+def read_journal_header(path):
+    ''' returns journal header record of file at path (or None if file does not start with one) '''
+    return _read_record(path, lambda spans: spans[0] if spans and spans[0][0] == JOURNAL_MAGIC else None)
+
+
+class SnapshotWriter:
+    '''
+    appends snapshot records to a file from a background thread.
+    queue is bounded; when full, `write` either blocks or drops the record (see `drop_when_full`).
+    if `header` is given, it is written as first record of file.
+    if `compact`, each written record replaces all previously written records (header is kept), so the file does
+    not grow over a long session.  the file is replaced atomically, so it always contains a complete record.
+    '''
+
+    def __init__(self, path, *, truncate=True, max_queue=16, drop_when_full=False, header=None, compact=False):
+        self.path = path
+        self.drop_when_full = drop_when_full
+        self.dropped = 0
+        self.header = header or b''
+        self.compact = compact
+        self._queue = Queue(maxsize=max_queue)
+        if truncate or compact:
+            with open(path, 'wb') as f: f.write(self.header)
+        self._thread = threading.Thread(target=self._write_out, daemon=True)
+        self._thread.start()
+
+    def _write_out(self):
+        if self.compact:
+            tmppath = f'{self.path}.tmp'
+            while True:
+                record = self._queue.get()
+                if record is None: break
+                with open(tmppath, 'wb') as f:
+                    f.write(self.header)
+                    f.write(record)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmppath, self.path)
+            return
+        with open(self.path, 'ab') as f:
+            while True:
+                record = self._queue.get()
+                if record is None: break
+                f.write(record)
+                f.flush()
+
+    def write(self, record):
+        if not self._thread: return
+        try:
+            self._queue.put(record, block=not self.drop_when_full)
+        except Full:
+            self.dropped += 1
+
+    def close(self):
+        if not self._thread: return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
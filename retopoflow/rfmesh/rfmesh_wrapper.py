@@ -60,6 +60,7 @@ user-writable properties:
     common: hide, index. select, tag
 
 NOTE: RFVert, RFEdge, RFFace do NOT mark RFMesh as dirty!
+      however, operations that create, delete, or rewire elements do bump the topology version (see RFMesh.dirty_topology)
 '''
 
 
@@ -264,6 +265,7 @@ class RFVert(BMElemWrapper):
         bmv = BMElemWrapper._unwrap(self)
         bmf = BMElemWrapper._unwrap(f)
         new_bmv = face_vert_separate(bmf, bmv)
+        self.rftarget.dirty_topology()
         return RFVert(new_bmv)
 
     def merge(self, other):
@@ -276,6 +278,7 @@ class RFVert(BMElemWrapper):
             bmv0 = BMElemWrapper._unwrap(self)
             bmv1 = BMElemWrapper._unwrap(other)
             vert_splice(bmv1, bmv0)
+            self.rftarget.dirty_topology()
             return RFVert(bmv0)
         except Exception as e:
             print(f'Caught Exception while trying to merge')
@@ -321,6 +324,7 @@ class RFVert(BMElemWrapper):
     def dissolve(self):
         bmv = BMElemWrapper._unwrap(self)
         vert_dissolve(bmv)
+        self.rftarget.dirty_topology()
 
     def compute_normal(self):
         return Normal.average(f.compute_normal() for f in self.link_faces)
@@ -535,6 +539,7 @@ class RFEdge(BMElemWrapper):
         bme = BMElemWrapper._unwrap(self)
         bmv = BMElemWrapper._unwrap(vert) or bme.verts[0]
         bme_new, bmv_new = edge_split(bme, bmv, fac)
+        self.rftarget.dirty_topology()
         return RFEdge(bme_new), RFVert(bmv_new)
 
     def collapse(self):
@@ -544,6 +549,7 @@ class RFEdge(BMElemWrapper):
         for bmf in del_faces:
             self.rftarget.bme.faces.remove(bmf)
         bmesh.ops.collapse(self.rftarget.bme, edges=[bme], uvs=True)
+        self.rftarget.dirty_topology()
         return RFVert(bmv0 if bmv0.is_valid else bmv1)
 
     # # not working
@@ -748,6 +754,7 @@ class RFFace(BMElemWrapper):
                 pass
             else:
                 vert_splice(verts1[i1], verts0[i0])
+        self.rftarget.dirty_topology()
         # for v in verts0:
         #    self.rftarget.clean_duplicate_bmedges(v)
 
@@ -759,6 +766,7 @@ class RFFace(BMElemWrapper):
         bmvb = BMElemWrapper._unwrap(vert_b)
         coords = [BMElemWrapper.w2l_point(c) for c in coords]
         bmf_new, bml_new = face_split(bmf, bmva, bmvb, coords=coords)
+        self.rftarget.dirty_topology()
         return RFFace(bmf_new)
 
     def shatter(self):
@@ -83,6 +83,7 @@ class RFTool:
         'reset',                # called when RF switches into tool or undo/redo
         'timer',                # called every timer interval
         'target change',        # called whenever rftarget has changed (selection or edited)
+        'target geometry change', # called whenever rftarget geometry has changed (not called for selection-only changes)
         'view change',          # called whenever view has changed
         'mouse move',           # called whenever mouse has moved
         'mouse stop',           # called whenever mouse has stopped moving
@@ -108,6 +109,8 @@ class RFTool:
     @staticmethod
     def on_target_change(fn): return rftool_callback_decorator('target change', fn)
     @staticmethod
+    def on_target_geometry_change(fn): return rftool_callback_decorator('target geometry change', fn)
+    @staticmethod
     def on_view_change(fn): return rftool_callback_decorator('view change', fn)
     @staticmethod
     def on_mouse_move(fn): return rftool_callback_decorator('mouse move', fn)
@@ -194,6 +197,7 @@ class RFTool:
     def _update_all(self):
         self._callback('timer')
         self._callback('target change')
+        self._callback('target geometry change')
         self._callback('view change')
 
     def _fsm_update(self):
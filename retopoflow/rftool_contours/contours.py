@@ -23,6 +23,7 @@ import os
 import math
 import time
 import random
+from itertools import chain
 
 from mathutils import Matrix
 
@@ -48,7 +49,7 @@ from .contours_props import Contours_Props
 from .contours_utils import (
     find_loops,
     find_strings,
-    loop_plane, loop_radius,
+    loop_planes, loop_radius,
     Contours_Loop,
     Contours_Utils,
 )
@@ -90,6 +91,8 @@ class Contours(RFTool, Contours_Ops, Contours_Props, Contours_Utils):
         self.crawl_viz = [] # for debugging
         self.hovering_sel_edge = None
         self.ui_initial_count = None
+        self.loops_strings = ([], [])
+        self.loops_strings_key = None
 
     @RFTool.on_target_change
     #@FSM.onlyinstate('main')
@@ -104,18 +107,7 @@ class Contours(RFTool, Contours_Ops, Contours_Props, Contours_Utils):
             self.ui_initial_count.disabled = bool(self.sel_edges)
 
         # find verts along selected loops and strings
-        sel_loops = find_loops(self.sel_edges)
-        sel_strings = find_strings(self.sel_edges)
-
-        # filter out any loops or strings that are in the middle of a selected patch
-        def in_middle(bmvs, is_loop):
-            return any(len(bmv0.shared_edge(bmv1).link_faces) > 1 for bmv0,bmv1 in iter_pairs(bmvs, is_loop))
-        sel_loops = [loop for loop in sel_loops if not in_middle(loop, True)]
-        sel_strings = [string for string in sel_strings if not in_middle(string, False)]
-
-        # filter out long loops that wrap around patches, sharing edges with other strings
-        bmes = {bmv0.shared_edge(bmv1) for string in sel_strings for bmv0,bmv1 in iter_pairs(string,False)}
-        sel_loops = [loop for loop in sel_loops if not any(bmv0.shared_edge(bmv1) in bmes for bmv0,bmv1 in iter_pairs(loop,True))]
+        sel_loops, sel_strings = self._find_selected_loops_strings()
 
         mirror_mod = self.rfcontext.rftarget.mirror_mod
         symmetry_threshold = mirror_mod.symmetry_threshold
@@ -140,19 +132,21 @@ class Contours(RFTool, Contours_Ops, Contours_Props, Contours_Utils):
             if not touches_mirror: c -= 1
             return c
 
+        # fit planes of all loops and strings at once (unchanged loops reuse cached fits)
+        planes = loop_planes(sel_loops + sel_strings)
         self.loops_data = [{
             'loop': loop,
-            'plane': loop_plane(loop),
+            'plane': plane,
             'count': len(loop),
             'radius': loop_radius(loop),
             'cl': Contours_Loop(loop, True),
-            } for loop in sel_loops]
+            } for loop, plane in zip(sel_loops, planes)]
         self.strings_data = [{
             'string': string,
-            'plane': loop_plane(string),
+            'plane': plane,
             'count': get_string_length(string),
             'cl': Contours_Loop(string, False),
-            } for string in sel_strings]
+            } for string, plane in zip(sel_strings, planes[len(sel_loops):])]
         self.sel_loops = [Contours_Loop(loop, True) for loop in sel_loops]
 
         self._var_cut_count.disabled = True
@@ -163,6 +157,32 @@ class Contours(RFTool, Contours_Ops, Contours_Props, Contours_Utils):
             self._var_cut_count_value = self.strings_data[0]['count']
             self._var_cut_count.disabled = False
 
+    @profiler.function
+    def _find_selected_loops_strings(self):
+        # loop/string topology only depends on selected edges and how they connect, so
+        # reuse until selected edge set or target topology changes.
+        # geometry-only changes (ex: moving verts) just refresh plane, radius, etc.
+        key = (self.rfcontext.get_target_topology_version(), frozenset(self.sel_edges))
+        if self.loops_strings_key == key and all(bmv.is_valid for loop in chain(*self.loops_strings) for bmv in loop):
+            return self.loops_strings
+        self.loops_strings_key = key
+
+        sel_loops = find_loops(self.sel_edges)
+        sel_strings = find_strings(self.sel_edges)
+
+        # filter out any loops or strings that are in the middle of a selected patch
+        def in_middle(bmvs, is_loop):
+            return any(len(bmv0.shared_edge(bmv1).link_faces) > 1 for bmv0,bmv1 in iter_pairs(bmvs, is_loop))
+        sel_loops = [loop for loop in sel_loops if not in_middle(loop, True)]
+        sel_strings = [string for string in sel_strings if not in_middle(string, False)]
+
+        # filter out long loops that wrap around patches, sharing edges with other strings
+        bmes = {bmv0.shared_edge(bmv1) for string in sel_strings for bmv0,bmv1 in iter_pairs(string,False)}
+        sel_loops = [loop for loop in sel_loops if not any(bmv0.shared_edge(bmv1) in bmes for bmv0,bmv1 in iter_pairs(loop,True))]
+
+        self.loops_strings = (sel_loops, sel_strings)
+        return self.loops_strings
+
     @FSM.on_state('main')
     def main(self):
         if not self.actions.using('action', ignoredrag=True):
@@ -70,7 +70,7 @@ class Contours_Ops:
 
         if check_hit:
             # if ray hits target, include the loops, too!
-            visible_faces = self.rfcontext.visible_faces()
+            visible_faces = self.rfcontext.visible_faces_cached()
             hit_face,_ = self.rfcontext.nearest2D_face(point=check_hit, faces=visible_faces)
             if hit_face and hit_face.is_quad():
                 # considering loops only at the moment
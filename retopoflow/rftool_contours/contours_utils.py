@@ -54,6 +54,8 @@ import math
 from itertools import chain
 from mathutils import Vector, Quaternion
 
+import numpy as np
+
 import bpy
 
 from ..rfmesh.rfmesh import RFVert
@@ -254,26 +256,51 @@ def verts_of_loop(edge_loop):
     if len(verts) > 1 and verts[0] == verts[-1]: return verts[:-1]
     return verts
 
+def _fit_planes(loops_pts):
+    '''
+    fits planes to all loops at once, where loops_pts is list of non-empty float arrays (n_i, 3).
+    origin is average point, and normal is the (normalized) sum of normalized cross products of consecutive points
+    '''
+    counts = np.array([len(pts) for pts in loops_pts])
+    pts = np.concatenate(loops_pts)
+    starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    ids = np.repeat(np.arange(len(counts)), counts)
+    origins = np.add.reduceat(pts, starts, axis=0) / counts[:, None]
+    rel = pts - origins[ids]
+    crosses = np.cross(rel[:-1], rel[1:])
+    same = ids[:-1] == ids[1:]                  # ignore pairs that span two loops
+    lengths = np.linalg.norm(crosses, axis=1)
+    crosses /= np.where(lengths > 0, lengths, 1)[:, None]
+    normals = np.zeros_like(origins)
+    np.add.at(normals, ids[:-1][same], crosses[same])
+    lengths = np.linalg.norm(normals, axis=1)
+    normals /= np.where(lengths > 0, lengths, 1)[:, None]
+    return origins, normals
+
+def loop_planes(vert_loops):
+    ''' same as loop_plane, but fits all loops in one batch '''
+    idxs = [i for (i, vert_loop) in enumerate(vert_loops) if vert_loop]
+    planes = [None] * len(vert_loops)
+    if not idxs: return planes
+    origins, normals = _fit_planes([np.array([to_point(v) for v in vert_loops[i]], dtype=np.float64) for i in idxs])
+    for i, o, n in zip(idxs, origins, normals):
+        planes[i] = Plane(Point(o), Normal(n))
+    return planes
+
 def loop_plane(vert_loop):
     # average co is pt on plane
     # average cross product (point in same direction) is normal
     if not vert_loop: return None
-    vert_loop = [to_point(v) for v in vert_loop]
-    pt = sum((Vector(vert) for vert in vert_loop), Vector()) / len(vert_loop)
-    n,cnt = None,0
-    for vert0,vert1 in zip(vert_loop[:-1], vert_loop[1:]):
-        c = Vec((vert0-pt).cross(vert1-pt)).normalize()
-        n = n+c if n else c
-    if not n: return Plane(pt, Normal())
-    return Plane(pt, Normal(n).normalize())
+    return loop_planes([vert_loop])[0]
 
 def loop_radius(vert_loop):
-    pt = sum((Vector(to_point(vert)) for vert in vert_loop), Vector()) / len(vert_loop)
-    rad = sum((to_point(vert) - pt).length for vert in vert_loop) / len(vert_loop)
-    return rad
+    pts = np.array([to_point(vert) for vert in vert_loop], dtype=np.float64)
+    return float(np.linalg.norm(pts - pts.mean(axis=0), axis=1).mean())
 
 def loop_length(vert_loop):
-    return sum((to_point(v0)-to_point(v1)).length for v0,v1 in zip(vert_loop, chain(vert_loop[1:], vert_loop[:1])))
+    pts = np.array([to_point(v) for v in vert_loop], dtype=np.float64).reshape((-1, 3))
+    return float(np.linalg.norm(pts - np.roll(pts, -1, axis=0), axis=1).sum())
 
 def loops_connected(vert_loop0, vert_loop1):
     if not vert_loop0 or not vert_loop1: return False
@@ -293,7 +320,9 @@ def string_length(vert_loop):
     return sum((to_point(v0)-to_point(v1)).length for v0,v1 in zip(vert_loop[:-1], vert_loop[1:]))
 
 def project_loop_to_plane(vert_loop, plane):
-    return [plane.project(to_point(v)) for v in vert_loop]
+    pts = np.array([to_point(v) for v in vert_loop], dtype=np.float64).reshape((-1, 3))
+    o, n = np.array(plane.o, dtype=np.float64), np.array(plane.n, dtype=np.float64)
+    return [Point(p) for p in pts + n * ((o - pts) @ n)[:, None]]
 
 
 
@@ -317,8 +346,8 @@ class Contours_Loop:
         self.up_dir = Direction(self.pts[0] - self.plane.o)
         self.frame = Frame.from_plane(self.plane, y=self.up_dir)
 
-        proj = self.plane.project
-        self.dists = [(proj(p0)-proj(p1)).length for p0,p1 in iter_pairs(self.pts, self.connected)]
+        proj = project_loop_to_plane(self.pts, self.plane)
+        self.dists = [(p0-p1).length for p0,p1 in iter_pairs(proj, self.connected)]
         self.proj_dists = [self.plane.signed_distance_to(p) for p in self.pts]
         self.circumference = sum(self.dists)
         self.radius = sum(self.w2l_point(pt).length for pt in self.pts) / self.count
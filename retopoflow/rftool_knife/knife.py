@@ -76,6 +76,8 @@ class Knife(RFTool, Knife_Insert):
         }
         self.rfwidget = None
         self.knife_start = None
+        self._point2D_cache = {}
+        self._point2D_cache_version = None
         self.update_hovered()
 
     def _fsm_in_main(self):
@@ -65,7 +65,7 @@ class Knife_Insert():
     def gather_selection(self):
         self.sel_verts, self.sel_edges, self.sel_faces = self.rfcontext.get_selected_geom()
 
-    @RFTool.on_events('target change', 'view change')
+    @RFTool.on_events('target geometry change', 'view change')
     @FSM.onlyinstate('insert')
     @RFTool.not_while_navigating
     def gather_visible(self):
@@ -376,26 +376,53 @@ class Knife_Insert():
         return
 
 
+    def _reset_point2D_cache(self):
+        # projections of target verts are cached until the view or target changes
+        version = (self.rfcontext.get_view_version(), self.rfcontext.get_target_version(selection=False))
+        if self._point2D_cache_version != version:
+            self._point2D_cache = {}
+            self._point2D_cache_version = version
+
+    def _get_point2D_cached(self, bmv):
+        # assumes _reset_point2D_cache was called (see _get_crosses)
+        if bmv not in self._point2D_cache:
+            self._point2D_cache[bmv] = self.rfcontext.Point_to_Point2D(bmv.co)
+        return self._point2D_cache[bmv]
+
     # Find intersections between cut line and existing geometry
+    @profiler.function
     def _get_crosses(self, p0, p1):
         # Calculate intersections between line segment p0-p1 and visible edges
         # Returns list of (point, intersected_element, distance) tuples
-        Point_to_Point2D = self.rfcontext.Point_to_Point2D
+        # Only edges in Accel2D bins covered by the cut segment are tested
+        self._reset_point2D_cache()
+        Point_to_Point2D = self._get_point2D_cached
         dist = self.rfcontext.drawing.scale(options['knife snap dist'])
         crosses = set()
         touched = set()
-        #p0 = Point_to_Point2D(p0)
-        #p1 = Point_to_Point2D(p1)
         v01 = Vec2D(p1 - p0)
         lv01 = max(v01.length, 0.00001)
         d01 = v01 / lv01
 
+        vis_accel = self.rfcontext.get_accel_visible()
+        if not vis_accel: return []
+
+        def nearest_vert(p):
+            bv, bd = None, None
+            for bmv in vis_accel.get_verts(p, dist):
+                c = Point_to_Point2D(bmv)
+                if c is None: continue
+                d = (p - c).length
+                if d > dist: continue
+                if bv is None or d < bd: bv, bd = bmv, d
+            return bv
+
         def add(p, e):
             if e in touched: return
             # Check if there's already a vertex very close to this point.
-            closest_vert = self.rfcontext.accel_nearest2D_vert(point=p, max_dist=dist)[0]
+            closest_vert = nearest_vert(p)
             if closest_vert:
-                p = Point_to_Point2D(closest_vert.co)
+                p = Point_to_Point2D(closest_vert)
                 e = closest_vert
             p.freeze()
             touched.add(e)
@@ -405,15 +432,16 @@ class Knife_Insert():
         if p0v and not p0v.link_edges:
             add(p0, p0v)
 
-        for e in self.vis_edges:
+        for e in vis_accel.get_edges_along_segment(p0, p1, dist):
             if e in self.skip_edges:
                 continue
             v0, v1 = e.verts
-            c0, c1 = Point_to_Point2D(v0.co), Point_to_Point2D(v1.co)
-            
+            c0, c1 = Point_to_Point2D(v0), Point_to_Point2D(v1)
+            if c0 is None or c1 is None: continue
+
             # Skip invalid/degenerate edges
             if (c0-c1).length < 0.000001: continue
-                
+
             # Calculate intersection with a small epsilon to handle floating point precision
             i = intersect2d_segment_segment(p0, p1, c0, c1)
             if i:
@@ -424,7 +452,7 @@ class Knife_Insert():
                 if on_p0p1 and on_c0c1:
                     add(ip, e)
                     continue
-                    
+
             # Existing snap checks
             clc0 = closest2d_point_segment(c0, p0, p1)
             clc1 = closest2d_point_segment(c1, p0, p1)
@@ -245,8 +245,8 @@ class Loops(RFTool, Loops_Insert):
 
         if True:
             # use line perpendicular to average edge direction
-            vis_verts = self.rfcontext.visible_verts(verts=sel_verts)
-            vis_edges = self.rfcontext.visible_edges(verts=vis_verts, edges=sel_edges)
+            vis_verts = self.rfcontext.visible_verts_cached(verts=sel_verts)
+            vis_edges = self.rfcontext.visible_edges_cached(edges=sel_edges)
             edge_d = None
             for edge in vis_edges:
                 v0, v1 = edge.verts
@@ -58,7 +58,7 @@ class PolyPen_Insert():
         self.sel_verts, self.sel_edges, self.sel_faces = self.rfcontext.get_selected_geom()
         self.num_sel_verts, self.num_sel_edges, self.num_sel_faces = len(self.sel_verts), len(self.sel_edges), len(self.sel_faces)
 
-    @RFTool.on_events('target change', 'view change')
+    @RFTool.on_events('target geometry change', 'view change')
     @FSM.onlyinstate('previs insert')
     @RFTool.not_while_navigating
     def gather_visible(self):
@@ -99,6 +99,10 @@ class PolyStrips(RFTool, PolyStrips_Props, PolyStrips_Ops):
     @RFTool.on_reset
     def reset(self):
         self.strips = []
+        self.strip_cache = {}
+        self.strip_cache_bmquads = None
+        self.strip_topology = []
+        self.strip_topology_key = None
         self.strip_pts = []
         self.hovering_strips = set()
         self.hovering_handles = []
@@ -112,12 +116,55 @@ class PolyStrips(RFTool, PolyStrips_Props, PolyStrips_Ops):
     def update_target(self, force=False):
         if not force and self._fsm.state in {'move handle', 'rotate', 'scale'}: return
 
+        prev_strips = self.strips
         self.strips = []
         self._var_cut_count.disabled = True
 
         # get selected quads
         bmquads = set(bmf for bmf in self.rfcontext.get_selected_faces() if len(bmf.verts) == 4)
-        if not bmquads: return
+        if not bmquads:
+            self.strip_cache = {}
+            self.strip_cache_bmquads = None
+            return
+
+        # strips are cached by their face sequence.  only strips with new faces or
+        # moved verts are rebuilt (bezier refit, edge capture)
+        changed = bmquads != self.strip_cache_bmquads
+        strip_cache = {}
+        for bmf_strip in self._find_strip_face_sequences(bmquads):
+            key = tuple(bmf_strip)
+            co_key = RFTool_PolyStrips_Strip.compute_co_key(bmf_strip)
+            strip = self.strip_cache.get(key)
+            if strip is None or strip.co_key != co_key:
+                strip = RFTool_PolyStrips_Strip(bmf_strip, co_key=co_key)
+                changed = True
+            strip_cache[key] = strip
+            self.strips.append(strip)
+            if options['polystrips max strips'] and len(self.strips) > options['polystrips max strips']:
+                self.strips = []
+                strip_cache = {}
+                break
+        changed |= len(self.strips) != len(prev_strips)
+        self.strip_cache = strip_cache
+        self.strip_cache_bmquads = bmquads
+
+        self.update_strip_viz()
+        if len(self.strips) == 1:
+            self._var_cut_count.set(len(self.strips[0]))
+            self._var_cut_count.disabled = False
+
+        if changed and self.rfcontext.get_last_action() != 'change segment count':
+            self.setup_change_count()
+
+    @profiler.function
+    def _find_strip_face_sequences(self, bmquads):
+        # topology of strips only depends on selected quads and how they connect, so
+        # reuse the face sequences until selection or target topology changes
+        topology = self.rfcontext.get_target_topology_version()
+        if self.strip_topology_key == (topology, bmquads) and all(bmf.is_valid for bmf in bmquads):
+            return self.strip_topology
+        self.strip_topology_key = (topology, bmquads)
+        self.strip_topology = []
 
         # find junctions at corners
         junctions = set()
@@ -153,23 +200,14 @@ class PolyStrips(RFTool, PolyStrips_Props, PolyStrips_Ops):
                 if len(strip) > 1 and hash_face_pair(bmf0, bmf1) not in touched:
                     touched.add(hash_face_pair(bmf0,bmf1))
                     touched.add(hash_face_pair(bmf1,bmf0))
-                    self.strips.append(RFTool_PolyStrips_Strip(strip))
+                    self.strip_topology.append(strip)
 
             if not edge0: add_strip(bme0)
             if not edge1: add_strip(bme1)
             if not edge2: add_strip(bme2)
             if not edge3: add_strip(bme3)
-            if options['polystrips max strips'] and len(self.strips) > options['polystrips max strips']:
-                self.strips = []
-                break
 
-        self.update_strip_viz()
-        if len(self.strips) == 1:
-            self._var_cut_count.set(len(self.strips[0]))
-            self._var_cut_count.disabled = False
-
-        if self.rfcontext.get_last_action() != 'change segment count':
-            self.setup_change_count()
+        return self.strip_topology
 
     @profiler.function
     def update_strip_viz(self):
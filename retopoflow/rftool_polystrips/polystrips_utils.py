@@ -273,11 +273,17 @@ def mark_info(marks, imark):
 
 
 class RFTool_PolyStrips_Strip:
-    def __init__(self, bmf_strip):
+    def __init__(self, bmf_strip, co_key=None):
         self.bmf_strip = bmf_strip
+        self.co_key = co_key if co_key is not None else self.compute_co_key(bmf_strip)
         self.recompute_curve()
         self.capture_edges()
 
+    @staticmethod
+    def compute_co_key(bmf_strip):
+        # used to detect if any vert of strip has moved since strip was created
+        return tuple(tuple(bmv.co) for bmf in bmf_strip for bmv in bmf.verts)
+
     def __len__(self): return len(self.bmf_strip)
 
     def __iter__(self): return iter(self.bmf_strip)
@@ -319,6 +325,7 @@ class RFTool_PolyStrips_Strip:
             self.bmes += [(bme, t, rad, rot, off_cross, off_der, off_norm)]
 
     def update(self, nearest_sources_Point, raycast_sources_Point, update_face_normal):
+        self.co_key = None  # curve was edited, so strip must be rebuilt
         self.curve.tessellate_uniform(lambda p,q:(p-q).length, split=50)
         length = self.curve.approximate_totlength_tessellation()
         for bme,t,rad,rot,off_cross,off_der,off_norm in self.bmes:
@@ -19,6 +19,8 @@ Created by Jonathan Denning, Jonathan Williamson, and Patrick Moore
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
+import numpy as np
+
 from ..rftool import RFTool
 from ..rfwidgets.rfwidget_default import RFWidget_Default_Factory
 from ..rfwidgets.rfwidget_brushfalloff import RFWidget_BrushFalloff_Factory
@@ -32,7 +34,7 @@ from ...addon_common.common.drawing import (
 
 from ...addon_common.common.boundvar import BoundBool, BoundInt, BoundFloat, BoundString
 from ...addon_common.common.profiler import profiler
-from ...addon_common.common.maths import Point, Point2D, Vec2D, Color, closest_point_segment
+from ...addon_common.common.maths import Point, Point2D, Vec2D, Color
 from ...addon_common.common.fsm import FSM
 from ...addon_common.common.globals import Globals
 from ...addon_common.common.utils import iter_pairs, delay_exec
@@ -165,15 +167,20 @@ class Tweak(RFTool):
         if opt_mask_selected == 'exclude': self.bmverts = [bmv for bmv in self.bmverts if not bmv.select]
         if opt_mask_selected == 'only':    self.bmverts = [bmv for bmv in self.bmverts if bmv.select]
 
-        self.bmvert_data = [
-            (bmv, on_planes(bmv), Point_to_Point2D(bmv.co), Point(bmv.co), get_strength_dist(bmv))
-            for bmv in self.bmverts
-        ]
+        # captured region is held as arrays so that falloff and offsets can be computed in bulk
+        xys = [Point_to_Point2D(bmv.co) for bmv in self.bmverts]
+        self.bmverts = [bmv for (bmv, xy) in zip(self.bmverts, xys) if xy is not None]
+        self.bmverts_sympl = [on_planes(bmv) for bmv in self.bmverts]
+        self.bmverts_xy = np.array([xy for xy in xys if xy is not None], dtype=np.float64).reshape((-1, 2))
+        self.bmverts_strength = np.array([get_strength_dist(bmv) for bmv in self.bmverts], dtype=np.float64)
+        # depth of each vert does not change during move, so compute only once
+        self.bmverts_depth = [self.rfcontext.Point_to_depth(bmv.co) for bmv in self.bmverts]
 
         if opt_mask_boundary == 'slide':
-            self._boundary = [(bme.verts[0].co, bme.verts[1].co) for bme in self.rfcontext.iter_edges() if not bme.is_manifold]
+            boundary = [(bme.verts[0].co, bme.verts[1].co) for bme in self.rfcontext.iter_edges() if not bme.is_manifold]
+            self._boundary = np.array(boundary, dtype=np.float64).reshape((-1, 2, 3))
         else:
-            self._boundary = []
+            self._boundary = np.zeros((0, 2, 3))
 
         self.bmfaces = set([f for bmv,_ in nearest for f in bmv.link_faces])
         self.mousedown = self.rfcontext.actions.mouse
@@ -200,45 +207,57 @@ class Tweak(RFTool):
     def move_doit(self):
         if self.actions.mouse_prev == self.actions.mouse: return
 
-        opt_mask_boundary = options['tweak mask symmetry']
         opt_mask_boundary = options['tweak mask boundary']
 
-        delta = Vec2D(self.rfcontext.actions.mouse - self.mousedown)
-        set2D_vert = self.rfcontext.set2D_vert
-        snap_vert = self.rfcontext.snap_vert
-        update_face_normal = self.rfcontext.update_face_normal
-
-        for (bmv, sympl, xy, xyz, strength) in self.bmvert_data:
-            if not bmv.is_valid: continue
-            co2D = xy + delta * strength
-            match options['tweak mode']:
-                case 'snap':
-                    dist = self.rfcontext.Point_to_depth(xyz)
-                    bmv.co = self.rfcontext.Point2D_to_Point(co2D, dist)
-                    snap_vert(bmv, snap_to_symmetry=sympl)
-                case 'raycast':
-                    set2D_vert(bmv, co2D, sympl)
-                case _:
-                    assert False, f'Invalid tweak mode {options["tweak mode"]}'
-
-
-            if opt_mask_boundary == 'slide' and bmv.is_on_boundary():
-                co = bmv.co
-                p, d = None, None
-                for (v0, v1) in self._boundary:
-                    p_ = closest_point_segment(co, v0, v1)
-                    d_ = (p_ - co).length
-                    if p is None or d_ < d: p, d = p_, d_
-                if p is not None:
-                    bmv.co = p
-                    self.rfcontext.snap_vert(bmv)
-
-        for bmf in self.bmfaces:
-            if not bmf.is_valid: continue
-            update_face_normal(bmf)
+        delta = np.array(self.rfcontext.actions.mouse - self.mousedown, dtype=np.float64)
+        co2Ds = self.bmverts_xy + self.bmverts_strength[:, None] * delta[None, :]
+        co2Ds = [Point2D(co2D) for co2D in co2Ds]
+
+        match options['tweak mode']:
+            case 'snap':
+                Point2D_to_Point = self.rfcontext.Point2D_to_Point
+                for bmv, co2D, depth in zip(self.bmverts, co2Ds, self.bmverts_depth):
+                    if not bmv.is_valid: continue
+                    bmv.co = Point2D_to_Point(co2D, depth)
+                self.rfcontext.snap_verts(self.bmverts, snap_to_symmetry=self.bmverts_sympl)
+            case 'raycast':
+                self.rfcontext.set2D_verts(self.bmverts, co2Ds, snap_to_symmetry=self.bmverts_sympl)
+            case _:
+                assert False, f'Invalid tweak mode {options["tweak mode"]}'
+
+        if opt_mask_boundary == 'slide' and len(self._boundary):
+            bmverts = [bmv for bmv in self.bmverts if bmv.is_valid and bmv.is_on_boundary()]
+            if bmverts:
+                cos = np.array([bmv.co for bmv in bmverts], dtype=np.float64)
+                for bmv, p in zip(bmverts, self._closest_boundary_points(cos)):
+                    bmv.co = Point(p)
+                self.rfcontext.snap_verts(bmverts)
+
+        self.rfcontext.update_face_normals(self.bmfaces)
 
         tag_redraw_all('Tweak mouse move')
 
+    def _closest_boundary_points(self, cos, chunk=1<<20):
+        '''
+        returns closest point on any boundary segment for each point in cos (n,3).
+        points are processed in chunks so that the (points x segments) intermediates stay small
+        '''
+        p0 = self._boundary[:, 0]
+        d = self._boundary[:, 1] - p0
+        l = np.linalg.norm(d, axis=1)
+        short = l <= 0.00001        # closest_point_segment returns p0 for very short segments
+        d = d / np.where(short, 1.0, l)[:, None]
+        step = max(1, chunk // len(p0))
+        closest = np.empty_like(cos)
+        for i in range(0, len(cos), step):
+            c = cos[i:i+step, None, :]                                      # (k,1,3)
+            t = np.clip(np.einsum('kmi,mi->km', c - p0[None], d), 0, l)     # (k,m)
+            t[:, short] = 0
+            p = p0[None] + d[None] * t[:, :, None]                          # (k,m,3)
+            best = np.argmin(np.linalg.norm(p - c, axis=2), axis=1)
+            closest[i:i+step] = p[np.arange(len(best)), best]
+        return closest
+
     @FSM.on_state('move', 'exit')
     def move_exit(self):
         self.rfcontext.clear_split_target_visualization()